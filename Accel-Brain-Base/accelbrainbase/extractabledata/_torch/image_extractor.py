@@ -46,7 +46,18 @@ class ImageExtractor(_ImageExtractor):
             The shape is (`channel`, `width`, `height`).
         '''
         img_arr = super().extract(path=path)
-        img_arr = torch.from_numpy(img_arr.astype(np.float32)).clone()
-        img_arr = img_arr.to(self.__ctx).float()
+        # `astype` copies the image, so that the `np.ndarray` in `image_cache` is not modified.
+        img_arr = torch.from_numpy(img_arr.astype(np.float32))
+        img_arr = img_arr.to(self.__ctx)
 
         return img_arr
+
+    def get_ctx(self):
+        ''' getter of the device of tensors. '''
+        return self.__ctx
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    ctx = property(get_ctx, set_readonly)
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+from collections import OrderedDict
+import json
+import os
+import threading
+import numpy as np
+
+
+class ImageCache(object):
+    '''
+    Cache of decoded images for `ImageExtractor`.
+
+    The decoded images are cached in memory by the LRU policy, bounded by the total bytes.
+    Optionally, the images are packed in advance into the shards of `.npy` files in `shard_dir`,
+    which are memory-mapped and read as the views without copying.
+
+    The key of images is (path, width, height, channel, mtime), so that the images
+    are decoded again if the files or the settings of `ImageExtractor` are changed.
+    '''
+
+    def __init__(self, max_bytes=1024 ** 3, shard_dir=None):
+        '''
+        Init.
+
+        Args:
+            max_bytes:      `int` of the maximum bytes of the images cached in memory.
+                            If `0`, the images are not cached in memory.
+            shard_dir:      `str` of the directory of the shards.
+                            If `None`, the shards are not used.
+        '''
+        if isinstance(max_bytes, int) is False:
+            raise TypeError("The type of `max_bytes` must be `int`.")
+        if max_bytes < 0:
+            raise ValueError("The value of `max_bytes` must be `0` or more.")
+        if shard_dir is not None and isinstance(shard_dir, str) is False:
+            raise TypeError("The type of `shard_dir` must be `str`.")
+
+        self.__max_bytes = max_bytes
+        self.__shard_dir = shard_dir
+        self.__init_state()
+
+    def __init_state(self):
+        self.__lock = threading.Lock()
+        self.__arr_dict = OrderedDict()
+        self.__nbytes = 0
+        # {key: (the index of shard, the index of row)}
+        self.__index_dict = None
+        self.__shard_list = []
+
+    def __getstate__(self):
+        # The cached images and the memory-maps are not sent to the worker processes.
+        return {
+            "max_bytes": self.__max_bytes,
+            "shard_dir": self.__shard_dir,
+        }
+
+    def __setstate__(self, state):
+        self.__max_bytes = state["max_bytes"]
+        self.__shard_dir = state["shard_dir"]
+        self.__init_state()
+
+    def get(self, key):
+        '''
+        Get the cached image.
+
+        Args:
+            key:    `tuple` of (path, width, height, channel, mtime).
+
+        Returns:
+            `np.ndarray` of the image, which must not be modified.
+            If not cached, `None`.
+        '''
+        with self.__lock:
+            arr = self.__arr_dict.get(key)
+            if arr is not None:
+                self.__arr_dict.move_to_end(key)
+                return arr
+
+        if self.__shard_dir is not None:
+            self.__load_index()
+            pos = self.__index_dict.get(self.__dump_key(key))
+            if pos is not None:
+                return self.__shard_list[pos[0]][pos[1]]
+
+        return None
+
+    def put(self, key, arr):
+        '''
+        Cache the image in memory.
+
+        Args:
+            key:    `tuple` of (path, width, height, channel, mtime).
+            arr:    `np.ndarray` of the image.
+        '''
+        if arr.nbytes > self.__max_bytes:
+            return
+
+        arr.flags.writeable = False
+        with self.__lock:
+            if key in self.__arr_dict:
+                self.__nbytes -= self.__arr_dict.pop(key).nbytes
+            self.__arr_dict[key] = arr
+            self.__nbytes += arr.nbytes
+            while self.__nbytes > self.__max_bytes:
+                _, _arr = self.__arr_dict.popitem(last=False)
+                self.__nbytes -= _arr.nbytes
+
+    def clear(self):
+        '''
+        Remove the images cached in memory.
+        '''
+        with self.__lock:
+            self.__arr_dict = OrderedDict()
+            self.__nbytes = 0
+
+    def pack(self, image_extractor, path_list, shard_size=1024):
+        '''
+        Decode the images and pack them into the shards.
+
+        The images that have been packed are skipped.
+
+        Args:
+            image_extractor:    is-a `ImageExtractor`.
+            path_list:          `list` of `str` of image files.
+            shard_size:         `int` of the number of images in each shard.
+        '''
+        if self.__shard_dir is None:
+            raise ValueError("`shard_dir` is required to pack the images.")
+        if isinstance(shard_size, int) is False:
+            raise TypeError("The type of `shard_size` must be `int`.")
+        if shard_size <= 0:
+            raise ValueError("The value of `shard_size` must be more than `0`.")
+
+        os.makedirs(self.__shard_dir, exist_ok=True)
+        self.__load_index()
+        index_dict = dict(self.__index_dict)
+        key_list = []
+        for path in path_list:
+            key = self.__dump_key(image_extractor.create_cache_key(path))
+            if key not in index_dict:
+                index_dict[key] = None
+                key_list.append((key, path))
+
+        shard_n = len(self.__shard_list)
+        for i in range(0, len(key_list), shard_size):
+            _key_list = key_list[i:i+shard_size]
+            arr = None
+            for row, (key, path) in enumerate(_key_list):
+                img_arr = image_extractor.decode(path)
+                if arr is None:
+                    arr = np.lib.format.open_memmap(
+                        self.__shard_path(shard_n),
+                        mode="w+",
+                        dtype=img_arr.dtype,
+                        shape=(len(_key_list), ) + img_arr.shape
+                    )
+                arr[row] = img_arr
+                index_dict[key] = (shard_n, row)
+            arr.flush()
+            del arr
+            shard_n += 1
+
+        index_path = os.path.join(self.__shard_dir, "index.json")
+        with open(index_path + ".tmp", "w") as f:
+            json.dump(index_dict, f)
+        os.replace(index_path + ".tmp", index_path)
+        self.__index_dict = None
+
+    def __load_index(self):
+        '''
+        Load the index and memory-map the shards.
+        '''
+        if self.__index_dict is not None:
+            return
+
+        with self.__lock:
+            if self.__index_dict is not None:
+                return
+            index_path = os.path.join(self.__shard_dir, "index.json")
+            index_dict = {}
+            if os.path.exists(index_path):
+                with open(index_path) as f:
+                    index_dict = {key: tuple(pos) for key, pos in json.load(f).items()}
+            shard_list = []
+            while os.path.exists(self.__shard_path(len(shard_list))):
+                shard_list.append(np.load(self.__shard_path(len(shard_list)), mmap_mode="r"))
+            self.__shard_list = shard_list
+            self.__index_dict = index_dict
+
+    def __shard_path(self, shard):
+        return os.path.join(self.__shard_dir, "shard_%05d.npy" % shard)
+
+    def __dump_key(self, key):
+        return json.dumps(list(key))
+
+    def get_nbytes(self):
+        ''' getter '''
+        return self.__nbytes
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    nbytes = property(get_nbytes, set_readonly)
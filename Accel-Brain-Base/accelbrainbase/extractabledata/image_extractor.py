@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 from accelbrainbase.extractable_data import ExtractableData
+from accelbrainbase.extractabledata.image_cache import ImageCache
 from PIL import Image
 import numpy as np
+import os
 
 
 class ImageExtractor(ExtractableData):
     '''
     Image Extractor.
+
+    If `image_cache` is not `None`, the decoded images are drawn from `ImageCache`.
     '''
 
     # `int` of width.
@@ -44,6 +48,43 @@ class ImageExtractor(ExtractableData):
         Args:
             path:     `str` of image files.
         
+        Returns:
+            Observed data points.
+            If `image_cache` is not `None`, the `np.ndarray` is read-only.
+        '''
+        return self.extract_arr(path)
+
+    def extract_arr(self, path):
+        '''
+        Extract image file data as `np.ndarray`.
+
+        This method is used by `ImageBatchLoader`, which converts mini-batches
+        to tensors at once instead of `extract` of subclasses.
+
+        Args:
+            path:     `str` of image files.
+
+        Returns:
+            `np.ndarray` of data. The shape is (`channel`, `height`, `width`).
+            If `image_cache` is not `None`, the `np.ndarray` is read-only.
+        '''
+        if self.__image_cache is None:
+            return self.decode(path)
+
+        key = self.create_cache_key(path)
+        img_arr = self.__image_cache.get(key)
+        if img_arr is None:
+            img_arr = self.decode(path)
+            self.__image_cache.put(key, img_arr)
+        return img_arr
+
+    def decode(self, path):
+        '''
+        Decode and resize image file without `image_cache`.
+
+        Args:
+            path:     `str` of image files.
+
         Returns:
             Observed data points.
         '''
@@ -61,6 +102,39 @@ class ImageExtractor(ExtractableData):
 
         return img_arr
 
+    def create_cache_key(self, path):
+        '''
+        Create the key of `image_cache`.
+
+        Args:
+            path:     `str` of image files.
+
+        Returns:
+            `tuple` of (path, width, height, channel, mtime).
+        '''
+        return (
+            os.path.abspath(path),
+            self.width,
+            self.height,
+            self.channel,
+            os.stat(path).st_mtime_ns
+        )
+
+    # is-a `ImageCache`.
+    __image_cache = None
+
+    def get_image_cache(self):
+        ''' getter of `ImageCache`. '''
+        return self.__image_cache
+
+    def set_image_cache(self, value):
+        ''' setter of `ImageCache`. '''
+        if isinstance(value, ImageCache) is False and value is not None:
+            raise TypeError("The type of `image_cache` must be `ImageCache`.")
+        self.__image_cache = value
+
+    image_cache = property(get_image_cache, set_image_cache)
+
     def get_width(self):
         ''' getter of `int` of width. '''
         return self.__width
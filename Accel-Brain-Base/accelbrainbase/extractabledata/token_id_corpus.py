@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+from accelbrainbase.extractable_data import ExtractableData
+
+
+class TokenIdCorpus(ExtractableData):
+    '''
+    Corpus of text files encoded to token ids.
+
+    All files are read and encoded only once in `__init__`.
+    The token ids of all files are stored in one `np.ndarray` of int32,
+    which is memory-mapped if `memmap_path` is not `None`, and the files are
+    the shards of it delimited by the table of offsets. The tokens are characters,
+    and the vocabulary is `dict` from token to id, so that the ids of windows
+    can be drawn by the vectorized gathers instead of reading and scanning the files.
+
+    The tokens that are not in the vocabulary are encoded to `-1`.
+    '''
+
+    def __init__(self, txt_path_list, token_list=None, memmap_path=None):
+        '''
+        Init.
+
+        Args:
+            txt_path_list:      `list` of `str` of path to text file.
+            token_list:         `list` of tokens in the vocabulary.
+                                If `None`, the vocabulary is all tokens in `txt_path_list`
+                                in order of appearance.
+            memmap_path:        `str` of path to the file to memory-map the token ids.
+                                If `None`, the token ids are kept in memory.
+        '''
+        if isinstance(txt_path_list, list) is False:
+            raise TypeError("The type of `txt_path_list` must be `list`.")
+        if len(txt_path_list) == 0:
+            raise ValueError("`txt_path_list` must not be empty.")
+
+        code_arr_list = []
+        for txt_path in txt_path_list:
+            with open(txt_path) as f:
+                txt = f.read()
+            # The code points of characters.
+            code_arr_list.append(np.frombuffer(txt.encode("utf-32-le"), dtype=np.uint32))
+
+        length_arr = np.array([code_arr.shape[0] for code_arr in code_arr_list], dtype=np.int64)
+        offset_arr = np.zeros(length_arr.shape[0] + 1, dtype=np.int64)
+        offset_arr[1:] = np.cumsum(length_arr)
+
+        if token_list is None:
+            if offset_arr[-1] > 0:
+                code_arr, index_arr = np.unique(np.concatenate(code_arr_list), return_index=True)
+                code_arr = code_arr[np.argsort(index_arr, kind="stable")]
+            else:
+                code_arr = np.zeros(0, dtype=np.uint32)
+            token_list = [chr(code) for code in code_arr]
+        else:
+            token_list = list(token_list)
+
+        self.__token_list = token_list
+        self.__token_dict = {token: i for i, token in enumerate(token_list)}
+
+        if memmap_path is not None:
+            id_arr = np.lib.format.open_memmap(
+                memmap_path,
+                mode="w+",
+                dtype=np.int32,
+                shape=(max(int(offset_arr[-1]), 1), )
+            )
+        else:
+            id_arr = np.zeros(int(offset_arr[-1]), dtype=np.int32)
+
+        # The sorted code points in the vocabulary and their ids.
+        vocab_code_arr = np.array([ord(token) for token in token_list], dtype=np.uint32)
+        sort_arr = np.argsort(vocab_code_arr, kind="stable")
+        vocab_code_arr = vocab_code_arr[sort_arr]
+        for i, code_arr in enumerate(code_arr_list):
+            key_arr = np.searchsorted(vocab_code_arr, code_arr)
+            key_arr = np.minimum(key_arr, max(vocab_code_arr.shape[0] - 1, 0))
+            if vocab_code_arr.shape[0] > 0:
+                hit_arr = vocab_code_arr[key_arr] == code_arr
+                id_arr[offset_arr[i]:offset_arr[i+1]] = np.where(hit_arr, sort_arr[key_arr], -1)
+            else:
+                id_arr[offset_arr[i]:offset_arr[i+1]] = -1
+
+        if memmap_path is not None:
+            id_arr.flush()
+            del id_arr
+            id_arr = np.load(memmap_path, mmap_mode="r")
+
+        self.__txt_path_list = txt_path_list
+        self.__id_arr = id_arr
+        self.__offset_arr = offset_arr
+        self.__length_arr = length_arr
+
+    def extract(self, path):
+        '''
+        Extract the token ids of the text file.
+
+        Args:
+            path:       `str` of path to text file in `txt_path_list`.
+
+        Returns:
+            `np.ndarray` of token ids.
+        '''
+        file_key = self.__txt_path_list.index(path)
+        return self.__id_arr[self.__offset_arr[file_key]:self.__offset_arr[file_key+1]]
+
+    def encode(self, txt):
+        '''
+        Encode the string to token ids.
+
+        Args:
+            txt:        `str`.
+
+        Returns:
+            `np.ndarray` of token ids.
+        '''
+        return np.array([self.__token_dict.get(token, -1) for token in txt], dtype=np.int32)
+
+    def gather(self, file_key_arr, start_arr, seq_len):
+        '''
+        Gather the token ids of windows.
+
+        Args:
+            file_key_arr:   `np.ndarray` of the indices of files.
+            start_arr:      `np.ndarray` of the start positions of windows in each file.
+            seq_len:        `int` of the length of windows.
+
+        Returns:
+            `np.ndarray` of token ids. The shape is (the number of windows, `seq_len`).
+        '''
+        start_arr = self.__offset_arr[file_key_arr] + start_arr
+        return np.asarray(self.__id_arr[start_arr[:, None] + np.arange(seq_len)[None, :]])
+
+    def find(self, file_key, id_arr):
+        '''
+        Find the first position of the token ids in the file.
+
+        Args:
+            file_key:       `int` of the index of file.
+            id_arr:         `np.ndarray` of token ids.
+
+        Returns:
+            `int` of the position. If not found, `-1`.
+        '''
+        file_arr = self.__id_arr[self.__offset_arr[file_key]:self.__offset_arr[file_key+1]]
+        if id_arr.shape[0] == 0:
+            return 0
+        if id_arr.shape[0] > file_arr.shape[0]:
+            return -1
+        window_arr = np.lib.stride_tricks.sliding_window_view(file_arr, id_arr.shape[0])
+        hit_arr = np.flatnonzero((window_arr == id_arr).all(axis=1))
+        if hit_arr.shape[0] == 0:
+            return -1
+        return int(hit_arr[0])
+
+    def get_token_list(self):
+        ''' getter '''
+        return self.__token_list
+
+    def get_token_dict(self):
+        ''' getter '''
+        return self.__token_dict
+
+    def get_length_arr(self):
+        ''' getter '''
+        return self.__length_arr
+
+    def get_id_arr(self):
+        ''' getter '''
+        return self.__id_arr
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    token_list = property(get_token_list, set_readonly)
+    token_dict = property(get_token_dict, set_readonly)
+    length_arr = property(get_length_arr, set_readonly)
+    id_arr = property(get_id_arr, set_readonly)
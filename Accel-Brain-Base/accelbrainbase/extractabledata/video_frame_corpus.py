@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import numpy as np
+from accelbrainbase.extractable_data import ExtractableData
+from accelbrainbase.extractabledata.image_extractor import ImageExtractor
+
+
+class VideoFrameCorpus(ExtractableData):
+    '''
+    Corpus of videos decoded to frames.
+
+    The frames of all videos are decoded only once in `__init__` and stored in one
+    `np.ndarray`, which is memory-mapped if `memmap_path` is not `None`.
+    The frames are decoded in chunks, by `batch_loader` if it is not `None`,
+    so that only one chunk is in memory besides the memory-mapped file.
+    Each video is the shard of it delimited by the table of offsets, and the clips
+    are drawn by one vectorized gather instead of decoding each frame.
+
+    If the memory-mapped file has been made from the same frames,
+    which are identified by `ImageExtractor.create_cache_key`, it is reused without decoding.
+    '''
+
+    def __init__(
+        self,
+        image_extractor,
+        file_path_list_list,
+        memmap_path=None,
+        batch_loader=None,
+        chunk_size=256
+    ):
+        '''
+        Init.
+
+        Args:
+            image_extractor:        is-a `ImageExtractor`.
+            file_path_list_list:    `list` of `list` of `str` of paths to frame image files in each video.
+            memmap_path:            `str` of path to the `.npy` file to memory-map the frames.
+                                    If `None`, the frames are kept in memory.
+            batch_loader:           The loader which has `generate_arr` like `ImageBatchLoader`,
+                                    to decode the chunks of frames by its pool of workers.
+                                    If `None`, the frames are decoded one by one.
+            chunk_size:             `int` of the number of frames in each chunk.
+        '''
+        if isinstance(image_extractor, ImageExtractor) is False:
+            raise TypeError("The type of `image_extractor` must be `ImageExtractor`.")
+        if isinstance(file_path_list_list, list) is False:
+            raise TypeError("The type of `file_path_list_list` must be `list`.")
+        if isinstance(chunk_size, int) is False:
+            raise TypeError("The type of `chunk_size` must be `int`.")
+        if chunk_size <= 0:
+            raise ValueError("The value of `chunk_size` must be more than `0`.")
+
+        length_arr = np.array([len(file_path_list) for file_path_list in file_path_list_list], dtype=np.int64)
+        offset_arr = np.zeros(length_arr.shape[0] + 1, dtype=np.int64)
+        offset_arr[1:] = np.cumsum(length_arr)
+        path_list = [path for file_path_list in file_path_list_list for path in file_path_list]
+
+        frame_arr = None
+        if memmap_path is not None:
+            key_list = [list(image_extractor.create_cache_key(path)) for path in path_list]
+            meta_path = memmap_path + ".json"
+            if os.path.exists(memmap_path) and os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    if json.load(f) == key_list:
+                        frame_arr = np.load(memmap_path, mmap_mode="r")
+
+        if frame_arr is None:
+            chunk_path_arr_list = [
+                np.array(path_list[i:i+chunk_size], dtype=object) for i in range(0, len(path_list), chunk_size)
+            ]
+            if batch_loader is not None:
+                chunk_arr_iter = batch_loader.generate_arr(chunk_path_arr_list)
+            else:
+                chunk_arr_iter = (
+                    # The `np.ndarray` is extracted without the conversion to the tensor of subclasses.
+                    np.stack([ImageExtractor.extract(image_extractor, path=path) for path in chunk_path_arr])
+                    for chunk_path_arr in chunk_path_arr_list
+                )
+
+            i = 0
+            for chunk_arr in chunk_arr_iter:
+                if frame_arr is None:
+                    shape = (len(path_list), ) + chunk_arr.shape[1:]
+                    if memmap_path is not None:
+                        frame_arr = np.lib.format.open_memmap(
+                            memmap_path,
+                            mode="w+",
+                            dtype=chunk_arr.dtype,
+                            shape=shape
+                        )
+                    else:
+                        frame_arr = np.empty(shape, dtype=chunk_arr.dtype)
+                frame_arr[i:i+chunk_arr.shape[0]] = chunk_arr
+                i += chunk_arr.shape[0]
+
+            if frame_arr is None:
+                raise ValueError("`file_path_list_list` must not be empty.")
+
+            if memmap_path is not None:
+                frame_arr.flush()
+                del frame_arr
+                with open(memmap_path + ".json", "w") as f:
+                    json.dump(key_list, f)
+                frame_arr = np.load(memmap_path, mmap_mode="r")
+
+        self.__file_path_list_list = file_path_list_list
+        self.__frame_arr = frame_arr
+        self.__offset_arr = offset_arr
+        self.__length_arr = length_arr
+
+    def extract(self, path):
+        '''
+        Extract the frames of the video.
+
+        Args:
+            path:       `list` of `str` of paths to frame image files in `file_path_list_list`.
+
+        Returns:
+            `np.ndarray` of frames. The shape is (the number of frames, channel, height, width).
+        '''
+        video_key = self.__file_path_list_list.index(path)
+        return self.__frame_arr[self.__offset_arr[video_key]:self.__offset_arr[video_key+1]]
+
+    def gather(self, video_key_arr, start_arr, seq_len, at_intervals=1):
+        '''
+        Gather the clips.
+
+        Args:
+            video_key_arr:  `np.ndarray` of the indices of videos.
+            start_arr:      `np.ndarray` of the start positions of clips in the frames at intervals.
+            seq_len:        `int` of the length of clips.
+            at_intervals:   `int` of intervals of frames in one clip.
+
+        Returns:
+            `np.ndarray` of float32. The shape is (the number of clips, `seq_len`, channel, height, width).
+        '''
+        index_arr = self.__offset_arr[video_key_arr][:, None] + (
+            start_arr[:, None] + np.arange(seq_len)[None, :]
+        ) * at_intervals
+        return self.__frame_arr[index_arr.ravel()].astype(np.float32).reshape(
+            index_arr.shape + self.__frame_arr.shape[1:]
+        )
+
+    def get_length_arr(self):
+        ''' getter '''
+        return self.__length_arr
+
+    def get_frame_arr(self):
+        ''' getter '''
+        return self.__frame_arr
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    length_arr = property(get_length_arr, set_readonly)
+    frame_arr = property(get_frame_arr, set_readonly)
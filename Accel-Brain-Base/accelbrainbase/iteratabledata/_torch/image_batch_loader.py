@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import queue
+import threading
+import numpy as np
+import torch
+
+from accelbrainbase.extractabledata.image_extractor import ImageExtractor
+
+
+def _extract(image_extractor, path):
+    '''
+    Decode and resize the image file to `np.ndarray` in the worker.
+
+    Args:
+        image_extractor:    is-a `ImageExtractor`.
+        path:               `str` of image file.
+
+    Returns:
+        `np.ndarray` of data. The shape is (`channel`, `height`, `width`).
+    '''
+    # The `np.ndarray` is extracted without the conversion to the tensor of subclasses.
+    return np.asarray(image_extractor.extract_arr(path))
+
+
+# is-a `ImageExtractor` of the worker process, which is unpickled once per worker
+# so that its `image_cache` is kept across the tasks.
+_worker_image_extractor = None
+
+
+def _init_worker(image_extractor):
+    '''
+    Initialize the worker process.
+
+    Args:
+        image_extractor:    is-a `ImageExtractor`.
+    '''
+    global _worker_image_extractor
+    _worker_image_extractor = image_extractor
+
+
+def _extract_in_worker(path):
+    '''
+    Decode and resize the image file by `ImageExtractor` of the worker process.
+
+    Args:
+        path:               `str` of image file.
+
+    Returns:
+        `np.ndarray` of data. The shape is (`channel`, `height`, `width`).
+    '''
+    return _extract(_worker_image_extractor, path)
+
+
+class ImageBatchLoader(object):
+    '''
+    Loader of mini-batches of image files.
+
+    The images of a mini-batch are decoded and resized by a pool of threads or processes,
+    and written into one preallocated `np.ndarray` instead of concatenating tensors per sample.
+    The images are extracted by `extract_arr` of `image_extractor`, so that subclasses
+    can customize the extraction by overriding `decode` or `extract_arr`.
+    If `prefetch_n` is greater than `0`, the mini-batches are loaded by the background thread
+    up to `prefetch_n` mini-batches ahead of the training loop.
+    '''
+
+    def __init__(
+        self,
+        image_extractor,
+        max_workers=1,
+        pool_mode="thread",
+        prefetch_n=0,
+        ctx=None
+    ):
+        '''
+        Init.
+
+        Args:
+            image_extractor:    is-a `ImageExtractor`.
+            max_workers:        `int` of the number of workers. If `1`, no pool is used.
+            pool_mode:          `thread` or `process`.
+            prefetch_n:         `int` of the number of mini-batches loaded ahead.
+                                If `0`, the mini-batches are loaded in the training loop.
+            ctx:                `cpu` or `cuda`.
+                                If `None`, this value will be equivalent to `image_extractor.ctx` if it exists.
+        '''
+        if isinstance(image_extractor, ImageExtractor) is False:
+            raise TypeError("The type of `image_extractor` must be `ImageExtractor`.")
+        if isinstance(max_workers, int) is False:
+            raise TypeError("The type of `max_workers` must be `int`.")
+        if max_workers <= 0:
+            raise ValueError("The value of `max_workers` must be more than `0`.")
+        if pool_mode not in ("thread", "process"):
+            raise ValueError("The value of `pool_mode` must be `thread` or `process`.")
+        if isinstance(prefetch_n, int) is False:
+            raise TypeError("The type of `prefetch_n` must be `int`.")
+        if prefetch_n < 0:
+            raise ValueError("The value of `prefetch_n` must be `0` or more.")
+
+        self.__image_extractor = image_extractor
+        self.__max_workers = max_workers
+        self.__pool_mode = pool_mode
+        self.__prefetch_n = prefetch_n
+        if ctx is None:
+            ctx = getattr(image_extractor, "ctx", "cpu")
+        self.__ctx = ctx
+
+    def generate(self, path_arr_iter):
+        '''
+        Load mini-batches.
+
+        Args:
+            path_arr_iter:  The iterable of `np.ndarray` of paths to image files.
+                            The shape of each is (batch size, ...).
+
+        Returns:
+            The generator of tensors of mini-batches.
+            The shape of each is (batch size, ..., `channel`, `height`, `width`).
+        '''
+        for batch_arr in self.generate_arr(path_arr_iter):
+            yield self.__to_tensor(batch_arr)
+
+    def generate_arr(self, path_arr_iter):
+        '''
+        Load mini-batches without the conversion to tensors.
+
+        Args:
+            path_arr_iter:  The iterable of `np.ndarray` of paths to image files.
+                            The shape of each is (batch size, ...).
+
+        Returns:
+            The generator of `np.ndarray` of float32 of mini-batches.
+            The shape of each is (batch size, ..., `channel`, `height`, `width`).
+        '''
+        executor = None
+        if self.__max_workers > 1:
+            if self.__pool_mode == "process":
+                executor = ProcessPoolExecutor(
+                    max_workers=self.__max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.__image_extractor, )
+                )
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.__max_workers)
+
+        try:
+            if self.__prefetch_n == 0:
+                for path_arr in path_arr_iter:
+                    yield self.__load(np.asarray(path_arr), executor)
+            else:
+                for batch_arr in self.__prefetch(path_arr_iter, executor):
+                    yield batch_arr
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def normalize(self, arr, norm_mode="z_score", scale=1.0):
+        '''
+        Normalize each image in the mini-batch.
+
+        The statistics are computed per image, as `pre_normalize` of iterators
+        is applied to each image.
+
+        Args:
+            arr:        Tensor. The shape is (batch size, ..., `channel`, `height`, `width`).
+            norm_mode:  How to normalize pixel values of images.
+                        - `z_score`: Z-Score normalization.
+                        - `min_max`: Min-max normalization.
+                        - others : This class will not normalize the data.
+            scale:      `float` of scaling factor for data.
+
+        Returns:
+            Tensor.
+        '''
+        flat_arr = arr.reshape(arr.shape[:-3] + (-1, ))
+        if norm_mode == "min_max":
+            min_arr = flat_arr.min(dim=-1, keepdim=True)[0]
+            max_arr = flat_arr.max(dim=-1, keepdim=True)[0]
+            n_arr = (max_arr == min_arr).float() * 1e-08
+            flat_arr = (flat_arr - min_arr) / (max_arr - min_arr + n_arr)
+        elif norm_mode == "z_score":
+            std_arr = flat_arr.std(dim=-1, keepdim=True)
+            std_arr = std_arr + (std_arr == 0).float() * 1e-08
+            flat_arr = (flat_arr - flat_arr.mean(dim=-1, keepdim=True)) / std_arr
+
+        flat_arr = flat_arr * scale
+        return flat_arr.reshape(arr.shape)
+
+    def __load(self, path_arr, executor):
+        '''
+        Decode the images into the preallocated `np.ndarray`.
+
+        Args:
+            path_arr:   `np.ndarray` of paths to image files.
+            executor:   `ThreadPoolExecutor`, `ProcessPoolExecutor` or `None`.
+
+        Returns:
+            `np.ndarray` of float32.
+        '''
+        path_list = path_arr.ravel().tolist()
+        batch_arr = np.empty(
+            (
+                len(path_list),
+                self.__image_extractor.channel,
+                self.__image_extractor.height,
+                self.__image_extractor.width
+            ),
+            dtype=np.float32
+        )
+
+        if executor is None:
+            img_arr_iter = (_extract(self.__image_extractor, path) for path in path_list)
+        elif isinstance(executor, ProcessPoolExecutor):
+            # Only the paths are sent to the worker processes.
+            img_arr_iter = executor.map(_extract_in_worker, path_list)
+        else:
+            img_arr_iter = executor.map(_extract, [self.__image_extractor] * len(path_list), path_list)
+
+        for i, img_arr in enumerate(img_arr_iter):
+            batch_arr[i] = img_arr
+
+        return batch_arr.reshape(path_arr.shape + batch_arr.shape[1:])
+
+    def __prefetch(self, path_arr_iter, executor):
+        '''
+        Load mini-batches by the background thread.
+
+        Args:
+            path_arr_iter:  The iterable of `np.ndarray` of paths to image files.
+            executor:       `ThreadPoolExecutor`, `ProcessPoolExecutor` or `None`.
+
+        Returns:
+            The generator of `np.ndarray` of mini-batches.
+        '''
+        batch_queue = queue.Queue(maxsize=self.__prefetch_n)
+        stop_event = threading.Event()
+        # The sentinel of the end of mini-batches.
+        end = object()
+
+        def put(item):
+            while stop_event.is_set() is False:
+                try:
+                    batch_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for path_arr in path_arr_iter:
+                    if put(self.__load(np.asarray(path_arr), executor)) is False:
+                        return
+                put(end)
+            except BaseException as e:
+                put(e)
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = batch_queue.get()
+                if item is end:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop_event.set()
+            thread.join()
+
+    def __to_tensor(self, batch_arr):
+        '''
+        Transform the mini-batch to the tensor on `ctx`.
+
+        Args:
+            batch_arr:  `np.ndarray` of mini-batch.
+
+        Returns:
+            Tensor.
+        '''
+        batch_arr = torch.from_numpy(batch_arr)
+        if torch.device(self.__ctx).type == "cuda":
+            batch_arr = batch_arr.pin_memory().to(self.__ctx, non_blocking=True)
+        return batch_arr
@@ -7,8 +7,10 @@ import pandas as pd
 from logging import getLogger
 import os
 import random
+from collections import deque
 
 from accelbrainbase.extractabledata.image_extractor import ImageExtractor
+from accelbrainbase.iteratabledata._torch.image_batch_loader import ImageBatchLoader
 from accelbrainbase.iteratabledata.labeled_image_iterator import LabeledImageIterator as _LabeledImageIterator
 from accelbrainbase.noiseable_data import NoiseableData
 
@@ -16,8 +18,28 @@ from accelbrainbase.noiseable_data import NoiseableData
 class LabeledImageIterator(_LabeledImageIterator):
     '''
     Iterator that draws from image files and generates `tensor` of labeled samples.
+
+    The mini-batches are loaded by `image_batch_loader`, which can decode the images
+    by a pool of workers and prefetch the mini-batches.
     '''
 
+    # is-a `ImageBatchLoader`.
+    __image_batch_loader = None
+
+    def get_image_batch_loader(self):
+        ''' getter '''
+        if self.__image_batch_loader is None:
+            self.__image_batch_loader = ImageBatchLoader(self.__image_extractor, ctx=self.__ctx)
+        return self.__image_batch_loader
+
+    def set_image_batch_loader(self, value):
+        ''' setter '''
+        if isinstance(value, ImageBatchLoader) is False:
+            raise TypeError("The type of `image_batch_loader` must be `ImageBatchLoader`.")
+        self.__image_batch_loader = value
+
+    image_batch_loader = property(get_image_batch_loader, set_image_batch_loader)
+
     def __init__(
         self,
         image_extractor,
@@ -114,78 +136,59 @@ class LabeledImageIterator(_LabeledImageIterator):
             - `tensor` of observed data points in test.
             - `tensor` of supervised data in test.
         '''
-        for _ in range(self.iter_n):
-            training_batch_arr, test_batch_arr = None, None
-            training_label_arr, test_label_arr = None, None
-            for batch_size in range(self.batch_size):
-                dir_key = np.random.randint(low=0, high=len(self.__training_file_path_list))
-
-                training_one_hot_arr = torch.zeros(
-                    (
-                        1, 
-                        len(self.__training_file_path_list)
-                    ), 
-                    device=self.__ctx
-                )
-                training_one_hot_arr[0, dir_key] = 1
-
-                file_key = np.random.randint(low=0, high=len(self.__training_file_path_list[dir_key]))
-                training_data_arr = self.__image_extractor.extract(
-                    path=self.__training_file_path_list[dir_key][file_key],
-                )
-                training_data_arr = self.pre_normalize(training_data_arr)
-
-                test_dir_key = np.random.randint(low=0, high=len(self.__test_file_path_list))
-
-                test_one_hot_arr = torch.zeros(
-                    (
-                        1, 
-                        len(self.__test_file_path_list)
-                    ), 
-                    device=self.__ctx
-                )
-                test_one_hot_arr[0, test_dir_key] = 1
-
-                file_key = np.random.randint(low=0, high=len(self.__test_file_path_list[test_dir_key]))
-                test_data_arr = self.__image_extractor.extract(
-                    path=self.__test_file_path_list[test_dir_key][file_key],
-                )
-                test_data_arr = self.pre_normalize(test_data_arr)
-
-                training_data_arr = torch.unsqueeze(
-                    training_data_arr, 
-                    dim=0
-                )
-                test_data_arr = torch.unsqueeze(
-                    test_data_arr, 
-                    dim=0
-                )
-
-                if training_batch_arr is not None:
-                    training_batch_arr = torch.cat((training_batch_arr, training_data_arr), dim=0)
-                else:
-                    training_batch_arr = training_data_arr
-                
-                if test_batch_arr is not None:
-                    test_batch_arr = torch.cat((test_batch_arr, test_data_arr), dim=0)
-                else:
-                    test_batch_arr = test_data_arr
-
-                if training_label_arr is not None:
-                    training_label_arr = torch.cat((training_label_arr, training_one_hot_arr), dim=0)
-                else:
-                    training_label_arr = training_one_hot_arr
-
-                if test_label_arr is not None:
-                    test_label_arr = torch.cat((test_label_arr, test_one_hot_arr), dim=0)
-                else:
-                    test_label_arr = test_one_hot_arr
+        # The keys of directories are drawn with the paths, which may be ahead of this loop.
+        dir_key_deque = deque()
+        image_batch_loader = self.image_batch_loader
+        for batch_arr in image_batch_loader.generate(self.__draw_path_arr(dir_key_deque)):
+            dir_key_arr, test_dir_key_arr = dir_key_deque.popleft()
+            batch_arr = image_batch_loader.normalize(batch_arr, self.norm_mode, self.scale)
+            training_batch_arr, test_batch_arr = batch_arr[0], batch_arr[1]
+
+            training_label_arr = torch.zeros(
+                (
+                    self.batch_size,
+                    len(self.__training_file_path_list)
+                ),
+                device=self.__ctx
+            )
+            training_label_arr[torch.arange(self.batch_size), torch.from_numpy(dir_key_arr)] = 1
+            test_label_arr = torch.zeros(
+                (
+                    self.batch_size,
+                    len(self.__test_file_path_list)
+                ),
+                device=self.__ctx
+            )
+            test_label_arr[torch.arange(self.batch_size), torch.from_numpy(test_dir_key_arr)] = 1
 
             if self.__noiseable_data is not None:
                 training_batch_arr = self.__noiseable_data.noise(training_batch_arr)
 
             yield training_batch_arr.float(), training_label_arr.float(), test_batch_arr.float(), test_label_arr.float()
 
+    def __draw_path_arr(self, dir_key_deque):
+        '''
+        Draw the paths of mini-batches.
+
+        Args:
+            dir_key_deque:  `deque` to append the keys of directories in training and test.
+
+        Returns:
+            The generator of `np.ndarray` of paths.
+            The shape is (2, `batch_size`), and the first row is training data and the second row is test data.
+        '''
+        for _ in range(self.iter_n):
+            path_arr = np.empty((2, self.batch_size), dtype=object)
+            key_list = []
+            for i, file_path_list in enumerate([self.__training_file_path_list, self.__test_file_path_list]):
+                dir_key_arr = np.random.randint(low=0, high=len(file_path_list), size=self.batch_size)
+                for batch, dir_key in enumerate(dir_key_arr):
+                    file_key = np.random.randint(low=0, high=len(file_path_list[dir_key]))
+                    path_arr[i, batch] = file_path_list[dir_key][file_key]
+                key_list.append(dir_key_arr)
+            dir_key_deque.append(tuple(key_list))
+            yield path_arr
+
     def generate_inferenced_samples(self):
         '''
         Draw and generate data.
@@ -207,30 +210,17 @@ class LabeledImageIterator(_LabeledImageIterator):
         import random
         random.shuffle(scan_file_path_list)
 
-        test_batch_arr = None
-        file_path_list = []
-        for file_path in scan_file_path_list:
-            test_data_arr = self.__image_extractor.extract(
-                path=file_path,
-            )
-            test_data_arr = self.pre_normalize(test_data_arr)
-
-            test_data_arr = torch.unsqueeze(test_data_arr, dim=0)
-            if test_batch_arr is not None:
-                test_batch_arr = torch.cat((test_batch_arr, test_data_arr), dim=0)
-            else:
-                test_batch_arr = test_data_arr
-
-            file_path_list.append(file_path)
-
-            if test_batch_arr.shape[0] == self.batch_size:
-                test_batch_arr_ = test_batch_arr
-                test_batch_arr = None
-                _file_path_list = file_path_list
-                file_path_list = []
-                yield None, None, test_batch_arr_.float(), _file_path_list
-            elif test_batch_arr.shape[0] > self.batch_size:
-                raise ValueError()
+        # The last files that do not fill the batch are not generated.
+        batch_n = len(scan_file_path_list) // self.batch_size
+        path_arr_list = [
+            np.array(scan_file_path_list[i*self.batch_size:(i+1)*self.batch_size], dtype=object)
+            for i in range(batch_n)
+        ]
+
+        image_batch_loader = self.image_batch_loader
+        for i, test_batch_arr in enumerate(image_batch_loader.generate(path_arr_list)):
+            test_batch_arr = image_batch_loader.normalize(test_batch_arr, self.norm_mode, self.scale)
+            yield None, None, test_batch_arr.float(), path_arr_list[i].tolist()
 
     def pre_normalize(self, arr):
         '''
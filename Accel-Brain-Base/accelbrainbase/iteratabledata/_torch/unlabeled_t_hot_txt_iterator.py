@@ -5,6 +5,7 @@ import pandas as pd
 from logging import getLogger
 import os
 
+from accelbrainbase.extractabledata.token_id_corpus import TokenIdCorpus
 from accelbrainbase.extractabledata.unlabeled_csv_extractor import UnlabeledCSVExtractor
 from accelbrainbase.iteratabledata.unlabeled_image_iterator import UnlabeledImageIterator as _UnlabeledImageIterator
 from accelbrainbase.noiseable_data import NoiseableData
@@ -13,13 +14,19 @@ from accelbrainbase.noiseable_data import NoiseableData
 class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
     '''
     Iterator that draws from CSV files and generates `mxnet.ndarray` of unlabeled samples.
+
+    The text files are encoded to token ids only once by `TokenIdCorpus`,
+    and the windows of mini-batch are drawn by the vectorized gathers of token ids.
+    The one-hot vectors are made by `scatter_` on the device of `ctx`.
     '''
 
     def get_token_list(self):
         return self.__token_list
     
     def set_token_list(self, value):
-        self.__token_list = value
+        self.__token_list = list(value)
+        # The token ids depend on the vocabulary.
+        self.__build_corpus()
     
     token_list = property(get_token_list, set_token_list)
 
@@ -39,6 +46,21 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
 
     pre_txt_arr = property(get_pre_txt_arr, set_pre_txt_arr)
 
+    def get_train_corpus(self):
+        ''' getter '''
+        return self.__train_corpus
+
+    def get_test_corpus(self):
+        ''' getter '''
+        return self.__test_corpus
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    train_corpus = property(get_train_corpus, set_readonly)
+    test_corpus = property(get_test_corpus, set_readonly)
+
     def __init__(
         self,
         train_txt_path_list,
@@ -50,7 +72,9 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
         scale=1.0,
         noiseable_data=None,
         dataset_size=None,
-        ctx="cpu"
+        ctx="cpu",
+        memmap_dir=None,
+        one_hot_flag=True
     ):
         '''
         Init.
@@ -73,6 +97,12 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
             dataset_size:                   `int` of the dataset size.
                                             If `None`, this class will consider `dataset_size` as 
                                             the number of text in training data.
+            memmap_dir:                     `str` of directory to memory-map the token ids.
+                                            If `None`, the token ids are kept in memory.
+            one_hot_flag:                   If `True`, this class generates the one-hot vectors.
+                                            If `False`, this class generates the `torch.LongTensor` of
+                                            token ids for embedding layers, which is not normalized.
+                                            The shape is (`batch_size`, 1, `seq_len`).
         '''
         if noiseable_data is not None and isinstance(noiseable_data, NoiseableData) is False:
             raise TypeError("The type of `noiseable_data` must be `NoiseableData`.")
@@ -80,25 +110,21 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
         logger = getLogger("accelbrainbase")
         self.__logger = logger
 
-        train_txt = ""
-        for train_txt_path in train_txt_path_list:
-            with open(train_txt_path) as f:
-                train_txt += f.read()
-
-        if dataset_size is None:
-            dataset_size = len(train_txt)
-
-        iter_n = int(epochs * max(dataset_size / batch_size, 1))
-
-        train_token_list = list(train_txt)
-        self.__token_list = list(set(train_token_list))
-
         self.__train_txt_path_list = train_txt_path_list
         if test_txt_path_list is not None:
             self.__test_txt_path_list = test_txt_path_list
         else:
             self.__test_txt_path_list = train_txt_path_list
 
+        self.__memmap_dir = memmap_dir
+        self.__token_list = None
+        self.__build_corpus()
+
+        if dataset_size is None:
+            dataset_size = int(self.__train_corpus.length_arr.sum())
+
+        iter_n = int(epochs * max(dataset_size / batch_size, 1))
+
         self.iter_n = iter_n
         self.epochs = epochs
         self.batch_size = batch_size
@@ -108,9 +134,35 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
         self.__noiseable_data = noiseable_data
 
         self.__ctx = ctx
+        self.__one_hot_flag = one_hot_flag
 
         self.__pre_txt_arr = None
 
+    def __build_corpus(self):
+        '''
+        Encode the text files to token ids.
+        '''
+        train_memmap_path, test_memmap_path = None, None
+        if self.__memmap_dir is not None:
+            train_memmap_path = os.path.join(self.__memmap_dir, "train_token_id.npy")
+            test_memmap_path = os.path.join(self.__memmap_dir, "test_token_id.npy")
+
+        self.__train_corpus = TokenIdCorpus(
+            self.__train_txt_path_list,
+            token_list=self.__token_list,
+            memmap_path=train_memmap_path
+        )
+        self.__token_list = self.__train_corpus.token_list
+
+        if self.__test_txt_path_list == self.__train_txt_path_list:
+            self.__test_corpus = self.__train_corpus
+        else:
+            self.__test_corpus = TokenIdCorpus(
+                self.__test_txt_path_list,
+                token_list=self.__token_list,
+                memmap_path=test_memmap_path
+            )
+
     def generate_learned_samples(self):
         '''
         Draw and generate data.
@@ -122,61 +174,30 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
             - `mxnet.ndarray` of observed data points in test.
             - `mxnet.ndarray` of supervised data in test.
         '''
+        train_length_arr = self.__train_corpus.length_arr
+        test_length_arr = self.__test_corpus.length_arr
         for _ in range(self.iter_n):
-            training_batch_arr = np.zeros(
-                (
-                    self.batch_size,
-                    1,
-                    self.seq_len,
-                    len(self.__token_list)
-                ),
-            )
-            test_batch_arr = np.zeros(
-                (
-                    self.batch_size,
-                    1,
-                    self.seq_len,
-                    len(self.__token_list)
-                ),
-            )
-
-            for i in range(self.batch_size):
-                file_key = np.random.randint(low=0, high=len(self.__train_txt_path_list))
-                with open(self.__train_txt_path_list[file_key]) as f:
-                    train_txt = f.read()
+            file_key_arr = np.random.randint(low=0, high=train_length_arr.shape[0], size=self.batch_size)
+            test_file_key_arr = np.random.randint(low=0, high=test_length_arr.shape[0], size=self.batch_size)
 
-                test_file_key = np.random.randint(low=0, high=len(self.__test_txt_path_list))
-                with open(self.__test_txt_path_list[test_file_key]) as f:
-                    test_txt = f.read()
-                
-                if self.__pre_txt_arr is None:
-                    start_row = np.random.randint(low=0, high=len(train_txt) - self.seq_len)
-                    test_start_row = np.random.randint(low=0, high=len(test_txt) - self.seq_len)
+            start_arr = np.random.randint(low=0, high=train_length_arr[file_key_arr] - self.seq_len)
+            test_start_arr = np.random.randint(low=0, high=test_length_arr[test_file_key_arr] - self.seq_len)
 
-                    train_txt = train_txt[start_row:start_row+self.seq_len]
-                    test_txt = test_txt[test_start_row:test_start_row+self.seq_len]
-                else:
-                    if train_txt.index(self.__pre_txt_arr[i]) + (self.seq_len * 2) < len(train_txt):
-                        start_row = train_txt.index(self.__pre_txt_arr[i]) + self.seq_len
-                    else:
-                        start_row = np.random.randint(low=0, high=len(train_txt) - self.seq_len)
-                    train_txt = train_txt[start_row:start_row+self.seq_len]
-
-                    test_start_row = np.random.randint(low=0, high=len(test_txt) - self.seq_len)
-                    test_txt = test_txt[test_start_row:test_start_row+self.seq_len]
-
-
-                for seq in range(self.seq_len):
-                    training_batch_arr[i, 0, seq, self.__token_list.index(train_txt[seq])] = 1.0
-                    test_batch_arr[i, 0, seq, self.__token_list.index(test_txt[seq])] = 1.0
-
-            training_batch_arr = torch.from_numpy(training_batch_arr)
-            training_batch_arr = training_batch_arr.to(self.__ctx).float()
-            test_batch_arr = torch.from_numpy(test_batch_arr)
-            test_batch_arr = test_batch_arr.to(self.__ctx).float()
+            if self.__pre_txt_arr is not None:
+                for i in range(self.batch_size):
+                    pos = self.__train_corpus.find(
+                        file_key_arr[i],
+                        self.__train_corpus.encode(self.__pre_txt_arr[i])
+                    )
+                    if pos != -1 and pos + (self.seq_len * 2) < train_length_arr[file_key_arr[i]]:
+                        start_arr[i] = pos + self.seq_len
 
-            training_batch_arr = self.pre_normalize(training_batch_arr)
-            test_batch_arr = self.pre_normalize(test_batch_arr)
+            training_batch_arr = self.__to_tensor(
+                self.__train_corpus.gather(file_key_arr, start_arr, self.seq_len)
+            )
+            test_batch_arr = self.__to_tensor(
+                self.__test_corpus.gather(test_file_key_arr, test_start_arr, self.seq_len)
+            )
 
             if self.__noiseable_data is not None:
                 training_batch_arr = self.__noiseable_data.noise(training_batch_arr)
@@ -195,43 +216,42 @@ class UnlabeledTHotTXTIterator(_UnlabeledImageIterator):
             - `mxnet.ndarray` of observed data points in test.
             - file path.
         '''
+        test_length_arr = self.__test_corpus.length_arr
         for test_file_key in range(len(self.__test_txt_path_list)):
-            global_seq = 0
-            with open(self.__test_txt_path_list[test_file_key]) as f:
-                test_txt = f.read()
-
-            _test_batch_arr = np.zeros(
-                (
-                    self.batch_size,
-                    1,
-                    self.seq_len,
-                    len(self.__token_list)
-                ),
-            )
-            batch = 0
-            for start_row in range(len(test_txt) - (self.seq_len)):
-                for seq in range(self.seq_len):
-                    _test_batch_arr[
-                        batch, 
-                        0, 
-                        seq, 
-                        self.__token_list.index(test_txt[start_row+seq])
-                    ] = 1.0
-                batch += 1
-                if batch == self.batch_size:
-                    test_batch_arr = torch.from_numpy(_test_batch_arr)
-                    test_batch_arr = test_batch_arr.to(self.__ctx).float()
-                    test_batch_arr = self.pre_normalize(test_batch_arr)
-                    yield None, None, test_batch_arr, None
-                    batch = 0
-                    _test_batch_arr = np.zeros(
-                        (
-                            self.batch_size,
-                            1,
-                            self.seq_len,
-                            len(self.__token_list)
-                        ),
-                    )
+            row_n = test_length_arr[test_file_key] - self.seq_len
+            # The last windows that do not fill the batch are not generated.
+            for batch_start in range(0, row_n - self.batch_size + 1, self.batch_size):
+                id_arr = self.__test_corpus.gather(
+                    np.repeat(test_file_key, self.batch_size),
+                    np.arange(batch_start, batch_start + self.batch_size),
+                    self.seq_len
+                )
+                yield None, None, self.__to_tensor(id_arr), None
+
+    def __to_tensor(self, id_arr):
+        '''
+        Transform token ids to the tensor of mini-batch.
+
+        Args:
+            id_arr:     `np.ndarray` of token ids. The shape is (batch size, `seq_len`).
+
+        Returns:
+            Tensor of one-hot vectors. The shape is (batch size, 1, `seq_len`, the number of tokens).
+            If `one_hot_flag` is `False`, the tensor of token ids. The shape is (batch size, 1, `seq_len`).
+        '''
+        id_arr = torch.from_numpy(id_arr.astype(np.int64)).to(self.__ctx).unsqueeze(1)
+        if self.__one_hot_flag is False:
+            return id_arr
+
+        token_n = len(self.__token_list)
+        # The tokens out of the vocabulary are scattered to the extra column, and it is dropped.
+        id_arr = torch.where(id_arr < 0, torch.full_like(id_arr, token_n), id_arr)
+        batch_arr = torch.zeros(
+            (id_arr.shape[0], 1, id_arr.shape[2], token_n + 1),
+            device=id_arr.device
+        )
+        batch_arr.scatter_(3, id_arr.unsqueeze(-1), 1.0)
+        return self.pre_normalize(batch_arr[:, :, :, :token_n])
 
     def pre_normalize(self, arr):
         '''
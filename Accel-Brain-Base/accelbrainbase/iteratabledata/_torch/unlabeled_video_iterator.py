@@ -5,8 +5,11 @@ import torch
 from logging import getLogger
 import os
 import random
+import tempfile
 
 from accelbrainbase.extractabledata.image_extractor import ImageExtractor
+from accelbrainbase.extractabledata.video_frame_corpus import VideoFrameCorpus
+from accelbrainbase.iteratabledata._torch.image_batch_loader import ImageBatchLoader
 from accelbrainbase.iteratabledata.unlabeled_image_iterator import UnlabeledImageIterator as _UnlabeledImageIterator
 from accelbrainbase.noiseable_data import NoiseableData
 
@@ -14,8 +17,32 @@ from accelbrainbase.noiseable_data import NoiseableData
 class UnlabeledVideoIterator(_UnlabeledImageIterator):
     '''
     Iterator that draws from image files and generates `mxnet.ndarray` of unlabeled samples.
+
+    The frames of each directory are decoded only once by `VideoFrameCorpus`
+    through the pool of `image_batch_loader`, when the samples are drawn for the first time.
+    The decoded frames are memory-mapped, in a temporary directory unless `memmap_dir` is specified,
+    so that long videos are not kept in memory.
+    The clips are drawn by one vectorized gather of frames per mini-batch,
+    and normalized by `image_batch_loader`.
     '''
 
+    # is-a `ImageBatchLoader`.
+    __image_batch_loader = None
+
+    def get_image_batch_loader(self):
+        ''' getter '''
+        if self.__image_batch_loader is None:
+            self.__image_batch_loader = ImageBatchLoader(self.__image_extractor)
+        return self.__image_batch_loader
+
+    def set_image_batch_loader(self, value):
+        ''' setter '''
+        if isinstance(value, ImageBatchLoader) is False:
+            raise TypeError("The type of `image_batch_loader` must be `ImageBatchLoader`.")
+        self.__image_batch_loader = value
+
+    image_batch_loader = property(get_image_batch_loader, set_image_batch_loader)
+
     def __init__(
         self, 
         image_extractor, 
@@ -28,6 +55,7 @@ class UnlabeledVideoIterator(_UnlabeledImageIterator):
         norm_mode="z_score",
         scale=1.0,
         noiseable_data=None,
+        memmap_dir=None,
     ):
         '''
         Init.
@@ -55,6 +83,9 @@ class UnlabeledVideoIterator(_UnlabeledImageIterator):
 
             scale:                          `float` of scaling factor for data.
             noiseable_data:                 is-a `NoiseableData` for Denoising Auto-Encoders.
+            memmap_dir:                     `str` of directory to memory-map the decoded frames.
+                                            If `None`, a temporary directory is used,
+                                            which is removed with this iterator.
         '''
 
         if isinstance(image_extractor, ImageExtractor) is False:
@@ -114,6 +145,40 @@ class UnlabeledVideoIterator(_UnlabeledImageIterator):
         self.scale = scale
         self.__noiseable_data = noiseable_data
 
+        self.__memmap_dir = memmap_dir
+        self.__temp_dir = None
+        self.__train_corpus = None
+        self.__test_corpus = None
+
+    def __build_corpus(self):
+        '''
+        Decode the frames to `VideoFrameCorpus` if they have not been decoded yet.
+        '''
+        if self.__train_corpus is not None:
+            return
+
+        memmap_dir = self.__memmap_dir
+        if memmap_dir is None:
+            # The directory is removed when this iterator is garbage-collected.
+            self.__temp_dir = tempfile.TemporaryDirectory()
+            memmap_dir = self.__temp_dir.name
+
+        self.__train_corpus = VideoFrameCorpus(
+            self.__image_extractor,
+            self.__training_file_path_list,
+            memmap_path=os.path.join(memmap_dir, "train_frame.npy"),
+            batch_loader=self.image_batch_loader
+        )
+        if self.__test_file_path_list is self.__training_file_path_list:
+            self.__test_corpus = self.__train_corpus
+        else:
+            self.__test_corpus = VideoFrameCorpus(
+                self.__image_extractor,
+                self.__test_file_path_list,
+                memmap_path=os.path.join(memmap_dir, "test_frame.npy"),
+                batch_loader=self.image_batch_loader
+            )
+
     def generate_learned_samples(self):
         '''
         Draw and generate data.
@@ -125,67 +190,23 @@ class UnlabeledVideoIterator(_UnlabeledImageIterator):
             - `mxnet.ndarray` of observed data points in test.
             - `mxnet.ndarray` of supervised data in test.
         '''
+        self.__build_corpus()
+
+        # The number of frames at intervals.
+        train_length_arr = (self.__train_corpus.length_arr + self.__at_intervals - 1) // self.__at_intervals
+        test_length_arr = (self.__test_corpus.length_arr + self.__at_intervals - 1) // self.__at_intervals
         for _ in range(self.iter_n):
-            training_batch_arr, test_batch_arr = None, None
-            for batch_size in range(self.batch_size):
-                dir_key = np.random.randint(low=0, high=len(self.__training_file_path_list))
-                training_file_path_list = self.__split_at_intervals(
-                    self.__training_file_path_list[dir_key], 
-                    start_pos=0, 
-                    seq_interval=self.__at_intervals
-                )
-
-                training_data_arr, test_data_arr = None, None
-                training_file_key = np.random.randint(
-                    low=0,
-                    high=len(training_file_path_list) - self.__seq_len
-                )
-
-                test_dir_key = np.random.randint(low=0, high=len(self.__test_file_path_list))
-                test_file_path_list = self.__split_at_intervals(
-                    self.__test_file_path_list[test_dir_key], 
-                    start_pos=0, 
-                    seq_interval=self.__at_intervals
-                )
-
-                test_file_key = np.random.randint(
-                    low=0,
-                    high=len(test_file_path_list) - self.__seq_len
-                )
-                for seq in range(self.__seq_len):
-                    seq_training_batch_arr = self.__image_extractor.extract(
-                        path=training_file_path_list[training_file_key+seq],
-                    )
-                    seq_training_batch_arr = self.pre_normalize(seq_training_batch_arr)
-                    seq_training_batch_arr = torch.unsqueeze(seq_training_batch_arr, dim=0)
-                    seq_test_batch_arr = self.__image_extractor.extract(
-                        path=test_file_path_list[test_file_key+seq],
-                    )
-                    seq_test_batch_arr = self.pre_normalize(seq_test_batch_arr)
-                    seq_test_batch_arr = torch.unsqueeze(seq_test_batch_arr, dim=0)
-
-                    if training_data_arr is not None:
-                        training_data_arr = torch.cat((training_data_arr, seq_training_batch_arr), dim=0)
-                    else:
-                        training_data_arr = seq_training_batch_arr
-                    
-                    if test_data_arr is not None:
-                        test_data_arr = torch.cat((test_data_arr, seq_test_batch_arr), dim=0)
-                    else:
-                        test_data_arr = seq_test_batch_arr
-
-                training_data_arr = torch.unsqueeze(training_data_arr, dim=0)
-                test_data_arr = torch.unsqueeze(test_data_arr, dim=0)
-
-                if training_batch_arr is not None:
-                    training_batch_arr = torch.cat((training_batch_arr, training_data_arr), dim=0)
-                else:
-                    training_batch_arr = training_data_arr
-
-                if test_batch_arr is not None:
-                    test_batch_arr = torch.cat((test_batch_arr, test_data_arr), dim=0)
-                else:
-                    test_batch_arr = test_data_arr
+            dir_key_arr = np.random.randint(low=0, high=train_length_arr.shape[0], size=self.batch_size)
+            file_key_arr = np.random.randint(low=0, high=train_length_arr[dir_key_arr] - self.__seq_len)
+            test_dir_key_arr = np.random.randint(low=0, high=test_length_arr.shape[0], size=self.batch_size)
+            test_file_key_arr = np.random.randint(low=0, high=test_length_arr[test_dir_key_arr] - self.__seq_len)
+
+            training_batch_arr = self.__to_tensor(
+                self.__train_corpus.gather(dir_key_arr, file_key_arr, self.__seq_len, self.__at_intervals)
+            )
+            test_batch_arr = self.__to_tensor(
+                self.__test_corpus.gather(test_dir_key_arr, test_file_key_arr, self.__seq_len, self.__at_intervals)
+            )
 
             if self.__noiseable_data is not None:
                 training_batch_arr = self.__noiseable_data.noise(training_batch_arr)
@@ -204,50 +225,44 @@ class UnlabeledVideoIterator(_UnlabeledImageIterator):
             - `mxnet.ndarray` of observed data points in test.
             - file path.
         '''
-        scan_file_path_list = []
-        for dir_key in range(len(self.__test_file_path_list)):
-            for file_key in range(len(self.__test_file_path_list[dir_key]) - self.__seq_len):
-                _scan_file_path_list = []
-                for seq in range(self.__seq_len):
-                    file_path = self.__test_file_path_list[dir_key][file_key+seq]
-                    _scan_file_path_list.append(file_path)
-                scan_file_path_list.append(_scan_file_path_list)
-
-        import random
-        random.shuffle(scan_file_path_list)
-
-        test_batch_arr = None
-        file_path_list = []
-        for _file_path_list_ in scan_file_path_list:
-            test_data_arr = None
-            for seq in range(self.__seq_len):
-                file_path = _file_path_list_[seq]
-                seq_test_batch_arr = self.__image_extractor.extract(
-                    path=file_path,
-                )
-                seq_test_batch_arr = self.pre_normalize(seq_test_batch_arr)
-                seq_test_batch_arr = torch.unsqueeze(seq_test_batch_arr, dim=0)
-                if test_data_arr is not None:
-                    test_data_arr = torch.cat((test_data_arr, seq_test_batch_arr), dim=0)
-                else:
-                    test_data_arr = seq_test_batch_arr
-
-            test_data_arr = torch.unsqueeze(test_data_arr, dim=0)
-            if test_batch_arr is not None:
-                test_batch_arr = torch.cat((test_batch_arr, test_data_arr), dim=0)
-            else:
-                test_batch_arr = test_data_arr
+        self.__build_corpus()
+
+        test_length_arr = self.__test_corpus.length_arr
+        key_arr = np.array(
+            [
+                (dir_key, file_key)
+                for dir_key in range(test_length_arr.shape[0])
+                for file_key in range(test_length_arr[dir_key] - self.__seq_len)
+            ],
+            dtype=np.int64
+        ).reshape(-1, 2)
+        np.random.shuffle(key_arr)
+
+        # The last sequences that do not fill the batch are not generated.
+        for i in range(key_arr.shape[0] // self.batch_size):
+            batch_key_arr = key_arr[i*self.batch_size:(i+1)*self.batch_size]
+            test_batch_arr = self.__to_tensor(
+                self.__test_corpus.gather(batch_key_arr[:, 0], batch_key_arr[:, 1], self.__seq_len)
+            )
+            # The path of the last frame in each sequence.
+            file_path_list = [
+                self.__test_file_path_list[dir_key][file_key+self.__seq_len-1]
+                for dir_key, file_key in batch_key_arr
+            ]
+            yield None, None, test_batch_arr, file_path_list
+
+    def __to_tensor(self, batch_arr):
+        '''
+        Transform the clips to the normalized tensor.
 
-            file_path_list.append(file_path)
+        Args:
+            batch_arr:  `np.ndarray` of clips.
 
-            if test_batch_arr.shape[0] == self.batch_size:
-                test_batch_arr_ = test_batch_arr
-                test_batch_arr = None
-                _file_path_list = file_path_list
-                file_path_list = []
-                yield None, None, test_batch_arr_, _file_path_list
-            elif test_batch_arr.shape[0] > self.batch_size:
-                raise ValueError()
+        Returns:
+            Tensor.
+        '''
+        batch_arr = torch.from_numpy(batch_arr).to(getattr(self.__image_extractor, "ctx", "cpu"))
+        return self.image_batch_loader.normalize(batch_arr, self.norm_mode, self.scale)
 
     def pre_normalize(self, arr):
         '''
@@ -274,6 +289,3 @@ class UnlabeledVideoIterator(_UnlabeledImageIterator):
         arr = arr * self.scale
         return arr
 
-    def __split_at_intervals(self, file_path_list, start_pos=0, seq_interval=1):
-        file_path_arr = np.array(file_path_list)
-        return file_path_arr[list(range(start_pos, len(file_path_list), seq_interval))].tolist()
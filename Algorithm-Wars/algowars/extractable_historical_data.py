@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+from algowars.market_data_cube import MarketDataCube
 
 
 class ExtractableHistoricalData(metaclass=ABCMeta):
@@ -7,6 +8,16 @@ class ExtractableHistoricalData(metaclass=ABCMeta):
     The interface to load, save, and extract the historical data.
     '''
 
+    # Default features of `MarketDataCube`.
+    __cube_features_list = [
+        "adjusted_close",
+        "close",
+        "high",
+        "low",
+        "open",
+        "volume"
+    ]
+
     @abstractmethod
     def extract(self, start_date, end_date, ticker_list):
         '''
@@ -18,3 +29,33 @@ class ExtractableHistoricalData(metaclass=ABCMeta):
             ticker_list:    `list` of The target tickers.
         '''
         raise NotImplementedError()
+
+    def extract_cube(
+        self,
+        start_date,
+        end_date,
+        ticker_list,
+        feature_list=None,
+        date_column="date_key"
+    ):
+        '''
+        Extract histroical data as the cube of (date, ticker, feature).
+
+        Args:
+            start_date:     The date range(start).
+            end_date:       The date range(end).
+            ticker_list:    `list` of The target tickers.
+            feature_list:   `list` of features. If `None`, prices and volume.
+            date_column:    `str` of the column of dates.
+
+        Returns:
+            `MarketDataCube`.
+        '''
+        if feature_list is None:
+            feature_list = self.__cube_features_list
+
+        return MarketDataCube(
+            self.extract(start_date, end_date, ticker_list),
+            feature_list=feature_list,
+            date_column=date_column
+        )
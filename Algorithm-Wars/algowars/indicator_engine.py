@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+import copy
+import numpy as np
+import pandas as pd
+from algowars.market_data_cube import MarketDataCube
+
+
+class IndicatorEngine(object):
+    '''
+    Engine of technical indicators, which are updated incrementally.
+
+    The running accumulators of the registered indicators are kept for each ticker,
+    and updated in O(1) per new bar for all tickers at once:
+
+    - RSI: the cumulative gains and losses.
+    - Bollinger band: the rolling mean and the rolling sum of squared deviations.
+    - MACD: the numerators and the denominators of the adjusted EMAs,
+        which are equivalent to `pd.Series.ewm(span).mean()`.
+    - Windows: the ring buffer of the latest closes.
+
+    `update` feeds only the dates which have not been fed yet.
+    If the history is rewound or replaced from a date, the accumulators are rolled back
+    to the checkpoint of that date and only the dates after it are fed again.
+    The checkpoints are kept for the latest `max_checkpoint_n` dates.
+    '''
+
+    # Feature of close prices in `MarketDataCube`.
+    __close_feature = "adjusted_close"
+
+    def __init__(self, ticker_list, max_checkpoint_n=256):
+        '''
+        Init.
+
+        Args:
+            ticker_list:        `list` of ticker symbols.
+            max_checkpoint_n:   `int` of the number of the latest dates whose checkpoints are kept.
+        '''
+        if isinstance(ticker_list, list) is False:
+            raise TypeError("The type of `ticker_list` must be `list`.")
+        if isinstance(max_checkpoint_n, int) is False:
+            raise TypeError("The type of `max_checkpoint_n` must be `int`.")
+
+        self.__ticker_list = ticker_list
+        self.__max_checkpoint_n = max_checkpoint_n
+        # The last `np.ndarray` of historical data and its dates and closes.
+        self.__historical_arr = None
+        self.__historical_tuple = None
+        self.__rsi_flag = False
+        self.__bollinger_band_dict = {}
+        self.__macd_dict = {}
+        self.__window_n = 0
+        self.reset()
+
+    def add_rsi(self):
+        '''
+        Register RSI.
+        '''
+        if self.__rsi_flag is False:
+            self.__rsi_flag = True
+            self.reset()
+
+    def add_bollinger_band(self, time_window):
+        '''
+        Register Bollinger band.
+
+        Args:
+            time_window:    `int` of the window of the moving average.
+        '''
+        if time_window not in self.__bollinger_band_dict:
+            self.__bollinger_band_dict[time_window] = None
+            self.add_window(time_window)
+            self.reset()
+
+    def add_macd(self, short_term, long_term, signal_term):
+        '''
+        Register MACD.
+
+        Args:
+            short_term:     `int` of the span of the short EMA.
+            long_term:      `int` of the span of the long EMA.
+            signal_term:    `int` of the span of the signal EMA.
+        '''
+        key = (short_term, long_term, signal_term)
+        if key not in self.__macd_dict:
+            self.__macd_dict[key] = None
+            self.reset()
+
+    def add_window(self, window_n):
+        '''
+        Register the window of the latest closes.
+
+        Args:
+            window_n:   `int` of the length of the window.
+        '''
+        if window_n > self.__window_n:
+            self.__window_n = window_n
+            self.reset()
+
+    def reset(self):
+        '''
+        Reset the accumulators.
+        '''
+        ticker_n = len(self.__ticker_list)
+        self.__date_n = 0
+        # The dates and the closes which have been fed.
+        self.__date_arr = np.empty(0, dtype=object)
+        self.__close_arr = np.empty((0, ticker_n))
+        # {the number of dates: the accumulators after the dates are fed}
+        self.__checkpoint_dict = {}
+        self.__bar_n_arr = np.zeros(ticker_n, dtype=int)
+        self.__last_close_arr = np.full(ticker_n, np.nan)
+        self.__gain_arr = np.zeros(ticker_n)
+        self.__loss_arr = np.zeros(ticker_n)
+        self.__window_arr = np.full((self.__window_n, ticker_n), np.nan)
+        for time_window in self.__bollinger_band_dict.keys():
+            self.__bollinger_band_dict[time_window] = {
+                "mean": np.zeros(ticker_n),
+                "m2": np.zeros(ticker_n),
+            }
+        for key in self.__macd_dict.keys():
+            self.__macd_dict[key] = {
+                "short": np.zeros((2, ticker_n)),
+                "long": np.zeros((2, ticker_n)),
+                "signal": np.zeros((2, ticker_n)),
+                "macd": np.full((2, ticker_n), np.nan),
+                "signal_ema": np.full((2, ticker_n), np.nan),
+            }
+
+    def update(self, historical_arr):
+        '''
+        Feed the new dates.
+
+        Args:
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
+                                The closes pivoted from `np.ndarray` are cached
+                                until the other `np.ndarray` is fed.
+        '''
+        date_arr, close_arr = self.__extract_close_arr(historical_arr)
+
+        # The first date which differs from the dates which have been fed.
+        date_n = min(self.__date_n, date_arr.shape[0])
+        with np.errstate(invalid='ignore'):
+            same_arr = np.logical_or(
+                close_arr[:date_n] == self.__close_arr[:date_n],
+                np.logical_and(np.isnan(close_arr[:date_n]), np.isnan(self.__close_arr[:date_n]))
+            ).all(axis=1)
+        same_arr = np.logical_and(same_arr, np.asarray(date_arr[:date_n] == self.__date_arr[:date_n]))
+        if bool(same_arr.all()) is False:
+            date_n = int(np.argmin(same_arr))
+
+        if date_n < self.__date_n:
+            self.__rollback(date_n)
+
+        for date_i in range(self.__date_n, date_arr.shape[0]):
+            self.__update_row(close_arr[date_i])
+            if date_i + 1 > date_arr.shape[0] - self.__max_checkpoint_n:
+                self.__checkpoint_dict[date_i + 1] = self.__dump_state()
+
+        self.__date_n = date_arr.shape[0]
+        self.__date_arr = date_arr
+        self.__close_arr = close_arr
+
+        # The checkpoints older than the latest `max_checkpoint_n` dates are dropped.
+        for key in [key for key in self.__checkpoint_dict.keys() if key <= self.__date_n - self.__max_checkpoint_n]:
+            del self.__checkpoint_dict[key]
+
+    def __rollback(self, date_n):
+        '''
+        Roll back the accumulators to the checkpoint.
+        If there is no checkpoint, the accumulators are reset.
+
+        Args:
+            date_n:     `int` of the number of dates which are kept.
+        '''
+        state = self.__checkpoint_dict.get(date_n)
+        if state is None:
+            self.reset()
+            return
+
+        self.__load_state(state)
+        self.__date_n = date_n
+        for key in [key for key in self.__checkpoint_dict.keys() if key > date_n]:
+            del self.__checkpoint_dict[key]
+
+    def __dump_state(self):
+        '''
+        Copy the accumulators.
+
+        Returns:
+            `tuple` of the accumulators.
+        '''
+        return copy.deepcopy((
+            self.__bar_n_arr,
+            self.__last_close_arr,
+            self.__gain_arr,
+            self.__loss_arr,
+            self.__window_arr,
+            self.__bollinger_band_dict,
+            self.__macd_dict,
+        ))
+
+    def __load_state(self, state):
+        '''
+        Restore the accumulators.
+
+        Args:
+            state:  `tuple` of the accumulators, which is made by `__dump_state`.
+        '''
+        (
+            self.__bar_n_arr,
+            self.__last_close_arr,
+            self.__gain_arr,
+            self.__loss_arr,
+            self.__window_arr,
+            self.__bollinger_band_dict,
+            self.__macd_dict,
+        ) = copy.deepcopy(state)
+
+    def __extract_close_arr(self, historical_arr):
+        '''
+        Extract the dates and the closes of the tickers.
+
+        Args:
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
+
+        Returns:
+            Tuple data.
+            - `np.ndarray` of dates in ascending order.
+            - `np.ndarray` of closes. The shape is (date, ticker), and `np.nan` means no bar.
+        '''
+        if isinstance(historical_arr, MarketDataCube) is True:
+            ticker_i_arr = np.array(
+                [historical_arr.ticker_dict.get(ticker, -1) for ticker in self.__ticker_list],
+                dtype=int
+            )
+            feature_i = historical_arr.feature_list.index(self.__close_feature)
+            close_arr = historical_arr.cube_arr[:, np.maximum(ticker_i_arr, 0), feature_i]
+            return historical_arr.date_arr, np.where(ticker_i_arr >= 0, close_arr, np.nan)
+
+        if historical_arr is not self.__historical_arr:
+            # The dates and the tickers are interned by the hash tables instead of sorting the objects.
+            date_i_arr, date_arr = pd.factorize(historical_arr[:, 0], sort=True)
+            ticker_i_arr = pd.Index(self.__ticker_list).get_indexer(historical_arr[:, 3])
+            row_arr = ticker_i_arr >= 0
+            close_arr = np.full((date_arr.shape[0], len(self.__ticker_list)), np.nan)
+            close_arr[date_i_arr[row_arr], ticker_i_arr[row_arr]] = historical_arr[row_arr, 1].astype(np.float64)
+            self.__historical_arr = historical_arr
+            self.__historical_tuple = (np.asarray(date_arr), close_arr)
+        return self.__historical_tuple
+
+    def __update_row(self, close_arr):
+        '''
+        Update the accumulators by one bar of each ticker.
+
+        Args:
+            close_arr:  `np.ndarray` of closes. `np.nan` means no bar.
+        '''
+        bar_arr = np.isnan(close_arr) == False
+        x_arr = np.where(bar_arr, close_arr, 0.0)
+
+        if self.__rsi_flag is True:
+            with np.errstate(invalid='ignore'):
+                diff_arr = np.nan_to_num(x_arr - self.__last_close_arr)
+            diff_arr = np.where(np.logical_and(bar_arr, self.__bar_n_arr > 0), diff_arr, 0.0)
+            self.__gain_arr = self.__gain_arr + np.maximum(diff_arr, 0.0)
+            self.__loss_arr = self.__loss_arr - np.minimum(diff_arr, 0.0)
+
+        for time_window, state_dict in self.__bollinger_band_dict.items():
+            count_arr = np.minimum(self.__bar_n_arr, time_window)
+            mean_arr = state_dict["mean"]
+            m2_arr = state_dict["m2"]
+
+            # The bar which leaves the window.
+            old_arr = self.__window_arr[
+                (self.__bar_n_arr - time_window) % self.__window_n,
+                np.arange(close_arr.shape[0])
+            ]
+            full_arr = np.logical_and(bar_arr, count_arr == time_window)
+            old_arr = np.where(full_arr, old_arr, 0.0)
+            new_count_arr = np.where(full_arr, count_arr, count_arr + 1)
+
+            delta_arr = x_arr - np.where(full_arr, old_arr, mean_arr)
+            new_mean_arr = mean_arr + delta_arr / new_count_arr
+            new_m2_arr = np.where(
+                full_arr,
+                m2_arr + delta_arr * (x_arr - new_mean_arr + old_arr - mean_arr),
+                m2_arr + delta_arr * (x_arr - new_mean_arr)
+            )
+            state_dict["mean"] = np.where(bar_arr, new_mean_arr, mean_arr)
+            state_dict["m2"] = np.where(bar_arr, new_m2_arr, m2_arr)
+
+        for (short_term, long_term, signal_term), state_dict in self.__macd_dict.items():
+            ema_short_arr = self.__update_ema(state_dict["short"], x_arr, bar_arr, short_term)
+            ema_long_arr = self.__update_ema(state_dict["long"], x_arr, bar_arr, long_term)
+            macd_arr = ema_short_arr - ema_long_arr
+            signal_arr = self.__update_ema(state_dict["signal"], macd_arr, bar_arr, signal_term)
+
+            state_dict["macd"] = np.where(bar_arr, np.r_[state_dict["macd"][1:], macd_arr[np.newaxis]], state_dict["macd"])
+            state_dict["signal_ema"] = np.where(
+                bar_arr,
+                np.r_[state_dict["signal_ema"][1:], signal_arr[np.newaxis]],
+                state_dict["signal_ema"]
+            )
+
+        if self.__window_n > 0:
+            ticker_i_arr = np.nonzero(bar_arr)[0]
+            self.__window_arr[self.__bar_n_arr[ticker_i_arr] % self.__window_n, ticker_i_arr] = x_arr[ticker_i_arr]
+
+        self.__bar_n_arr = self.__bar_n_arr + bar_arr
+        self.__last_close_arr = np.where(bar_arr, x_arr, self.__last_close_arr)
+
+    def __update_ema(self, ema_arr, x_arr, bar_arr, span):
+        '''
+        Update the adjusted EMA.
+
+        Args:
+            ema_arr:    `np.ndarray` of the numerators and the denominators. The shape is (2, ticker).
+            x_arr:      `np.ndarray` of values.
+            bar_arr:    `np.ndarray` of `bool`, which means the ticker has the new bar or not.
+            span:       `int` of the span.
+
+        Returns:
+            `np.ndarray` of EMAs.
+        '''
+        decay = 1.0 - 2.0 / (span + 1.0)
+        ema_arr[0] = np.where(bar_arr, x_arr + decay * ema_arr[0], ema_arr[0])
+        ema_arr[1] = np.where(bar_arr, 1.0 + decay * ema_arr[1], ema_arr[1])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return ema_arr[0] / ema_arr[1]
+
+    def compute_rsi(self):
+        '''
+        Compute RSI of all tickers.
+
+        Returns:
+            `np.ndarray` of RSI. If the ticker has 2 bars or less, `0.5`.
+        '''
+        total_arr = self.__gain_arr + self.__loss_arr
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rsi_arr = self.__gain_arr / total_arr
+        return np.where(np.logical_and(self.__bar_n_arr > 2, total_arr != 0), rsi_arr, 0.5)
+
+    def compute_bollinger_band_signal(self, time_window, contrarian=False):
+        '''
+        Compute signals of Bollinger band of all tickers.
+
+        Args:
+            time_window:    `int` of the window of the moving average.
+            contrarian:     `bool`. If `True`, the signals out of the band are inverted.
+
+        Returns:
+            `np.ndarray` of signals. The distance from the band if the close is out of the band, or `1.0`.
+        '''
+        state_dict = self.__bollinger_band_dict[time_window]
+        count_arr = np.maximum(np.minimum(self.__bar_n_arr, time_window), 1)
+        mu_arr = state_dict["mean"]
+        sigma_arr = np.sqrt(np.maximum(state_dict["m2"] / count_arr, 0.0))
+        upper_arr = mu_arr + (2 * sigma_arr)
+        lower_arr = mu_arr - (2 * sigma_arr)
+
+        close_arr = self.__last_close_arr
+        sign = -1.0 if contrarian is True else 1.0
+        signal_arr = np.ones(close_arr.shape[0])
+        bar_arr = self.__bar_n_arr > 0
+        signal_arr = np.where(np.logical_and(bar_arr, close_arr < lower_arr), (close_arr - lower_arr) * sign, signal_arr)
+        signal_arr = np.where(np.logical_and(bar_arr, close_arr > upper_arr), (close_arr - upper_arr) * sign, signal_arr)
+        return signal_arr
+
+    def compute_macd_signal(self, short_term, long_term, signal_term):
+        '''
+        Compute signals of the crossovers of MACD and its signal of all tickers.
+
+        Args:
+            short_term:     `int` of the span of the short EMA.
+            long_term:      `int` of the span of the long EMA.
+            signal_term:    `int` of the span of the signal EMA.
+
+        Returns:
+            `np.ndarray` of signals.
+            - `1.0`: MACD crosses its signal downward.
+            - `-1.0`: MACD crosses its signal upward.
+            - `0.0`: Otherwise.
+        '''
+        state_dict = self.__macd_dict[(short_term, long_term, signal_term)]
+        macd_arr = state_dict["macd"]
+        signal_ema_arr = state_dict["signal_ema"]
+        with np.errstate(invalid='ignore'):
+            down_arr = np.logical_and(macd_arr[0] > signal_ema_arr[0], macd_arr[1] < signal_ema_arr[1])
+            up_arr = np.logical_and(macd_arr[0] < signal_ema_arr[0], macd_arr[1] > signal_ema_arr[1])
+
+        signal_arr = np.zeros(macd_arr.shape[1])
+        signal_arr = np.where(up_arr, -1.0, signal_arr)
+        signal_arr = np.where(down_arr, 1.0, signal_arr)
+        return signal_arr
+
+    def extract_window_arr(self, ticker_i, window_n):
+        '''
+        Extract the latest closes of the ticker.
+
+        Args:
+            ticker_i:   `int` of the index of the ticker.
+            window_n:   `int` of the length of the window, which must be registered by `add_window`.
+
+        Returns:
+            `np.ndarray` of closes in order. The shape is (the number of closes, 1).
+        '''
+        bar_n = self.__bar_n_arr[ticker_i]
+        index_arr = np.arange(max(bar_n - window_n, 0), bar_n) % self.__window_n
+        return self.__window_arr[index_arr, ticker_i].reshape(-1, 1)
+
+    def get_ticker_list(self):
+        ''' getter '''
+        return self.__ticker_list
+
+    def get_bar_n_arr(self):
+        ''' getter '''
+        return self.__bar_n_arr
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    ticker_list = property(get_ticker_list, set_readonly)
+    bar_n_arr = property(get_bar_n_arr, set_readonly)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+import copy
+import numpy as np
+
+
+class MarketDataCube(object):
+    '''
+    Dense cube of market data.
+
+    The long-format historical data is pivoted only once into `np.ndarray` of float64,
+    whose shape is (date, ticker, feature). The dates and the tickers are sorted in ascending order,
+    and their indices are interned by `dict`, so that the series of a ticker and the rows of a date
+    are sliced as the views in O(1) instead of the boolean masks over all rows.
+    The missing values are `np.nan`.
+
+    `until` makes the view of the cube until the date, which shares the memory of this cube.
+    '''
+
+    def __init__(
+        self,
+        historical_df,
+        feature_list,
+        date_column="date_key",
+        ticker_column="ticker"
+    ):
+        '''
+        Init.
+
+        Args:
+            historical_df:      `pd.DataFrame` of long-format historical data.
+            feature_list:       `list` of columns of features.
+            date_column:        `str` of the column of dates.
+            ticker_column:      `str` of the column of tickers.
+        '''
+        if isinstance(feature_list, list) is False:
+            raise TypeError("The type of `feature_list` must be `list`.")
+
+        date_arr, date_index_arr = np.unique(historical_df[date_column].values, return_inverse=True)
+        ticker_arr, ticker_index_arr = np.unique(historical_df[ticker_column].values, return_inverse=True)
+
+        cube_arr = np.full((date_arr.shape[0], ticker_arr.shape[0], len(feature_list)), np.nan)
+        cube_arr[date_index_arr.ravel(), ticker_index_arr.ravel()] = historical_df[feature_list].values.astype(np.float64)
+
+        self.__cube_arr = cube_arr
+        self.__date_arr = date_arr
+        self.__ticker_list = ticker_arr.tolist()
+        self.__feature_list = feature_list
+        self.__date_dict = {date: i for i, date in enumerate(date_arr.tolist())}
+        self.__ticker_dict = {ticker: i for i, ticker in enumerate(self.__ticker_list)}
+        self.__feature_dict = {feature: i for i, feature in enumerate(feature_list)}
+
+        # The number of rows which have any missing values until each date, per ticker.
+        self.__nan_count_arr = np.cumsum(np.isnan(cube_arr).any(axis=2), axis=0)
+        # The number of rows of long-format data until each date.
+        self.__row_count_arr = np.cumsum((~np.isnan(cube_arr).all(axis=2)).sum(axis=1))
+
+    def until(self, date):
+        '''
+        Make the view of the cube until the date.
+
+        Args:
+            date:   The last date, inclusive.
+
+        Returns:
+            `MarketDataCube`.
+        '''
+        date_n = int(np.searchsorted(self.__date_arr, date, side="right"))
+        market_data_cube = copy.copy(self)
+        market_data_cube.__cube_arr = self.__cube_arr[:date_n]
+        market_data_cube.__date_arr = self.__date_arr[:date_n]
+        return market_data_cube
+
+    def get_date_index(self, date):
+        '''
+        Get the index of the date.
+
+        Args:
+            date:   The date.
+
+        Returns:
+            `int` of the index. If the date is not in this cube, `None`.
+        '''
+        date_i = self.__date_dict.get(date)
+        if date_i is None or date_i >= self.__date_arr.shape[0]:
+            return None
+        return date_i
+
+    def get_series(self, ticker, feature, dropna=True):
+        '''
+        Get the series of the ticker.
+
+        Args:
+            ticker:     The ticker.
+            feature:    `str` of the feature.
+            dropna:     `bool`. If `True`, the missing values are dropped.
+                        If the series has no missing values, the view of the cube is returned anyway.
+
+        Returns:
+            `np.ndarray` of the series. If the ticker is not in this cube, the empty `np.ndarray`.
+        '''
+        ticker_i = self.__ticker_dict.get(ticker)
+        if ticker_i is None:
+            return np.empty(0)
+        series_arr = self.__cube_arr[:, ticker_i, self.__feature_dict[feature]]
+        if dropna is True and self.__date_arr.shape[0] > 0:
+            if self.__nan_count_arr[self.__date_arr.shape[0] - 1, ticker_i] > 0:
+                series_arr = series_arr[~np.isnan(series_arr)]
+        return series_arr
+
+    def get_date_slice(self, date):
+        '''
+        Get the rows of the date.
+
+        Args:
+            date:   The date.
+
+        Returns:
+            `np.ndarray` of the view. The shape is (ticker, feature).
+            If the date is not in this cube, `None`.
+        '''
+        date_i = self.get_date_index(date)
+        if date_i is None:
+            return None
+        return self.__cube_arr[date_i]
+
+    def to_historical_arr(self, ticker_list=None, start_date_i=0, end_date_i=None):
+        '''
+        Transform the cube to long-format historical data.
+
+        Args:
+            ticker_list:    `list` of tickers. If `None`, all tickers.
+                            The tickers which are not in this cube are ignored.
+            start_date_i:   `int` of the index of the first date.
+            end_date_i:     `int` of the index of the last date, exclusive.
+                            If `None`, until the last date.
+
+        Returns:
+            `np.ndarray` of object. The columns are (date, features, ..., ticker),
+            and the rows are sorted by date and ticker. The rows whose features are all missing are dropped.
+        '''
+        if ticker_list is None:
+            ticker_i_arr = np.arange(len(self.__ticker_list))
+        else:
+            ticker_i_arr = np.sort(np.array(
+                [self.__ticker_dict[ticker] for ticker in ticker_list if ticker in self.__ticker_dict],
+                dtype=int
+            ))
+
+        cube_arr = self.__cube_arr[start_date_i:end_date_i, ticker_i_arr]
+        date_i_arr, _ticker_i_arr = np.nonzero(~np.isnan(cube_arr).all(axis=2))
+
+        historical_arr = np.empty((date_i_arr.shape[0], len(self.__feature_list) + 2), dtype=object)
+        historical_arr[:, 0] = self.__date_arr[start_date_i:end_date_i][date_i_arr]
+        historical_arr[:, 1:-1] = cube_arr[date_i_arr, _ticker_i_arr]
+        historical_arr[:, -1] = np.array(self.__ticker_list, dtype=object)[ticker_i_arr[_ticker_i_arr]]
+        return historical_arr
+
+    def get_cube_arr(self):
+        ''' getter '''
+        return self.__cube_arr
+
+    def get_date_arr(self):
+        ''' getter '''
+        return self.__date_arr
+
+    def get_ticker_list(self):
+        ''' getter '''
+        return self.__ticker_list
+
+    def get_feature_list(self):
+        ''' getter '''
+        return self.__feature_list
+
+    def get_ticker_dict(self):
+        ''' getter '''
+        return self.__ticker_dict
+
+    def get_row_n(self):
+        ''' getter '''
+        if self.__date_arr.shape[0] == 0:
+            return 0
+        return int(self.__row_count_arr[self.__date_arr.shape[0] - 1])
+
+    def get_shape(self):
+        ''' getter '''
+        return self.__cube_arr.shape
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    cube_arr = property(get_cube_arr, set_readonly)
+    date_arr = property(get_date_arr, set_readonly)
+    ticker_list = property(get_ticker_list, set_readonly)
+    feature_list = property(get_feature_list, set_readonly)
+    ticker_dict = property(get_ticker_dict, set_readonly)
+    row_n = property(get_row_n, set_readonly)
+    shape = property(get_shape, set_readonly)
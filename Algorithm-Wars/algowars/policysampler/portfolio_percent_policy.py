@@ -7,6 +7,7 @@ from accelbrainbase.computableloss._mxnet.l2_norm_loss import L2NormLoss
 from algowars.portfoliooptimization.volatility_minimization import VolatilityMinimization
 from algowars.portfoliooptimization.sharpe_ratio_maximization import SharpeRatioMaximization
 from algowars.exception.stock_history_error import StockHistoryError
+from algowars.market_data_cube import MarketDataCube
 from logging import getLogger
 import mxnet.ndarray as nd
 import mxnet as mx
@@ -230,6 +231,7 @@ class PortfolioPercentPolicy(PolicySampler):
         self.__timing_policy_list = timing_policy_list
 
         self.__historical_arr = historical_arr
+        self.__market_data_cube = self.__create_market_data_cube(historical_arr)
 
         self.__stock_master_arr_list = [stock_master_arr for _ in range(batch_size)]
         if daily_stock_master_flag is True and stock_master_df is not None:
@@ -397,9 +399,7 @@ class PortfolioPercentPolicy(PolicySampler):
 
                         elif i > 1:
                             if self.__generated_historical_arr_list is None or self.__possible_flag is False:
-                                historical_arr = self.__historical_arr[
-                                    self.__historical_arr[:, 0] <= self.__now_date_key
-                                ]
+                                historical_arr = self.__market_data_cube.until(self.__now_date_key)
                             else:
                                 generated_historical_arr = self.__generated_historical_arr_list[batch][
                                     self.__generated_historical_arr_list[batch][:, 0] <= self.__now_date_key
@@ -580,56 +580,24 @@ class PortfolioPercentPolicy(PolicySampler):
 
         batch_size = state_arr.shape[0]
 
-        portfolio_arr = None
-        for batch in range(batch_size):
-            post_portfolio_arr = self.__convert_map_into_portfolio(
+        portfolio_arr = np.array([
+            self.__convert_map_into_portfolio(
                 action_arr[batch].asnumpy(),
                 batch
-            )
-
-            self.action_hold_arr[batch] = self.__compute_hold(
-                post_portfolio_arr,
-                batch,
-                self.__state_hold_arr[batch],
-            )
-
-            if portfolio_arr is None:
-                portfolio_arr = np.expand_dims(post_portfolio_arr, axis=0)
-            else:
-                portfolio_arr = np.r_[
-                    portfolio_arr,
-                    np.expand_dims(post_portfolio_arr, axis=0)
-                ]
-
-        arr_tuple_list = self.__compute_invested_commission_tax()
+            ) for batch in range(batch_size)
+        ])
+        self.action_hold_arr[:batch_size] = self.__compute_hold(
+            portfolio_arr,
+            np.arange(batch_size),
+            self.__state_hold_arr[:batch_size],
+        )
 
-        self.__buy_arr = None
-        self.__sel_arr = None
-        self.__commission_tax_arr = None
-        self.__dividend_ratio_arr = None
-        for batch in range(len(arr_tuple_list)):
-            if batch == 0:
-                self.__buy_arr = np.expand_dims(arr_tuple_list[batch][0], axis=0)
-                self.__sel_arr = np.expand_dims(arr_tuple_list[batch][1], axis=0)
-                self.__commission_tax_arr = np.expand_dims(arr_tuple_list[batch][2], axis=0)
-                self.__dividend_ratio_arr = np.expand_dims(arr_tuple_list[batch][3], axis=0)
-            else:
-                self.__buy_arr = np.r_[
-                    self.__buy_arr, 
-                    np.expand_dims(arr_tuple_list[batch][0], axis=0)
-                ]
-                self.__sel_arr = np.r_[
-                    self.__sel_arr,
-                    np.expand_dims(arr_tuple_list[batch][1], axis=0)
-                ]
-                self.__commission_tax_arr = np.r_[
-                    self.__commission_tax_arr,
-                    np.expand_dims(arr_tuple_list[batch][2], axis=0)
-                ]
-                self.__dividend_ratio_arr = np.r_[
-                    self.__dividend_ratio_arr,
-                    np.expand_dims(arr_tuple_list[batch][3], axis=0)
-                ]
+        (
+            self.__buy_arr,
+            self.__sel_arr,
+            self.__commission_tax_arr,
+            self.__dividend_ratio_arr
+        ) = self.__compute_invested_commission_tax()
 
         if self.__possible_flag is False:
             if self.__cum_buy_arr is not None:
@@ -654,46 +622,21 @@ class PortfolioPercentPolicy(PolicySampler):
             self.__possible_cum_commission_tax_arr += self.__commission_tax_arr
             self.__possible_cum_devided_ratio_arr += self.__dividend_ratio_arr
 
-        reward_value_arr = None
-        for batch in range(batch_size):
-            if self.__possible_flag is False:
-                post_assessment_arr = self.__compute_assessment(
-                    self.__agents_master_arr[batch], 
-                    self.action_hold_arr[batch],
-                    batch
-                )
-            else:
-                post_assessment_arr = self.__compute_assessment(
-                    self.__possible_agents_master_arr[batch], 
-                    self.action_hold_arr[batch],
-                    batch
-                )
-
-            assessment_arr = np.nansum(
-                post_assessment_arr.reshape(
-                    (
-                        post_assessment_arr.shape[0], 
-                        -1
-                    )
-                ), 
-                axis=1
-            )
-
-            if self.__possible_flag is False:
-                if self.__assessment_arr is None:
-                    assessment_i_list = list(assessment_arr.shape)
-                    assessment_i_list.insert(0, batch_size)
-                    self.__assessment_arr = np.zeros(tuple(assessment_i_list))
+        post_assessment_arr = self.__compute_assessment(self.action_hold_arr[:batch_size])
+        assessment_arr = np.nansum(post_assessment_arr, axis=-1)
+        if self.__possible_flag is False:
+            if self.__assessment_arr is None:
+                self.__assessment_arr = np.zeros(assessment_arr.shape)
 
-                self.__assessment_arr[batch] = assessment_arr
-            else:
-                if self.__possible_assessment_arr is None:
-                    assessment_i_list = list(assessment_arr.shape)
-                    assessment_i_list.insert(0, batch_size)
-                    self.__possible_assessment_arr = np.zeros(tuple(assessment_i_list))
+            self.__assessment_arr[:batch_size] = assessment_arr
+        else:
+            if self.__possible_assessment_arr is None:
+                self.__possible_assessment_arr = np.zeros(assessment_arr.shape)
 
-                self.__possible_assessment_arr[batch] = assessment_arr
+            self.__possible_assessment_arr[:batch_size] = assessment_arr
 
+        reward_value_arr = None
+        for batch in range(batch_size):
             yeild_arr = self.__yeild_on_the_way(batch)
             yeild_arr = (yeild_arr - np.nanmean(yeild_arr)) / (yeild_arr.std() + 1e-08)
 
@@ -759,16 +702,17 @@ class PortfolioPercentPolicy(PolicySampler):
         self.state_arr = state_arr
         self.__state_meta_data_arr = meta_data_arr
         if self.__possible_flag is True:
-            for batch in range(state_arr.shape[0]):
-                pre_portfolio_arr = self.__convert_map_into_portfolio(
+            pre_portfolio_arr = np.array([
+                self.__convert_map_into_portfolio(
                     state_arr[batch].asnumpy(),
                     batch
-                )
-                self.__possible_state_hold_arr[batch] = self.__compute_hold(
-                    pre_portfolio_arr,
-                    batch,
-                    self.action_hold_arr[batch]
-                )
+                ) for batch in range(state_arr.shape[0])
+            ])
+            self.__possible_state_hold_arr[:state_arr.shape[0]] = self.__compute_hold(
+                pre_portfolio_arr,
+                np.arange(state_arr.shape[0]),
+                self.action_hold_arr[:state_arr.shape[0]]
+            )
 
         # Update stock master data, refering the next day.
         # Update `__stock_master_arr`.
@@ -980,7 +924,7 @@ class PortfolioPercentPolicy(PolicySampler):
         if self.__end_date is None:
             row = 0
             for add in range(10):
-                row += self.__historical_arr[self.__historical_arr[:, 0] == next_date_key + add].shape[0]
+                row += self.__count_date_rows(next_date_key + add)
 
             if row > 0:
                 return False
@@ -1009,13 +953,13 @@ class PortfolioPercentPolicy(PolicySampler):
         generative_end_date = self.__end_date
         return generative_start_date, generative_end_date
 
-    def __min_max_re_generated(self, _df, _target_arr, ticker_list):
+    def __min_max_re_generated(self, _df, market_data_cube, ticker_list):
         result_df_list = []
         col = "adjusted_close"
         for ticker in ticker_list:
             df = _df[_df.ticker == ticker]
-            target_arr = _target_arr[_target_arr[:, 3] == ticker]
-            _max, _min = target_arr[:, 1].max(), target_arr[:, 1].min()
+            target_arr = market_data_cube.get_series(ticker, col)
+            _max, _min = target_arr.max(), target_arr.min()
             df[col] = df[col].fillna(0.0)
             df[col] = (df[col] - df[col].min()) / (df[col].max() - df[col].min())
             df[col] = (_max - _min) * df[col]
@@ -1042,7 +986,7 @@ class PortfolioPercentPolicy(PolicySampler):
         generated_historical_df = generated_historical_df.sort_values(by=["date", "ticker"])
         generated_historical_df = self.__min_max_re_generated(
             generated_historical_df,
-            self.__historical_arr,
+            self.__market_data_cube,
             self.__ticker_list
         )
         generated_historical_df.date_key = generated_historical_df.date_key + max_date_key
@@ -1088,21 +1032,14 @@ class PortfolioPercentPolicy(PolicySampler):
         self.__generated_historical_arr_list = generated_historical_df_list
 
     def __compute_default_hold(self, portfolio_arr, batch):
-        hold_arr = np.zeros((
-            self.__agents_master_arr[batch].shape[0],
-            self.__stock_master_arr_list[batch].shape[0]
-        ))
-
-        for agent_i in range(self.__agents_master_arr[batch].shape[0]):
-            hold_arr[agent_i] = portfolio_arr[agent_i]
-            if self.__possible_flag is False:
-                hold_arr[agent_i] *= self.__agents_master_arr[batch][agent_i, 1]
-                hold_arr[agent_i] *= (1 - self.__agents_master_arr[batch][agent_i, 4])
-            else:
-                hold_arr[agent_i] *= self.__possible_agents_master_arr[batch][agent_i, 1]
-                hold_arr[agent_i] *= (1 - self.__possible_agents_master_arr[batch][agent_i, 4])
+        if self.__possible_flag is False:
+            agents_master_arr = self.__agents_master_arr[batch]
+        else:
+            agents_master_arr = self.__possible_agents_master_arr[batch]
 
-            hold_arr[agent_i] = hold_arr[agent_i] / self.__stock_master_arr_list[batch][:, 0]
+        hold_arr = portfolio_arr * self.__extract_agents_arr(agents_master_arr, 1)
+        hold_arr = hold_arr * (1 - self.__extract_agents_arr(agents_master_arr, 4))
+        hold_arr = hold_arr / self.__stock_master_arr_list[batch][:, 0].astype(float)
 
         hold_arr = np.ceil(hold_arr).astype(int)
         return hold_arr
@@ -1120,109 +1057,138 @@ class PortfolioPercentPolicy(PolicySampler):
                     sel_arr,
                     cost_arr,
                     income_gain_arr,
-        """
-        hold_arr = np.zeros((
-            self.__agents_master_arr[batch].shape[0],
-            self.__stock_master_arr_list[batch].shape[0]
-        ))
-        commission_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-        expense_ratio_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-        dividend_ratio_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-        tax_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-        buy_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-        sel_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
 
-        if pre_hold_arr is not None:
-            pre_hold_sum = pre_hold_arr.sum()
-        else:
-            pre_hold_sum = 0
+            `batch` is `int` or `np.ndarray` of batches.
+            If `np.ndarray`, the shape of `portfolio_arr` and `pre_hold_arr` is (batch, agent, stock).
+
+            The holdings are halved until the agent can afford them, or the agent keeps the previous holdings.
+            All the candidates of halving are computed at once over (halving, batch, agent, stock).
+        """
+        batch_arr = np.atleast_1d(batch)
+        portfolio_arr = portfolio_arr.reshape((batch_arr.shape[0], ) + portfolio_arr.shape[-2:])
 
         if self.__possible_flag is False:
-            agents_master_arr = self.__agents_master_arr.copy()
-            if pre_hold_arr is None or pre_hold_sum == 0:
-                pre_state_hold_arr = self.__real_state_hold_arr[batch].copy()
-            else:
-                pre_state_hold_arr = pre_hold_arr.copy()
+            agents_master_arr = self.__agents_master_arr[batch_arr]
+            pre_state_hold_arr = self.__real_state_hold_arr[batch_arr]
         else:
-            agents_master_arr = self.__possible_agents_master_arr.copy()
-            if pre_hold_arr is None or pre_hold_sum == 0:
-                pre_state_hold_arr = self.__state_hold_arr[batch].copy()
-            else:
-                pre_state_hold_arr = pre_hold_arr.copy()
+            agents_master_arr = self.__possible_agents_master_arr[batch_arr]
+            pre_state_hold_arr = self.__state_hold_arr[batch_arr]
+
+        if pre_hold_arr is not None:
+            pre_hold_arr = pre_hold_arr.reshape(portfolio_arr.shape)
+            pre_state_hold_arr = np.where(
+                (pre_hold_arr.reshape((batch_arr.shape[0], -1)).sum(axis=1) == 0)[:, np.newaxis, np.newaxis],
+                pre_state_hold_arr,
+                pre_hold_arr
+            )
+
+        stock_master_arr = np.array([self.__stock_master_arr_list[_batch] for _batch in batch_arr.tolist()])
 
         now_date = datetime.strptime(self.__now_date(), "%Y-%m-%d")
         start_date = datetime.strptime(self.__start_date, "%Y-%m-%d")
         now_days = (now_date - start_date).days
 
-        for agent_i in range(self.__agents_master_arr[batch].shape[0]):
-            hold_arr[agent_i] = portfolio_arr[agent_i]
-
-            if self.__possible_flag is False:
-                # * (money_arr + market_val_arr)
-                hold_arr[agent_i] *= (self.__agents_master_arr[batch][agent_i, 1] + self.__agents_master_arr[batch][agent_i, 2])
-
-                # * (1 - risk_free_rate_arr)
-                hold_arr[agent_i] *= (1 - self.__agents_master_arr[batch][agent_i, 4])
-            else:
-                # * (money_arr + market_val_arr)
-                hold_arr[agent_i] *= (self.__possible_agents_master_arr[batch][agent_i, 1] + self.__possible_agents_master_arr[batch][agent_i, 2])
-
-                # * (1 - risk_free_rate_arr)
-                hold_arr[agent_i] *= (1 - self.__possible_agents_master_arr[batch][agent_i, 4])
+        # hold = portfolio_arr * (money_arr + market_val_arr) * (1 - risk_free_rate_arr) / adjusted_close
+        hold_arr = portfolio_arr * (
+            self.__extract_agents_arr(agents_master_arr, 1) + self.__extract_agents_arr(agents_master_arr, 2)
+        )
+        hold_arr = hold_arr * (1 - self.__extract_agents_arr(agents_master_arr, 4))
+        hold_arr = hold_arr / stock_master_arr[:, np.newaxis, :, 0].astype(float)
+
+        dollar_cost_averaging_arr = np.array([
+            [
+                rebalance_sub_policy == "dollar_cost_averaging"
+                for rebalance_sub_policy in self.__rebalance_sub_policy_list[_batch]
+            ] for _batch in batch_arr.tolist()
+        ], dtype=bool).reshape(hold_arr.shape[:2])
+        hold_arr = np.where(
+            dollar_cost_averaging_arr[:, :, np.newaxis],
+            hold_arr * now_days / self.__total_days,
+            hold_arr
+        )
+        hold_arr = np.ceil(hold_arr).astype(int).astype(float)
+
+        # The candidates of halving. The shape is (halving, batch, agent, stock).
+        limit = 100
+        max_hold = max(hold_arr.max(initial=0.0), 1.0)
+        halving_n = min(limit, int(np.ceil(np.log2(max_hold))) + 2)
+        candidate_arr = np.maximum(hold_arr, 0)[np.newaxis] * (0.5 ** np.arange(halving_n))[:, np.newaxis, np.newaxis, np.newaxis]
+        candidate_arr[0] = hold_arr
+
+        buy_arr, sel_arr, commission_tax_arr, _ = self.__compute_trade_arr(
+            candidate_arr,
+            pre_state_hold_arr[np.newaxis],
+            stock_master_arr[np.newaxis]
+        )
+        money_arr = self.__extract_agents_arr(agents_master_arr, 1)[np.newaxis, :, :, 0] - np.nansum(commission_tax_arr, axis=-1)
+        money_arr = money_arr - buy_arr.sum(axis=-1)
+        money_arr = money_arr + sel_arr.sum(axis=-1)
+
+        # The candidates which are too small are never traded.
+        possible_arr = candidate_arr.max(axis=-1) > 1
+        with np.errstate(invalid='ignore'):
+            afford_arr = (money_arr <= 0) == False
+        # The halving stops by the first candidate which is affordable or too small.
+        stop_arr = np.logical_or(possible_arr == False, afford_arr)
+        stop_i_arr = np.argmax(stop_arr, axis=0)
+        trade_arr = np.logical_and(
+            stop_arr.any(axis=0),
+            np.take_along_axis(possible_arr, stop_i_arr[np.newaxis], axis=0)[0]
+        )
+        trade_arr = np.logical_and(trade_arr, hold_arr.sum(axis=-1) != 0)
 
-            # / adjusted_close
-            hold_arr[agent_i] = hold_arr[agent_i] / self.__stock_master_arr_list[batch][:, 0]
-            # hold = portfolio_arr * (money_arr + market_val_arr) * (1 - risk_free_rate_arr) / adjusted_close
+        hold_arr = np.where(
+            trade_arr[:, :, np.newaxis],
+            np.take_along_axis(candidate_arr, stop_i_arr[np.newaxis, :, :, np.newaxis], axis=0)[0],
+            pre_state_hold_arr
+        )
+        hold_arr = np.maximum(hold_arr, 0)
 
-            if self.__rebalance_sub_policy_list[batch][agent_i] == "dollar_cost_averaging":
-                hold_arr[agent_i] = hold_arr[agent_i] * now_days / self.__total_days
+        if np.ndim(batch) == 0:
+            return hold_arr[0]
+        return hold_arr
 
-            hold_arr[agent_i] = np.ceil(hold_arr[agent_i]).astype(int)
-            hold_arr[agent_i] = hold_arr[agent_i].astype(int)
+    def __compute_trade_arr(self, hold_arr, pre_hold_arr, stock_master_arr):
+        '''
+        Compute the trades and the costs of the holdings.
 
-            if hold_arr[agent_i].sum() == 0:
-                hold_arr[agent_i] = pre_state_hold_arr[agent_i]
-            else:
-                limit = 100
-                try_n = 0
-                while True:
-                    if try_n >= limit or np.max(hold_arr[agent_i]) <= 1:
-                        hold_arr[agent_i] = pre_state_hold_arr[agent_i]
-                        break
+        Args:
+            hold_arr:           `np.ndarray` of holdings. The shape is (..., agent, stock).
+            pre_hold_arr:       `np.ndarray` of the previous holdings, which is broadcastable to `hold_arr`.
+            stock_master_arr:   `np.ndarray` of stock master data. The shape is (..., stock, dim).
 
-                    try_n = try_n + 1
-
-                    commission_arr[agent_i] = np.abs(hold_arr[agent_i] - pre_state_hold_arr[agent_i]) * self.__stock_master_arr_list[batch][:, 0] * self.__stock_master_arr_list[batch][:, 1]
-                    expense_ratio_arr[agent_i] = hold_arr[agent_i] * self.__stock_master_arr_list[batch][:, 0] * self.__stock_master_arr_list[batch][:, 4].astype(float) * float(self.__date_fraction) / 365 / 100
-                    dividend_ratio_arr[agent_i] = hold_arr[agent_i] * self.__stock_master_arr_list[batch][:, 0] * self.__stock_master_arr_list[batch][:, 7].astype(float) * float(self.__date_fraction) / 365 / 100
-                    buy_arr[agent_i] = np.maximum(hold_arr[agent_i] - pre_state_hold_arr[agent_i], 0) * self.__stock_master_arr_list[batch][:, 0]
-                    sel_arr[agent_i] = np.maximum(pre_state_hold_arr[agent_i] - hold_arr[agent_i], 0) * self.__stock_master_arr_list[batch][:, 0]
-                    tax_arr[agent_i] = np.maximum(sel_arr[agent_i] - buy_arr[agent_i], 0) * self.__stock_master_arr_list[batch][:, 2]
-                    tax_arr[agent_i] = tax_arr[agent_i] + (dividend_ratio_arr[agent_i] * self.__stock_master_arr_list[batch][:, 2])
-
-                    commission_tax = np.nansum(tax_arr[agent_i] + commission_arr[agent_i] + expense_ratio_arr[agent_i])
-                    buy = buy_arr[agent_i].sum()
-                    sel = sel_arr[agent_i].sum()
-
-                    money = agents_master_arr[batch, agent_i, 1] - commission_tax
-                    money = money - buy
-                    money = money + sel
-
-                    with np.errstate(invalid='ignore'):
-                        if money <= 0:
-                            hold_arr[agent_i] = hold_arr[agent_i] / 2
-                            hold_arr[agent_i] = np.maximum(hold_arr[agent_i], 0)
-                            """
-                            if hold_arr[agent_i].sum() <= 0:
-                                hold_arr[agent_i] = pre_state_hold_arr[agent_i].copy()
-                                break
-                            """
-                        else:
-                            break
+        Returns:
+            `tuple` of `np.ndarray`s of buy, sel, commission and tax, and dividend.
+            The shape of each is equivalent to `hold_arr`.
+        '''
+        unit_price_arr = stock_master_arr[..., np.newaxis, :, 0].astype(float)
+        commission_rate_arr = stock_master_arr[..., np.newaxis, :, 1].astype(float)
+        tax_rate_arr = stock_master_arr[..., np.newaxis, :, 2].astype(float)
+        expense_ratio_rate_arr = stock_master_arr[..., np.newaxis, :, 4].astype(float)
+        dividend_ratio_rate_arr = stock_master_arr[..., np.newaxis, :, 7].astype(float)
+
+        commission_arr = np.abs(hold_arr - pre_hold_arr) * unit_price_arr * commission_rate_arr
+        expense_ratio_arr = hold_arr * unit_price_arr * expense_ratio_rate_arr * float(self.__date_fraction) / 365 / 100
+        dividend_ratio_arr = hold_arr * unit_price_arr * dividend_ratio_rate_arr * float(self.__date_fraction) / 365 / 100
+        buy_arr = np.maximum(hold_arr - pre_hold_arr, 0) * unit_price_arr
+        sel_arr = np.maximum(pre_hold_arr - hold_arr, 0) * unit_price_arr
+        tax_arr = np.maximum(sel_arr - buy_arr, 0) * tax_rate_arr
+        tax_arr = tax_arr + (dividend_ratio_arr * tax_rate_arr)
+
+        return buy_arr, sel_arr, tax_arr + commission_arr + expense_ratio_arr, dividend_ratio_arr
+
+    def __extract_agents_arr(self, agents_master_arr, dim):
+        '''
+        Extract the values of agents master data.
 
-        hold_arr = np.maximum(hold_arr, 0)
+        Args:
+            agents_master_arr:  `np.ndarray` of agents master data. The shape is (..., agent, dim, 1).
+            dim:                `int` of the index of values.
 
-        return hold_arr
+        Returns:
+            `np.ndarray` of values. The shape is (..., agent, 1).
+        '''
+        return agents_master_arr[..., dim, :].astype(float)
 
     def __convert_portfolio_into_map(
         self, 
@@ -1346,26 +1312,18 @@ class PortfolioPercentPolicy(PolicySampler):
 
         return portfolio_arr
 
-    def __compute_assessment(self, agents_master_arr, hold_arr, batch):
+    def __compute_assessment(self, hold_arr):
         '''
-            agents_master_arr:       rank-1 and 4D `np.ndarray` of each multi-agents's money.
-                                    - val1: Multi-agents unique key.
-                                    - val2: Money.
-                                    - val3: Market valuation.
-                                    - val4: The probability of rebalancing.
-                                    - val5: Risk-free rate.
-                                    - val6: Real invested values.
-                                    - val7: Tax and commission.
+        Compute the market valuations of the holdings.
 
-        '''
-        assessment_arr = np.empty((
-            agents_master_arr.shape[0],
-            self.__stock_master_arr_list[batch].shape[0]
-        ))
-        for agent_i in range(agents_master_arr.shape[0]):
-            assessment_arr[agent_i] = hold_arr[agent_i] * self.__stock_master_arr_list[batch][:, 0]
+        Args:
+            hold_arr:   `np.ndarray` of holdings. The shape is (batch, agent, stock).
 
-        return assessment_arr
+        Returns:
+            `np.ndarray` of market valuations. The shape is (batch, agent, stock).
+        '''
+        stock_master_arr = np.array(self.__stock_master_arr_list[:hold_arr.shape[0]])
+        return hold_arr * stock_master_arr[:, np.newaxis, :, 0].astype(float)
 
     def __compute_invested_commission_tax(
         self, 
@@ -1381,37 +1339,20 @@ class PortfolioPercentPolicy(PolicySampler):
                                     - val6: Asset allocation.
                                     - val7: Area allocation.
 
+            Returns `tuple` of buy, sel, commission and tax, and dividend.
+            The shape of each is (batch, agent).
         '''
-        result_list = [None] * self.__agents_master_arr.shape[0]
-        for batch in range(self.__agents_master_arr.shape[0]):
-            commission_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-            expense_ratio_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-            dividend_ratio_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-            tax_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-            buy_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-            sel_arr = np.zeros((self.__agents_master_arr[batch].shape[0], self.__stock_master_arr_list[batch].shape[0]))
-            for agent_i in range(self.__agents_master_arr[batch].shape[0]):
-                commission_arr[agent_i] = np.abs(self.action_hold_arr[batch][agent_i] - self.__state_hold_arr[batch][agent_i]) * self.__stock_master_arr_list[batch][:, 0] * self.__stock_master_arr_list[batch][:, 1]
-                expense_ratio_arr[agent_i] = self.action_hold_arr[batch][agent_i] * self.__stock_master_arr_list[batch][:, 0] * self.__stock_master_arr_list[batch][:, 4].astype(float) * float(self.__date_fraction) / 365 / 100
-                dividend_ratio_arr[agent_i] = self.action_hold_arr[batch][agent_i] * self.__stock_master_arr_list[batch][:, 0] * self.__stock_master_arr_list[batch][:, 7].astype(float) * float(self.__date_fraction) / 365 / 100
-                buy_arr[agent_i] = np.maximum(self.action_hold_arr[batch][agent_i] - self.__state_hold_arr[batch][agent_i], 0) * self.__stock_master_arr_list[batch][:, 0]
-                sel_arr[agent_i] = np.maximum(self.__state_hold_arr[batch][agent_i] - self.action_hold_arr[batch][agent_i], 0) * self.__stock_master_arr_list[batch][:, 0]
-                tax_arr[agent_i] = np.maximum(sel_arr[agent_i] - buy_arr[agent_i], 0) * self.__stock_master_arr_list[batch][:, 2]
-                tax_arr[agent_i] = tax_arr[agent_i] + (dividend_ratio_arr[agent_i] * self.__stock_master_arr_list[batch][:, 2])
-
-            commission_tax_arr = np.nansum(tax_arr + commission_arr + expense_ratio_arr, axis=1)
-            buy_arr = np.nansum(buy_arr, axis=1)
-            sel_arr = np.nansum(sel_arr, axis=1)
-            dividend_ratio_arr = np.nansum(dividend_ratio_arr, axis=1)
-
-            result_list[batch] = (
-                buy_arr, 
-                sel_arr,
-                commission_tax_arr,
-                dividend_ratio_arr,
-            )
-
-        return result_list
+        buy_arr, sel_arr, commission_tax_arr, dividend_ratio_arr = self.__compute_trade_arr(
+            self.action_hold_arr[:self.__agents_master_arr.shape[0]],
+            self.__state_hold_arr[:self.__agents_master_arr.shape[0]],
+            np.array(self.__stock_master_arr_list[:self.__agents_master_arr.shape[0]])
+        )
+        return (
+            np.nansum(buy_arr, axis=-1),
+            np.nansum(sel_arr, axis=-1),
+            np.nansum(commission_tax_arr, axis=-1),
+            np.nansum(dividend_ratio_arr, axis=-1),
+        )
 
     def __rebalance(self, agent_i, opt_policy, batch):
         '''
@@ -1439,10 +1380,9 @@ class PortfolioPercentPolicy(PolicySampler):
                 return self.__opt_memo_dict_list[batch][(opt_policy, self.__now_date_key, int(self.__possible_flag), batch)]
         """
 
+        market_data_cube = None
         if self.__generated_historical_arr_list is None or self.__possible_flag is False:
-            historical_arr = self.__historical_arr[
-                self.__historical_arr[:, 0] <= self.__now_date_key
-            ]
+            market_data_cube = self.__market_data_cube.until(self.__now_date_key)
         else:
             generated_historical_arr = self.__generated_historical_arr_list[batch][
                 self.__generated_historical_arr_list[batch][:, 0] <= self.__now_date_key
@@ -1503,14 +1443,15 @@ class PortfolioPercentPolicy(PolicySampler):
                 ticker_list = list(set(ticker_list))
 
                 if len(ticker_list) > 1:
-                    h_arr = None
-                    for ticker in ticker_list:
-                        arr = historical_arr[historical_arr[:, 3] == ticker]
-                        arr = arr[:, 1]
-                        if h_arr is None:
-                            h_arr = historical_arr[historical_arr[:, 3] == ticker]
-                        else:
-                            h_arr = np.r_[h_arr, historical_arr[historical_arr[:, 3] == ticker]]
+                    if market_data_cube is not None:
+                        h_arr = market_data_cube.to_historical_arr(ticker_list)
+                    else:
+                        h_arr = None
+                        for ticker in ticker_list:
+                            if h_arr is None:
+                                h_arr = historical_arr[historical_arr[:, 3] == ticker]
+                            else:
+                                h_arr = np.r_[h_arr, historical_arr[historical_arr[:, 3] == ticker]]
 
                     if self.__possible_flag is False:
                         h_df = self.__portfolio_optimization_dict[opt_policy].optimize(
@@ -1602,7 +1543,7 @@ class PortfolioPercentPolicy(PolicySampler):
         for batch in range(self.__batch_size):
             for add in range(10):
                 if self.__possible_flag is False:
-                    new_arr = self.__historical_arr[self.__historical_arr[:, 0] == self.__now_date_key + add]
+                    new_arr = self.__extract_date_historical_arr(self.__now_date_key + add)
                 else:
                     new_arr = self.__generated_historical_arr_list[batch][
                         self.__generated_historical_arr_list[batch][:, 0] == self.__now_date_key + add
@@ -1693,10 +1634,13 @@ class PortfolioPercentPolicy(PolicySampler):
             df["commission"] = df["commission"].astype(float)
             df["tax"] = df["tax"].astype(float)
 
+            # Each date has one row at least.
+            end_date_i = int(np.searchsorted(self.__market_data_cube.date_arr, self.__now_date_key, side="left"))
             self.__past_unit_price_df = pd.DataFrame(
-                self.__historical_arr[
-                    self.__historical_arr[:, 0] < self.__now_date_key
-                ][-self.__date_fraction:]
+                self.__market_data_cube.to_historical_arr(
+                    start_date_i=max(end_date_i - self.__date_fraction, 0),
+                    end_date_i=end_date_i
+                )[-self.__date_fraction:]
             )
             self.__past_unit_price_df.columns = [
                 "_",
@@ -1709,6 +1653,57 @@ class PortfolioPercentPolicy(PolicySampler):
 
             self.__stock_master_arr_list[batch] = df.values
 
+    def __create_market_data_cube(self, historical_arr):
+        '''
+        Create the cube of historical data.
+
+        Args:
+            historical_arr:     rank-1 3D `np.ndarray` of historical data.
+
+        Returns:
+            `MarketDataCube`.
+        '''
+        historical_df = pd.DataFrame(
+            historical_arr[:, :4],
+            columns=[
+                "date_key",
+                "adjusted_close",
+                "volume",
+                "ticker"
+            ]
+        )
+        return MarketDataCube(historical_df, feature_list=["adjusted_close", "volume"])
+
+    def __extract_date_historical_arr(self, date_key):
+        '''
+        Extract the rows of historical data on the date.
+
+        Args:
+            date_key:   `int` of date key.
+
+        Returns:
+            rank-1 3D `np.ndarray` of historical data.
+        '''
+        date_i = self.__market_data_cube.get_date_index(date_key)
+        if date_i is None:
+            return np.empty((0, 4), dtype=object)
+        return self.__market_data_cube.to_historical_arr(start_date_i=date_i, end_date_i=date_i+1)
+
+    def __count_date_rows(self, date_key):
+        '''
+        Count the rows of historical data on the date.
+
+        Args:
+            date_key:   `int` of date key.
+
+        Returns:
+            `int` of the number of rows.
+        '''
+        date_arr = self.__market_data_cube.get_date_slice(date_key)
+        if date_arr is None:
+            return 0
+        return int((~np.isnan(date_arr).all(axis=1)).sum())
+
     def update_last(self):
         self.__update_last()
 
@@ -1812,6 +1807,7 @@ class PortfolioPercentPolicy(PolicySampler):
     
     def set_historical_arr(self, value):
         self.__historical_arr = value
+        self.__market_data_cube = self.__create_market_data_cube(value)
 
     historical_arr = property(get_historical_arr, set_historical_arr)
 
@@ -1819,6 +1815,12 @@ class PortfolioPercentPolicy(PolicySampler):
         ''' setter '''
         raise TypeError("This property must be read-only.")
 
+    def get_market_data_cube(self):
+        ''' getter '''
+        return self.__market_data_cube
+
+    market_data_cube = property(get_market_data_cube, set_readonly)
+
     def set_state_arr(self, value):
         if isinstance(value, nd.NDArray) is False:
             raise TypeError()
@@ -50,6 +50,61 @@ class PortfolioOptimization(metaclass=ABCMeta):
 
     opt_policy_list = property(get_opt_policy_list, set_opt_policy_list)
 
+    # `monte_carlo` or `qp`.
+    __solver_mode = "monte_carlo"
+
+    def get_solver_mode(self):
+        ''' getter for the mode of solver.'''
+        return self.__solver_mode
+
+    def set_solver_mode(self, value):
+        ''' setter for the mode of solver.'''
+        if value not in ("monte_carlo", "qp"):
+            raise ValueError("The value of `solver_mode` must be `monte_carlo` or `qp`.")
+        self.__solver_mode = value
+
+    solver_mode = property(get_solver_mode, set_solver_mode)
+
+    # The number of portfolios drawn at once in `monte_carlo` mode.
+    __chunk_size = 10000
+
+    def get_chunk_size(self):
+        ''' getter for the number of portfolios drawn at once.'''
+        return self.__chunk_size
+
+    def set_chunk_size(self, value):
+        ''' setter for the number of portfolios drawn at once.'''
+        if isinstance(value, int) is False:
+            raise TypeError("The type of `chunk_size` must be `int`.")
+        if value <= 0:
+            raise ValueError("The value of `chunk_size` must be more than `0`.")
+        self.__chunk_size = value
+
+    chunk_size = property(get_chunk_size, set_chunk_size)
+
+    # The number of points on the efficient frontier in `qp` mode.
+    __frontier_n = 50
+
+    def get_frontier_n(self):
+        ''' getter for the number of points on the efficient frontier.'''
+        return self.__frontier_n
+
+    def set_frontier_n(self, value):
+        ''' setter for the number of points on the efficient frontier.'''
+        if isinstance(value, int) is False:
+            raise TypeError("The type of `frontier_n` must be `int`.")
+        if value <= 0:
+            raise ValueError("The value of `frontier_n` must be more than `0`.")
+        self.__frontier_n = value
+
+    frontier_n = property(get_frontier_n, set_frontier_n)
+
+    # The maximum number of iterations of the projected gradient method in `qp` mode.
+    __qp_iter_n = 1000
+
+    # Tolerance of the projected gradient method in `qp` mode.
+    __qp_tol = 1e-10
+
     __cov_matrix = None
 
     def optimize(self, histroical_arr, risk_free_rate=0.3):
@@ -110,6 +165,133 @@ class PortfolioOptimization(metaclass=ABCMeta):
             pivot_df.columns
         )
 
+    def search(self, asset_n, mean_returns, cov_matrix, risk_free_rate):
+        '''
+        Search the portfolio weights which maximize `compute_score`.
+
+        In `monte_carlo` mode, `portfolio_n` portfolios are drawn as the matrix of
+        (`chunk_size`, `asset_n`) at once and scored in chunks.
+        In `qp` mode, the long-only efficient frontier is solved deterministically
+        as the quadratic programs and the best portfolio on it is selected.
+
+        Args:
+            asset_n:        `int` of the number of assets.
+            mean_returns:   `float` of average returns.
+            cov_matrix:     `pd.DataFrame` of covariance matrix.
+            risk_free_rate: `float` of risk free rate.
+
+        Returns:
+            `np.ndarray` of weights. The shape is (`asset_n`, ).
+        '''
+        mean_arr = np.asarray(mean_returns, dtype=float).reshape(-1)
+        cov_arr = np.asarray(cov_matrix, dtype=float)
+        if cov_arr.shape != (asset_n, asset_n):
+            cov_arr = np.zeros((asset_n, asset_n))
+
+        if self.__solver_mode == "qp":
+            weights_arr = self.__solve_frontier(asset_n, mean_arr, cov_arr)
+            return weights_arr[np.argmax(self.__score(weights_arr, mean_arr, cov_arr, risk_free_rate))]
+
+        weights_arr = np.empty((0, asset_n))
+        for i in range(0, self.portfolio_n, self.__chunk_size):
+            _weights_arr = np.random.random((min(self.__chunk_size, self.portfolio_n - i), asset_n))
+            _weights_arr = _weights_arr / _weights_arr.sum(axis=1, keepdims=True)
+            # The best portfolio so far competes with the next chunk, so that the memory is bounded.
+            weights_arr = np.r_[weights_arr, _weights_arr]
+            weights_arr = weights_arr[
+                np.argmax(self.__score(weights_arr, mean_arr, cov_arr, risk_free_rate))
+            ][np.newaxis]
+
+        return weights_arr[0]
+
+    def __score(self, weights_arr, mean_arr, cov_arr, risk_free_rate):
+        '''
+        Score the portfolios.
+
+        Args:
+            weights_arr:    `np.ndarray` of weights. The shape is (the number of portfolios, `asset_n`).
+            mean_arr:       `np.ndarray` of average returns.
+            cov_arr:        `np.ndarray` of covariance matrix.
+            risk_free_rate: `float` of risk free rate.
+
+        Returns:
+            `np.ndarray` of scores.
+        '''
+        portfolio_return_arr = weights_arr.dot(mean_arr) * 252
+        portfolio_var_arr = np.einsum("ij,jk,ik->i", weights_arr, cov_arr, weights_arr, optimize=True)
+        portfolio_std_dev_arr = np.sqrt(np.maximum(portfolio_var_arr, 0.0)) * np.sqrt(252)
+        return self.compute_score(portfolio_return_arr, portfolio_std_dev_arr, risk_free_rate)
+
+    def __solve_frontier(self, asset_n, mean_arr, cov_arr):
+        '''
+        Solve the long-only efficient frontier.
+
+        Each point is the solution of the quadratic program
+        `min w^T C w - tau * m^T w` subject to `sum(w) = 1` and `w >= 0`,
+        which is solved by the projected gradient method warm-started from the previous point.
+
+        Args:
+            asset_n:        `int` of the number of assets.
+            mean_arr:       `np.ndarray` of average returns.
+            cov_arr:        `np.ndarray` of covariance matrix.
+
+        Returns:
+            `np.ndarray` of weights. The shape is (`frontier_n`, `asset_n`).
+        '''
+        lipschitz = 2 * max(np.linalg.eigvalsh(cov_arr).max(), 0.0)
+        step = 1.0 / lipschitz if lipschitz > 0 else 1.0
+        # From the minimum variance portfolio to the maximum return portfolio.
+        tau_arr = np.r_[
+            0.0,
+            np.geomspace(1e-04, 1e04, self.__frontier_n - 1)
+        ] * max(lipschitz, 1e-08) / max(np.abs(mean_arr).max(), 1e-08)
+
+        weights_arr = np.empty((tau_arr.shape[0], asset_n))
+        w = np.ones(asset_n) / asset_n
+        for i in range(tau_arr.shape[0]):
+            for _ in range(self.__qp_iter_n):
+                grad = 2 * cov_arr.dot(w) - tau_arr[i] * mean_arr
+                _w = self.__project_simplex(w - step * grad)
+                if np.abs(_w - w).max() < self.__qp_tol:
+                    w = _w
+                    break
+                w = _w
+            weights_arr[i] = w
+
+        return weights_arr
+
+    def __project_simplex(self, v):
+        '''
+        Project the vector onto the probability simplex.
+
+        Args:
+            v:      `np.ndarray` of vector.
+
+        Returns:
+            `np.ndarray` of the projected vector.
+        '''
+        u = np.sort(v)[::-1]
+        cssv = np.cumsum(u) - 1.0
+        rho = np.nonzero(u * np.arange(1, v.shape[0] + 1) > cssv)[0][-1]
+        return np.maximum(v - cssv[rho] / (rho + 1.0), 0.0)
+
+    def compute_score(self, portfolio_return_arr, portfolio_std_dev_arr, risk_free_rate):
+        '''
+        Compute the scores of portfolios, which are maximized by `search`.
+
+        This method is not abstract, so that the subclasses which do not use `search`
+        can be instantiated without it. Override it to use `search`.
+
+        Args:
+            portfolio_return_arr:   `np.ndarray` of annualized returns of portfolios.
+            portfolio_std_dev_arr:  `np.ndarray` of annualized standard deviations of portfolios.
+            risk_free_rate:         `float` of risk free rate.
+
+        Returns:
+            `np.ndarray` of scores.
+        '''
+        raise NotImplementedError()
+
     @abstractmethod
     def select(
         self, 
@@ -9,6 +9,20 @@ class SharpeRatioMaximization(PortfolioOptimization):
     Sharpe ratio maximization as a portfolio optimization.
     '''
 
+    def compute_score(self, portfolio_return_arr, portfolio_std_dev_arr, risk_free_rate):
+        '''
+        Compute Sharpe ratios of portfolios.
+
+        Args:
+            portfolio_return_arr:   `np.ndarray` of annualized returns of portfolios.
+            portfolio_std_dev_arr:  `np.ndarray` of annualized standard deviations of portfolios.
+            risk_free_rate:         `float` of risk free rate.
+
+        Returns:
+            `np.ndarray` of scores.
+        '''
+        return (portfolio_return_arr - risk_free_rate) / (portfolio_std_dev_arr + 1e-08)
+
     def select(
         self, 
         asset_n, 
@@ -30,23 +44,10 @@ class SharpeRatioMaximization(PortfolioOptimization):
         Returns:
             `pd.DataFrame`.
         '''
-        sharpe_ratio_arr = np.zeros(self.portfolio_n)
-        portfolio_return_arr = np.zeros(self.portfolio_n)
-        weights_list = []
-        for i in range(self.portfolio_n):
-            weights = np.random.random(asset_n)
-            weights = weights / np.sum(weights)
-            weights_list.append(weights)
-
-            portfolio_return = np.sum(mean_returns * weights) * 252
-            portfolio_std_dev = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights))) * np.sqrt(252)
-
-            sharpe_ratio_arr[i] = (portfolio_return - risk_free_rate) / (portfolio_std_dev + 1e-08)
-            portfolio_return_arr[i] = portfolio_return
+        weights = self.search(asset_n, mean_returns, cov_matrix, risk_free_rate)
 
-        max_sharpe_idx = np.argmax(sharpe_ratio_arr)
         random_max_sharpe_allocation = pd.DataFrame(
-            weights_list[max_sharpe_idx],
+            weights,
             index=ticker_list,
             columns=['allocation']
         )
@@ -9,6 +9,20 @@ class VolatilityMinimization(PortfolioOptimization):
     Volatility minimization as a portfolio optimization.
     '''
 
+    def compute_score(self, portfolio_return_arr, portfolio_std_dev_arr, risk_free_rate):
+        '''
+        Compute the negative volatilities of portfolios, so that the minimum volatility is selected.
+
+        Args:
+            portfolio_return_arr:   `np.ndarray` of annualized returns of portfolios.
+            portfolio_std_dev_arr:  `np.ndarray` of annualized standard deviations of portfolios.
+            risk_free_rate:         `float` of risk free rate.
+
+        Returns:
+            `np.ndarray` of scores.
+        '''
+        return -portfolio_std_dev_arr
+
     def select(
         self, 
         asset_n, 
@@ -30,24 +44,10 @@ class VolatilityMinimization(PortfolioOptimization):
         Returns:
             `pd.DataFrame`.
         '''
-        portfolio_std_dev_arr = np.zeros(self.portfolio_n)
-        portfolio_return_arr = np.zeros(self.portfolio_n)
-        weights_list = []
-        for i in range(self.portfolio_n):
-            weights = np.random.random(asset_n)
-            weights = weights / np.sum(weights)
-            weights_list.append(weights)
-
-            portfolio_return = np.sum(mean_returns * weights) * 252
-            portfolio_std_dev = np.sqrt(np.dot(weights.T, np.dot(cov_matrix, weights))) * np.sqrt(252)
-
-            portfolio_std_dev_arr[i] = portfolio_std_dev
-            portfolio_return_arr[i] = portfolio_return
-
-        min_vol_idx = np.argmin(portfolio_std_dev_arr)
+        weights = self.search(asset_n, mean_returns, cov_matrix, risk_free_rate)
 
         random_min_vol_allocation = pd.DataFrame(
-            weights_list[min_vol_idx], 
+            weights,
             index=ticker_list, 
             columns=['allocation']
         )
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+from algowars.indicator_engine import IndicatorEngine
+from algowars.market_data_cube import MarketDataCube
 
 
 class TechnicalObserver(metaclass=ABCMeta):
@@ -7,6 +9,10 @@ class TechnicalObserver(metaclass=ABCMeta):
     The interface to decide timing of trades.
     '''
 
+    # `dict` of `IndicatorEngine`.
+    # The key is (agent's index, `tuple` of ticker symbols, the kind of historical data).
+    __indicator_engine_dict = None
+
     @abstractmethod
     def decide_timing(
         self,
@@ -32,3 +38,68 @@ class TechnicalObserver(metaclass=ABCMeta):
             `np.array` of portfolio weights.
         '''
         raise NotImplementedError()
+
+    def extract_close_arr(self, historical_arr, ticker):
+        '''
+        Extract close prices of the ticker.
+
+        Args:
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
+            ticker:             ticker symbol.
+
+        Returns:
+            `np.ndarray` of close prices. The shape is (the number of dates, 1).
+        '''
+        if isinstance(historical_arr, MarketDataCube) is True:
+            return historical_arr.get_series(ticker, "adjusted_close").reshape(-1, 1)
+
+        return historical_arr[historical_arr[:, 3] == ticker][:, 1].reshape(-1, 1)
+
+    def count_rows(self, historical_arr):
+        '''
+        Count the rows of historical data in long format.
+
+        Args:
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
+
+        Returns:
+            `int` of the number of rows.
+        '''
+        if isinstance(historical_arr, MarketDataCube) is True:
+            return historical_arr.row_n
+
+        return historical_arr.shape[0]
+
+    def extract_indicator_engine(self, agent_i, ticker_list, historical_arr):
+        '''
+        Extract the indicator engine of the agent.
+
+        The engines are separated by the kind of historical data, so that the history of `MarketDataCube`
+        and the generated history of `np.ndarray` do not roll back each other.
+
+        Args:
+            agent_i:            `int` of agent's index.
+            ticker_list:        `list` of ticker symbols.
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
+
+        Returns:
+            `IndicatorEngine`.
+        '''
+        key = (agent_i, tuple(ticker_list), isinstance(historical_arr, MarketDataCube))
+        if key not in self.indicator_engine_dict:
+            self.indicator_engine_dict[key] = IndicatorEngine(list(ticker_list))
+        return self.indicator_engine_dict[key]
+
+    def get_indicator_engine_dict(self):
+        ''' getter '''
+        if self.__indicator_engine_dict is None:
+            self.__indicator_engine_dict = {}
+        return self.__indicator_engine_dict
+
+    def set_indicator_engine_dict(self, value):
+        ''' setter '''
+        if isinstance(value, dict) is False:
+            raise TypeError("The type of `indicator_engine_dict` must be `dict`.")
+        self.__indicator_engine_dict = value
+
+    indicator_engine_dict = property(get_indicator_engine_dict, set_indicator_engine_dict)
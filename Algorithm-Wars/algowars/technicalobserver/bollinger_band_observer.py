@@ -26,7 +26,7 @@ class BollingerBandObserver(TechnicalObserver):
         Decide timing of trades.
 
         Args:
-            historical_arr:     `np.ndarray` of historical data.
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
             agents_master_arr:  `np.ndarray` of agents master data.
             portfolio_arr:      `np.ndarray` of now agent's portfolio.
             date_fraction:      `int` of date fraction.
@@ -40,33 +40,15 @@ class BollingerBandObserver(TechnicalObserver):
             self.__time_window = date_fraction
 
         weight_arr = np.ones(len(ticker_list))
-        if historical_arr.shape[0] > self.__time_window * 2 * len(ticker_list):
+        if self.count_rows(historical_arr) > self.__time_window * 2 * len(ticker_list):
             p = agents_master_arr[agent_i][3]
-            signal_list = []
-            for ticker_i in range(len(ticker_list)):
-                ticker = ticker_list[ticker_i]
-                close_arr = historical_arr[historical_arr[:, 3] == ticker][:, 1].reshape(-1, 1)
-                signal = self.__compute_ticker_signal(close_arr)
-                weight_arr[ticker_i] = signal * weight_arr[ticker_i]
+            indicator_engine = self.extract_indicator_engine(agent_i, ticker_list, historical_arr)
+            indicator_engine.add_bollinger_band(self.__time_window)
+            indicator_engine.update(historical_arr)
+            weight_arr = indicator_engine.compute_bollinger_band_signal(self.__time_window) * weight_arr
 
         if weight_arr.max() != weight_arr.min():
             weight_arr = (weight_arr - weight_arr.min()) / (weight_arr.max() - weight_arr.min())
             weight_arr = weight_arr * p
 
         return weight_arr
-
-    def __compute_ticker_signal(self, close_arr):
-        if close_arr.shape[0] > 0:
-            mu = close_arr[-self.__time_window:].mean()
-            sigma = close_arr[-self.__time_window:].std()
-
-            if close_arr[-1] > (mu + (2 * sigma)):
-                signal = close_arr[-1] - (mu + (2 * sigma))
-            elif close_arr[-1] < (mu - (2 * sigma)):
-                signal = close_arr[-1] - (mu - (2 * sigma))
-            else:
-                signal = 1.0
-        else:
-            signal = 1.0
-
-        return signal
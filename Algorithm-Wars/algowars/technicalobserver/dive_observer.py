@@ -32,7 +32,7 @@ class DiveObserver(TechnicalObserver):
         Decide timing of trades.
 
         Args:
-            historical_arr:     `np.ndarray` of historical data.
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
             agents_master_arr:  `np.ndarray` of agents master data.
             portfolio_arr:      `np.ndarray` of now agent's portfolio.
             date_fraction:      `int` of date fraction.
@@ -40,20 +40,19 @@ class DiveObserver(TechnicalObserver):
             agent_i:            `int` of agent's index.
 
         Returns:
-            Tuple data.
-            - `bool`. Trade or not.
-            - `float`. Probability.
+            `np.array` of portfolio weights.
         '''
         if self.__time_window is None:
             self.__time_window = date_fraction
 
         weight_arr = np.ones(len(ticker_list))
-        if historical_arr.shape[0] > self.__time_window * 2 * len(ticker_list):
+        if self.count_rows(historical_arr) > self.__time_window * 2 * len(ticker_list):
+            p = agents_master_arr[agent_i][3]
+            indicator_engine = self.extract_indicator_engine(agent_i, ticker_list, historical_arr)
+            indicator_engine.add_window(self.__time_window * 2)
+            indicator_engine.update(historical_arr)
             for ticker_i in range(len(ticker_list)):
-                ticker = ticker_list[ticker_i]
-                close_arr = historical_arr[historical_arr[:, 3] == ticker][:, 1].reshape(-1, 1)
-
-                close_arr = close_arr[-self.__time_window*2:]
+                close_arr = indicator_engine.extract_window_arr(ticker_i, self.__time_window * 2)
                 close_arr = (close_arr[1:] > close_arr[:1]).astype(int)
 
                 dive = thermodynamic_dive(S=close_arr)
@@ -65,4 +64,4 @@ class DiveObserver(TechnicalObserver):
                 weight_arr = (weight_arr - weight_arr.min()) / (weight_arr.max() - weight_arr.min())
                 weight_arr = weight_arr * p
 
-        return rebalance_flag, p
+        return weight_arr
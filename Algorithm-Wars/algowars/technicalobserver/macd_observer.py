@@ -41,7 +41,7 @@ class MACDObserver(TechnicalObserver):
         Decide timing of trades.
 
         Args:
-            historical_arr:     `np.ndarray` of historical data.
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
             agents_master_arr:  `np.ndarray` of agents master data.
             portfolio_arr:      `np.ndarray` of now agent's portfolio.
             date_fraction:      `int` of date fraction.
@@ -55,32 +55,20 @@ class MACDObserver(TechnicalObserver):
             self.__time_window = date_fraction
 
         weight_arr = np.ones(len(ticker_list))
-        if historical_arr.shape[0] > self.__time_window * 2 * len(ticker_list):
+        if self.count_rows(historical_arr) > self.__time_window * 2 * len(ticker_list):
             p = agents_master_arr[agent_i][3]
-            signal_list = []
-            for ticker_i in range(len(ticker_list)):
-                ticker = ticker_list[ticker_i]
-                close_arr = historical_arr[historical_arr[:, 3] == ticker][:, 1].reshape(-1, 1)
-                signal = self.__compute_macd(close_arr)
-                weight_arr[ticker_i] = signal * weight_arr[ticker_i]
+            indicator_engine = self.extract_indicator_engine(agent_i, ticker_list, historical_arr)
+            indicator_engine.add_macd(self.__short_term, self.__long_term, self.__signal_term)
+            indicator_engine.update(historical_arr)
+            signal_arr = indicator_engine.compute_macd_signal(
+                self.__short_term,
+                self.__long_term,
+                self.__signal_term
+            )
+            weight_arr = signal_arr * weight_arr
 
             if weight_arr.max() != weight_arr.min():
                 weight_arr = (weight_arr - weight_arr.min()) / (weight_arr.max() - weight_arr.min())
                 weight_arr = weight_arr * p
 
         return weight_arr
-
-    def __compute_macd(self, close_arr):
-        close_df = pd.DataFrame(close_arr, columns=["close"])
-        close_df["ema_short"] = close_df["close"].ewm(span=self.__short_term).mean()
-        close_df["ema_long"] = close_df["close"].ewm(span=self.__long_term).mean()
-        close_df["macd"] = close_df["ema_short"] - close_df["ema_long"]
-        close_df["signal"] = close_df["macd"].ewm(span=self.__signal_term).mean()
-
-        signal = 0.0
-        if close_df.macd.iloc[-2] > close_df.signal.iloc[-2] and close_df.macd.iloc[-1] < close_df.signal.iloc[-1]:
-            signal = 1.0
-        elif close_df.macd.iloc[-2] < close_df.signal.iloc[-2] and close_df.macd.iloc[-1] > close_df.signal.iloc[-1]:
-            signal = -1.0
-
-        return signal
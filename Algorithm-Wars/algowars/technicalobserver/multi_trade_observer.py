@@ -23,6 +23,10 @@ class MultiTradeObserver(TechnicalObserver):
                 1/len(technical_observer_list) for _ in range(len(technical_observer_list))
             ]
 
+        # The indicator engines are shared, so that they are updated only once per date.
+        for technical_observer in technical_observer_list:
+            technical_observer.indicator_engine_dict = self.indicator_engine_dict
+
     def decide_timing(
         self,
         historical_arr,
@@ -36,7 +40,7 @@ class MultiTradeObserver(TechnicalObserver):
         Decide timing of trades.
 
         Args:
-            historical_arr:     `np.ndarray` of historical data.
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
             agents_master_arr:  `np.ndarray` of agents master data.
             portfolio_arr:      `np.ndarray` of now agent's portfolio.
             date_fraction:      `int` of date fraction.
@@ -46,6 +50,8 @@ class MultiTradeObserver(TechnicalObserver):
         Returns:
             `np.array` of portfolio weights.
         '''
+        self.extract_indicator_engine(agent_i, ticker_list, historical_arr).update(historical_arr)
+
         weight_arr = np.zeros(len(ticker_list))
         for i in range(len(self.__technical_observer_list)):
             _weight_arr = self.__technical_observer_list[i].decide_timing(
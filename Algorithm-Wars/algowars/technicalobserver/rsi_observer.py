@@ -25,7 +25,7 @@ class RSIObserver(TechnicalObserver):
         Decide timing of trades.
 
         Args:
-            historical_arr:     `np.ndarray` of historical data.
+            historical_arr:     `MarketDataCube` or `np.ndarray` of historical data.
             agents_master_arr:  `np.ndarray` of agents master data.
             portfolio_arr:      `np.ndarray` of now agent's portfolio.
             date_fraction:      `int` of date fraction.
@@ -39,37 +39,14 @@ class RSIObserver(TechnicalObserver):
             self.__time_window = date_fraction
 
         weight_arr = np.ones(len(ticker_list))
-        if historical_arr.shape[0] > self.__time_window * 2 * len(ticker_list):
+        if self.count_rows(historical_arr) > self.__time_window * 2 * len(ticker_list):
             p = agents_master_arr[agent_i][3]
-            signal_list = []
-            for ticker_i in range(len(ticker_list)):
-                ticker = ticker_list[ticker_i]
-                close_arr = historical_arr[historical_arr[:, 3] == ticker][:, 1].reshape(-1, 1)
-                signal = self.__compute_rsi(close_arr)
-                weight_arr[ticker_i] = signal * weight_arr[ticker_i]
+            indicator_engine = self.extract_indicator_engine(agent_i, ticker_list, historical_arr)
+            indicator_engine.add_rsi()
+            indicator_engine.update(historical_arr)
+            weight_arr = indicator_engine.compute_rsi() * weight_arr
 
         if weight_arr.max() != weight_arr.min():
             weight_arr = (weight_arr - weight_arr.min()) / (weight_arr.max() - weight_arr.min())
             weight_arr = weight_arr * p
         return weight_arr
-
-    def __compute_rsi(self, close_arr):
-        with np.errstate(invalid='ignore'):
-            if close_arr.shape[0] > 2:
-                diff_arr = close_arr[1:] - close_arr[:-1]
-                diff_arr = np.nan_to_num(diff_arr)
-                positive = np.nansum(diff_arr[diff_arr > 0])
-                negative = np.nansum(diff_arr[diff_arr < 0]) * -1
-
-                try:
-                    if positive + negative != 0:
-                        rsi = np.mean(positive / (positive + negative))
-                        rsi = rsi
-                    else:
-                        rsi = 0.5
-                except:
-                    rsi = 0.5
-            else:
-                rsi = 0.5
-
-        return rsi
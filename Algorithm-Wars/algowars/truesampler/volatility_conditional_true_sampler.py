@@ -3,9 +3,9 @@ import mxnet as mx
 import mxnet.ndarray as nd
 import numpy as np
 import pandas as pd
-from datetime import datetime
 from accelbrainbase.samplabledata.true_sampler import TrueSampler
 from algowars.extractable_historical_data import ExtractableHistoricalData
+from algowars.market_data_cube import MarketDataCube
 
 
 class VolatilityConditionalTrueSampler(TrueSampler):
@@ -150,7 +150,6 @@ class VolatilityConditionalTrueSampler(TrueSampler):
             self.__ticker_list
         )
         self.__date_df = self.__stock_df.date.drop_duplicates()
-        self.__timestamp_list = self.__stock_df.timestamp.drop_duplicates().values.tolist()
         if self.__diff_mode is True:
             df_list = []
             for ticker in self.__ticker_list:
@@ -166,6 +165,24 @@ class VolatilityConditionalTrueSampler(TrueSampler):
                 df_list.append(df)
             self.__stock_df = pd.concat(df_list)
 
+        self.__market_data_cube = MarketDataCube(
+            self.__stock_df,
+            feature_list=self.__target_features_list,
+            date_column="date"
+        )
+        if len(self.__market_data_cube.ticker_list) != self.__channel:
+            raise ValueError("The value of `channel` must be equal to the number of tickers.")
+
+        # The index of the cube for each row of `date_df`.
+        self.__cube_i_arr = np.array(
+            [self.__market_data_cube.get_date_index(date) for date in self.__date_df.values.tolist()],
+            dtype=int
+        )
+        # Whether each date of the cube has all tickers or not.
+        self.__complete_arr = (
+            ~np.isnan(self.__market_data_cube.cube_arr).all(axis=2)
+        ).sum(axis=1) == self.__channel
+
     def extract_z_score_index(self):
         return self.__stock_mean_df_dict, self.__stock_std_df_dict
 
@@ -182,42 +199,9 @@ class VolatilityConditionalTrueSampler(TrueSampler):
         Returns:
             `np.ndarray` of samples.
         '''
-        pre_sampled_arr = np.zeros((self.__batch_size, self.__channel, self.__seq_len, self.__dim))
-        post_sampled_arr = np.zeros((self.__batch_size, self.__channel, self.__seq_len, self.__dim))
-
-        for batch in range(self.__batch_size):
-            for _i in range(10):
-                try:
-                    if self.__fix_date_flag is False:
-                        row = np.random.randint(
-                            low=0, 
-                            high=self.__date_df.shape[0] - (self.__seq_len * 2)
-                        )
-                    else:
-                        row = 0
-
-                    pre_start_timestamp = self.__timestamp_list[row]
-                    pre_end_timestamp = self.__timestamp_list[row+self.__seq_len]
-                    date_list = self.__date_df[row:row+self.__seq_len].astype(str).values.tolist()
-                    pre_stock_df = self.__stock_df[
-                        (self.__stock_df.timestamp >= pre_start_timestamp) & (self.__stock_df.timestamp < pre_end_timestamp)
-                    ]
-                    pre_sampled_arr = self.__t(pre_sampled_arr, batch, pre_stock_df, date_list)
-
-                    post_start_timestamp = self.__timestamp_list[row+self.__seq_len]
-                    post_end_timestamp = self.__timestamp_list[row+self.__seq_len+self.__seq_len]
-                    date_list = self.__date_df[row+self.__seq_len:row+self.__seq_len+self.__seq_len].astype(str).values.tolist()
-                    post_stock_df = self.__stock_df[
-                        (self.__stock_df.timestamp >= post_start_timestamp) & (self.__stock_df.timestamp < post_end_timestamp)
-                    ]
-                    post_sampled_arr = self.__t(post_sampled_arr, batch, post_stock_df, date_list)
-
-                    break
-                except:
-                    if _i >= 9:
-                        raise
-
-                    continue
+        row_arr = self.__draw_row_arr()
+        pre_sampled_arr = self.__gather(row_arr)
+        post_sampled_arr = self.__gather(row_arr + self.__seq_len)
 
         if self.__lstm_mode is True:
             pre_sampled_arr = pre_sampled_arr.reshape((
@@ -258,34 +242,9 @@ class VolatilityConditionalTrueSampler(TrueSampler):
         if self.__lstm_mode is False:
             raise NotImplementedError()
 
-        pre_sampled_arr = np.zeros((self.__batch_size, self.__channel, self.__seq_len, self.__dim))
-        post_sampled_arr = np.zeros((self.__batch_size, self.__channel, self.__seq_len, self.__dim))
-
-        for batch in range(self.__batch_size):
-            if self.__fix_date_flag is False:
-                row = np.random.randint(
-                    low=0, 
-                    high=self.__date_df.shape[0] - (self.__seq_len * 2)
-                )
-            else:
-                row = 0
-
-            pre_start_timestamp = self.__timestamp_list[row]
-            pre_end_timestamp = self.__timestamp_list[row+self.__seq_len]
-            date_list = self.__date_df[row:row+self.__seq_len].astype(str).values.tolist()
-            pre_stock_df = self.__stock_df[
-                (self.__stock_df.timestamp >= pre_start_timestamp) & (self.__stock_df.timestamp < pre_end_timestamp)
-            ]
-            pre_sampled_arr = self.__t(pre_sampled_arr, batch, pre_stock_df, date_list)
-
-            post_start_timestamp = self.__timestamp_list[row+self.__seq_len]
-            post_end_timestamp = self.__timestamp_list[row+self.__seq_len+self.__seq_len]
-
-            date_list = self.__date_df[row+self.__seq_len:row+self.__seq_len+self.__seq_len].astype(str).values.tolist()
-            post_stock_df = self.__stock_df[
-                (self.__stock_df.timestamp >= post_start_timestamp) & (self.__stock_df.timestamp < post_end_timestamp)
-            ]
-            post_sampled_arr = self.__t(post_sampled_arr, batch, post_stock_df, date_list)
+        row_arr = self.__draw_row_arr()
+        pre_sampled_arr = self.__gather(row_arr)
+        post_sampled_arr = self.__gather(row_arr + self.__seq_len)
 
         if self.__lstm_mode is True:
             pre_sampled_arr = pre_sampled_arr.reshape((
@@ -314,41 +273,55 @@ class VolatilityConditionalTrueSampler(TrueSampler):
         return_arr = nd.ndarray.array(return_arr, ctx=self.__ctx)
         return return_arr
 
-    def __date_to_timestamp(self, date_str):
-        start_date = date_str + " 00:00:00"
-        end_date = date_str + " 23:59:59"
-        start_timestamp = datetime.strptime(start_date, self.__date_format + " %H:%M:%S").timestamp()
-        end_timestamp = datetime.strptime(end_date, self.__date_format + " %H:%M:%S").timestamp()
-        return float(start_timestamp), float(end_timestamp)
-
-    def __t(self, sample_arr, batch, stock_df, date_list):
-        stock_df = stock_df.sort_values(by=["ticker"])
-        i = 0
-        for seq in range(len(date_list)):
-            start_timestamp, end_timestamp = self.__date_to_timestamp(date_list[seq])
-            seq_df = stock_df[
-                (stock_df.timestamp >= start_timestamp) & (stock_df.timestamp <= end_timestamp)
-            ][self.__target_features_list]
-            if seq_df.shape[0] == sample_arr[batch, :].shape[0]:
-                try:
-                    sample_arr[batch, :, i] = seq_df.values
-                    i += 1
-                except ValueError:
-                    print("seq_df.values")
-                    print(seq_df.values[:10])
-                    print(stock_df[
-                        (stock_df.timestamp >= start_timestamp) & (stock_df.timestamp <= end_timestamp)
-                    ].ticker.drop_duplicates().values)
-                    print(stock_df.ticker.drop_duplicates().values)
-                    print(date_list[seq])
-                    print((start_timestamp, end_timestamp))
-                    print((
-                        seq_df.shape[0],
-                        sample_arr[batch, :].shape[0]
-                    ))
-                    raise
-
-        return sample_arr
+    def __draw_row_arr(self):
+        '''
+        Draw the first rows of `date_df` in the mini-batch.
+
+        Returns:
+            `np.ndarray` of rows.
+        '''
+        if self.__fix_date_flag is False:
+            return np.random.randint(
+                low=0,
+                high=self.__date_df.shape[0] - (self.__seq_len * 2),
+                size=self.__batch_size
+            )
+        else:
+            return np.zeros(self.__batch_size, dtype=int)
+
+    def __gather(self, row_arr):
+        '''
+        Gather the windows of dates from the cube by one fancy-index.
+
+        The dates which do not have all tickers are skipped,
+        and the other dates are packed from the head of the window with zero padding.
+
+        Args:
+            row_arr:    `np.ndarray` of the first rows of `date_df`.
+
+        Returns:
+            `np.ndarray` of samples. The shape is (batch, channel, seq_len, dim).
+        '''
+        cube_i_arr = self.__cube_i_arr[row_arr[:, None] + np.arange(self.__seq_len)[None, :]]
+        complete_arr = self.__complete_arr[cube_i_arr]
+        # The stable sort moves the complete dates to the head in order.
+        order_arr = np.argsort(~complete_arr, axis=1, kind="stable")
+        cube_i_arr = np.take_along_axis(cube_i_arr, order_arr, axis=1)
+        complete_arr = np.take_along_axis(complete_arr, order_arr, axis=1)
+
+        sample_arr = self.__market_data_cube.cube_arr[cube_i_arr]
+        sample_arr = np.where(complete_arr[:, :, None, None], sample_arr, 0.0)
+        return sample_arr.transpose((0, 2, 1, 3))
+
+    def get_market_data_cube(self):
+        ''' getter '''
+        return self.__market_data_cube
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    market_data_cube = property(get_market_data_cube, set_readonly)
 
     def get_start_date(self):
         ''' getter '''
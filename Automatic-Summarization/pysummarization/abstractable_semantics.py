@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+import numpy as np
 
 
 class AbstractableSemantics(metaclass=ABCMeta):
@@ -13,6 +14,11 @@ class AbstractableSemantics(metaclass=ABCMeta):
 
     '''
 
+    # The preallocated buffers of `append_score`.
+    __score_buffer_arr = None
+    __test_buffer_arr = None
+    __row_n = 0
+
     @abstractmethod
     def learn(self, iteratable_data):
         '''
@@ -53,3 +59,132 @@ class AbstractableSemantics(metaclass=ABCMeta):
             `np.ndarray` of scores.
         '''
         raise NotImplementedError("This method must be implemented.")
+
+    def append_score(self, score_arr, test_arr):
+        '''
+        Append the scores and the observed data points of a mini-batch
+        to the preallocated buffers. The capacity of buffers is doubled when they are full.
+
+        Args:
+            score_arr:  `np.ndarray` of scores of the mini-batch.
+                        If the size is `1`, the score is shared by all data points in the mini-batch.
+            test_arr:   `np.ndarray` of observed data points in the mini-batch.
+        '''
+        score_arr = np.asarray(score_arr, dtype=np.float64).reshape(-1)
+        if score_arr.shape[0] == 1:
+            score_arr = np.repeat(score_arr, test_arr.shape[0])
+
+        if self.__score_buffer_arr is None:
+            self.__score_buffer_arr = np.zeros(max(test_arr.shape[0], 1024), dtype=np.float64)
+            self.__test_buffer_arr = np.zeros(
+                (self.__score_buffer_arr.shape[0], ) + test_arr.shape[1:],
+                dtype=test_arr.dtype
+            )
+            self.__row_n = 0
+
+        row_n = self.__row_n + test_arr.shape[0]
+        if row_n > self.__score_buffer_arr.shape[0]:
+            capacity = max(self.__score_buffer_arr.shape[0] * 2, row_n)
+            score_buffer_arr = np.zeros(capacity, dtype=np.float64)
+            score_buffer_arr[:self.__row_n] = self.__score_buffer_arr[:self.__row_n]
+            test_buffer_arr = np.zeros((capacity, ) + test_arr.shape[1:], dtype=test_arr.dtype)
+            test_buffer_arr[:self.__row_n] = self.__test_buffer_arr[:self.__row_n]
+            self.__score_buffer_arr = score_buffer_arr
+            self.__test_buffer_arr = test_buffer_arr
+
+        self.__score_buffer_arr[self.__row_n:row_n] = score_arr
+        self.__test_buffer_arr[self.__row_n:row_n] = test_arr
+        self.__row_n = row_n
+
+    def select_abstract_sentence(self, vectorizable_token, sentence_list, limit=5, ascending_flag=True):
+        '''
+        Select abstract sentences by the scores appended by `append_score`, and clear the buffers.
+
+        The top `limit` data points are selected by `np.argpartition`, and
+        each of them is tokenized by `vectorizable_token`. The sentences which
+        contain all the tokens are selected. The sentences containing each token
+        are looked up in an inverted index, which is built from one concatenated
+        string of all sentences.
+
+        Args:
+            vectorizable_token:     is-a `VectorizableToken`.
+            sentence_list:          `list` of all sentences.
+            limit:                  The number of selected abstract sentence.
+            ascending_flag:         If `True`, the data points with lower scores are prior.
+
+        Returns:
+            `list` of `str` of abstract sentences.
+        '''
+        if self.__score_buffer_arr is None:
+            return []
+
+        score_arr = self.__score_buffer_arr[:self.__row_n]
+        test_arr = self.__test_buffer_arr[:self.__row_n]
+        self.__score_buffer_arr = None
+        self.__test_buffer_arr = None
+
+        if ascending_flag is False:
+            score_arr = -score_arr
+        k = min(limit, score_arr.shape[0])
+        key_arr = np.argpartition(score_arr, k - 1)[:k]
+        key_arr = key_arr[np.argsort(score_arr[key_arr], kind="stable")]
+
+        # `\x00` separates sentences, so that no token is matched across two sentences.
+        document = "\x00".join(sentence_list)
+        sentence_start_arr = np.r_[0, np.cumsum([len(sentence) + 1 for sentence in sentence_list])[:-1]]
+        sentence_n = len(sentence_list)
+        inverted_index_dict = {}
+
+        abstract_list = []
+        abstract_set = set()
+        for key in key_arr:
+            token_arr = vectorizable_token.tokenize(test_arr[key].tolist())
+            hit_arr = np.ones(sentence_n, dtype=bool)
+            for token in np.atleast_1d(token_arr).tolist():
+                if token not in inverted_index_dict:
+                    inverted_index_dict[token] = self.__search(
+                        token,
+                        document,
+                        sentence_start_arr,
+                        sentence_n
+                    )
+                hit_arr &= inverted_index_dict[token]
+
+            for i in np.flatnonzero(hit_arr):
+                if sentence_list[i] not in abstract_set:
+                    abstract_set.add(sentence_list[i])
+                    abstract_list.append(sentence_list[i])
+
+            if len(abstract_list) >= limit:
+                break
+
+        return abstract_list
+
+    def __search(self, token, document, sentence_start_arr, sentence_n):
+        '''
+        Search sentences which contain the token.
+
+        Args:
+            token:                  `str` of token.
+            document:               `str` of all sentences joined by `\x00`.
+            sentence_start_arr:     `np.ndarray` of the first indices of sentences in `document`.
+            sentence_n:             The number of sentences.
+
+        Returns:
+            `np.ndarray` of flags. `True` means the sentence contains the token.
+        '''
+        token = str(token)
+        hit_arr = np.zeros(sentence_n, dtype=bool)
+        if token == "":
+            hit_arr[:] = True
+            return hit_arr
+
+        pos_list = []
+        pos = document.find(token)
+        while pos != -1:
+            pos_list.append(pos)
+            pos = document.find(token, pos + 1)
+
+        if len(pos_list) > 0:
+            hit_arr[np.searchsorted(sentence_start_arr, pos_list, side="right") - 1] = True
+        return hit_arr
@@ -239,58 +239,20 @@ class EncDecAD(AbstractableSemantics):
         if isinstance(vectorizable_token, VectorizableToken) is False:
             raise TypeError()
 
-        _score_arr = None
-        _test_arr = None
         for _, _, test_arr, _ in iteratable_data.generate_inferenced_samples():
             reconstruced_arr = self.inference(test_arr)
             score_arr = self.__computable_loss(test_arr, reconstruced_arr)
-            score_arr = score_arr.to('cpu').detach().numpy().copy()
-
-            if _score_arr is None:
-                _score_arr = score_arr
-            else:
-                _score_arr = np.r_[_score_arr, score_arr]
-            if _test_arr is None:
-                _test_arr = test_arr.to('cpu').detach().numpy().copy()
-            else:
-                _test_arr = np.r_[_test_arr, test_arr.to('cpu').detach().numpy().copy()]
-
-        score_list = _score_arr.tolist()
-        test_arr = _test_arr
-        score_arr = _score_arr
-
-        abstract_list = []
-        for i in range(limit):
-            if self.__normal_prior_flag is True:
-                key = score_arr.argmin()
-            else:
-                key = score_arr.argmax()
-
-            score = score_list.pop(key)
-            score_arr = np.array(score_list)
-
-            seq_arr = test_arr[key]
-            token_arr = vectorizable_token.tokenize(seq_arr.tolist())
-            s = " ".join(token_arr.tolist())
-            _s = "".join(token_arr.tolist())
-
-            for sentence in sentence_list:
-                if s in sentence or _s in sentence:
-                    abstract_list.append(sentence)
-                    abstract_list = list(set(abstract_list))
-                else:
-                    hit_n = 0
-                    for token in token_arr.tolist():
-                        if token in sentence:
-                            hit_n += 1
-                    if hit_n == len(token_arr.tolist()):
-                        abstract_list.append(sentence)
-                        abstract_list = list(set(abstract_list))
-
-            if len(abstract_list) >= limit:
-                break
-
-        return abstract_list
+            self.append_score(
+                score_arr.to('cpu').detach().numpy(),
+                test_arr.to('cpu').detach().numpy()
+            )
+
+        return self.select_abstract_sentence(
+            vectorizable_token,
+            sentence_list,
+            limit=limit,
+            ascending_flag=self.__normal_prior_flag
+        )
 
     def set_readonly(self, value):
         ''' setter '''
@@ -53,27 +53,43 @@ class TokenIterator(_TokenIterator):
         self.__ctx = ctx
         self.__noiseable_data = noiseable_data
 
+        # The vectors of tokens are shared with `np.ndarray` without copying.
+        self.vector_tensor = torch.from_numpy(self.vector_arr)
+        if torch.device(ctx).type == "cuda":
+            # Page-locked memory for faster transfer to the device.
+            self.vector_tensor = self.vector_tensor.pin_memory()
+            self.vector_arr = self.vector_tensor.numpy()
+            self.observed_arr = self.create_window_arr(self.vector_arr, seq_len)
+
+    def gather(self, key_arr):
+        '''
+        Gather windows into a mini-batch.
+
+        Override.
+
+        Args:
+            key_arr:    `np.ndarray` of the first indices of windows.
+
+        Returns:
+            `torch.Tensor` of windows. The shape is (the number of keys, `seq_len`, dimension).
+        '''
+        index_arr = (key_arr[:, None] + np.arange(self.seq_len)).reshape(-1)
+        batch_arr = torch.index_select(self.vector_tensor, 0, torch.from_numpy(index_arr))
+        batch_arr = batch_arr.reshape((key_arr.shape[0], self.seq_len) + tuple(self.vector_tensor.shape[1:]))
+        return batch_arr.to(self.__ctx)
+
     def generate_learned_samples(self):
         '''
         Draw and generate data.
 
         Returns:
             `Tuple` data. The shape is ...
-            - `mxnet.ndarray` of observed data points in training.
-            - `mxnet.ndarray` of supervised data in training.
-            - `mxnet.ndarray` of observed data points in test.
-            - `mxnet.ndarray` of supervised data in test.
+            - `torch.Tensor` of observed data points in training.
+            - `torch.Tensor` of supervised data in training.
+            - `torch.Tensor` of observed data points in test.
+            - `torch.Tensor` of supervised data in test.
         '''
         for training_batch_arr, _, test_batch_arr, _ in super().generate_learned_samples():
-            training_batch_arr = torch.from_numpy(
-                training_batch_arr
-            )
-            training_batch_arr = training_batch_arr.to(self.__ctx)
-            test_batch_arr = torch.from_numpy(test_batch_arr)
-            test_batch_arr = test_batch_arr.to(self.__ctx)
-            if self.__noiseable_data is not None:
-                training_batch_arr = self.__noiseable_data.noise(training_batch_arr)
-
             yield training_batch_arr.float(), training_batch_arr.float().detach(), test_batch_arr.float(), test_batch_arr.float().detach()
 
     def generate_inferenced_samples(self):
@@ -85,12 +101,10 @@ class TokenIterator(_TokenIterator):
             `Tuple` data. The shape is ...
             - `None`.
             - `None`.
-            - `mxnet.ndarray` of observed data points in test.
+            - `torch.Tensor` of observed data points in test.
             - file path.
         '''
         for _, _, test_batch_arr, _ in super().generate_inferenced_samples():
-            test_batch_arr = torch.from_numpy(test_batch_arr)
-            test_batch_arr = test_batch_arr.to(self.__ctx)
             yield None, None, test_batch_arr.float(), None
 
     def pre_normalize(self, arr):
@@ -103,19 +117,19 @@ class TokenIterator(_TokenIterator):
         Returns:
             Tensor.
         '''
-        if self.__norm_mode is None:
+        if self.norm_mode is None:
             return arr
         elif self.norm_mode == "min_max":
-            if np.max(arr) != np.min(arr):
+            if arr.max() != arr.min():
                 n = 0.0
             else:
                 n = 1e-08
-            arr = (arr - np.min(arr)) / (np.max(arr) - np.min(arr) + n)
+            arr = (arr - arr.min()) / (arr.max() - arr.min() + n)
         elif self.norm_mode == "z_score":
-            std = np.std(arr)
+            std = arr.std(unbiased=False)
             if std == 0:
                 std += 1e-08
-            arr = (arr - np.mean(arr)) / std
+            arr = (arr - arr.mean()) / std
 
         arr = arr * self.scale
         return arr
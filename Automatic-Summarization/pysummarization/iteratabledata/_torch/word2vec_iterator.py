@@ -53,6 +53,39 @@ class Word2VecIterator(_Word2VecIterator):
         self.__ctx = ctx
         self.__noiseable_data_ = noiseable_data
 
+        # The vectors of tokens are shared with `np.ndarray` without copying.
+        pin_flag = torch.device(ctx).type == "cuda"
+        test_shared_flag = self.test_vector_arr is self.vector_arr
+        self.vector_arr = torch.from_numpy(self.vector_arr)
+        if pin_flag is True:
+            # Page-locked memory for faster transfer to the device.
+            self.vector_arr = self.vector_arr.pin_memory()
+        if test_shared_flag is True:
+            self.test_vector_arr = self.vector_arr
+        else:
+            self.test_vector_arr = torch.from_numpy(self.test_vector_arr)
+            if pin_flag is True:
+                self.test_vector_arr = self.test_vector_arr.pin_memory()
+
+    def gather(self, vector_arr, key_arr, seq_len):
+        '''
+        Gather windows into a mini-batch.
+
+        Override.
+
+        Args:
+            vector_arr:     `torch.Tensor` of token vectors.
+            key_arr:        `np.ndarray` of the first indices of windows.
+            seq_len:        `int` of length of windows.
+
+        Returns:
+            `torch.Tensor` of windows. The shape is (the number of keys, `seq_len`, dimension).
+        '''
+        index_arr = (key_arr[:, None] + np.arange(seq_len)).reshape(-1)
+        batch_arr = torch.index_select(vector_arr, 0, torch.from_numpy(index_arr))
+        batch_arr = batch_arr.reshape((key_arr.shape[0], seq_len) + tuple(vector_arr.shape[1:]))
+        return batch_arr.to(self.__ctx)
+
     def generate_learned_samples(self):
         '''
         Draw and generate data.
@@ -70,15 +103,6 @@ class Word2VecIterator(_Word2VecIterator):
             else:
                 training_observed_arr, training_objected_arr, test_observed_arr, test_objected_arr = arr_tuple
 
-            training_observed_arr = torch.from_numpy(training_observed_arr)
-            training_observed_arr = training_observed_arr.to(self.__ctx)
-            training_objected_arr = torch.from_numpy(training_objected_arr)
-            training_objected_arr = training_objected_arr.to(self.__ctx)
-            test_observed_arr = torch.from_numpy(test_observed_arr)
-            test_observed_arr = test_observed_arr.to(self.__ctx)
-            test_objected_arr = torch.from_numpy(test_objected_arr)
-            test_objected_arr = test_objected_arr.to(self.__ctx)
-
             if self.__noiseable_data_ is not None:
                 training_observed_arr = self.__noiseable_data_.noise(training_observed_arr)
                 test_observed_arr = self.__noiseable_data_.noise(test_observed_arr)
@@ -107,8 +131,6 @@ class Word2VecIterator(_Word2VecIterator):
             - file path.
         '''
         for _, _, test_batch_arr, _ in super().generate_inferenced_samples():
-            test_batch_arr = torch.from_numpy(test_batch_arr)
-            test_batch_arr = test_batch_arr.to(self.__ctx)
             yield None, None, test_batch_arr.float(), None
 
     def pre_normalize(self, arr):
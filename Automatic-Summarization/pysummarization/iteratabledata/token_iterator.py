@@ -56,29 +56,23 @@ class TokenIterator(IteratableData):
         '''
         self.vectorizable_token = vectorizable_token
         vector_list = vectorizable_token.vectorize(token_list=token_arr.tolist())
-        vector_arr = np.array(vector_list)
+        self.vector_arr = np.ascontiguousarray(vector_list, dtype=np.float32)
 
-        observed_list = []
-        for i in range(seq_len, vector_arr.shape[0]):
-            observed_list.append(vector_arr[i-seq_len:i])
-        observed_arr = np.array(observed_list)
+        # Windows are strided views over `vector_arr`, so they are never copied.
+        self.observed_arr = self.create_window_arr(self.vector_arr, seq_len)
 
-        print("setup observed arr: " + str(observed_arr.shape))
+        print("setup observed arr: " + str(self.observed_arr.shape))
 
-        self.observed_arr = observed_arr
-
-        training_row = int(observed_arr.shape[0] * (1 - test_size))
-        key_arr = np.arange(observed_arr.shape[0])
+        training_row = int(self.observed_arr.shape[0] * (1 - test_size))
+        key_arr = np.arange(self.observed_arr.shape[0])
         np.random.shuffle(key_arr)
-        training_arr = observed_arr[key_arr[:training_row]]
-        test_arr = observed_arr[key_arr[training_row:]]
+        # The first indices of windows.
+        self.training_key_arr = key_arr[:training_row]
+        self.test_key_arr = key_arr[training_row:]
 
-        dataset_size = training_arr.shape[0]
+        dataset_size = self.training_key_arr.shape[0]
         iter_n = int(epochs * max(dataset_size / batch_size, 1))
 
-        self.training_arr = training_arr
-        self.test_arr = test_arr
-
         self.iter_n = iter_n
         self.epochs = epochs
         self.batch_size = batch_size
@@ -98,14 +92,15 @@ class TokenIterator(IteratableData):
             - `mxnet.ndarray` of supervised data in test.
         '''
         for _ in range(self.iter_n):
-            training_key_arr = np.arange(self.training_arr.shape[0])
-            test_key_arr = np.arange(self.test_arr.shape[0])
+            training_key_arr = self.training_key_arr[
+                np.random.permutation(self.training_key_arr.shape[0])[:self.batch_size]
+            ]
+            test_key_arr = self.test_key_arr[
+                np.random.permutation(self.test_key_arr.shape[0])[:self.batch_size]
+            ]
 
-            np.random.shuffle(training_key_arr)
-            np.random.shuffle(test_key_arr)
-
-            training_batch_arr = self.training_arr[training_key_arr[:self.batch_size]]
-            test_batch_arr = self.test_arr[test_key_arr[:self.batch_size]]
+            training_batch_arr = self.gather(training_key_arr)
+            test_batch_arr = self.gather(test_key_arr)
 
             training_batch_arr = self.pre_normalize(training_batch_arr)
             test_batch_arr = self.pre_normalize(test_batch_arr)
@@ -129,12 +124,60 @@ class TokenIterator(IteratableData):
         '''
         i = 0
         while i + self.batch_size < self.observed_arr.shape[0]:
-            test_batch_arr = self.observed_arr[i:i+self.batch_size]
+            test_batch_arr = self.gather(np.arange(i, i+self.batch_size))
             test_batch_arr = self.pre_normalize(test_batch_arr)
             i = i + self.batch_size
 
             yield None, None, test_batch_arr, None
 
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    def create_window_arr(self, vector_arr, seq_len):
+        '''
+        Create the sliding windows as a strided view.
+
+        Args:
+            vector_arr:     `np.ndarray` of token vectors. The shape is (the number of tokens, dimension).
+            seq_len:        `int` of length of series.
+
+        Returns:
+            Read-only `np.ndarray` of windows.
+            The shape is (the number of tokens - `seq_len`, `seq_len`, dimension).
+        '''
+        window_n = max(vector_arr.shape[0] - seq_len, 0)
+        return np.lib.stride_tricks.as_strided(
+            vector_arr,
+            shape=(window_n, seq_len) + vector_arr.shape[1:],
+            strides=(vector_arr.strides[0], ) + vector_arr.strides,
+            writeable=False
+        )
+
+    def gather(self, key_arr):
+        '''
+        Gather windows into a mini-batch.
+
+        Args:
+            key_arr:    `np.ndarray` of the first indices of windows.
+
+        Returns:
+            `np.ndarray` of windows. The shape is (the number of keys, `seq_len`, dimension).
+        '''
+        return self.observed_arr[key_arr]
+
+    def get_training_arr(self):
+        ''' getter '''
+        return self.observed_arr[self.training_key_arr]
+
+    training_arr = property(get_training_arr, set_readonly)
+
+    def get_test_arr(self):
+        ''' getter '''
+        return self.observed_arr[self.test_key_arr]
+
+    test_arr = property(get_test_arr, set_readonly)
+
     def pre_normalize(self, arr):
         '''
         Normalize before observation.
@@ -160,10 +203,6 @@ class TokenIterator(IteratableData):
         arr = arr * self.__scale
         return arr
 
-    def set_readonly(self, value):
-        ''' setter '''
-        raise TypeError("This property must be read-only.")
-
     def get_epochs(self):
         ''' getter '''
         return self.__epochs
@@ -59,7 +59,7 @@ class Word2VecIterator(IteratableData):
         else:
             self.test_sentence_list = test_sentence_list
 
-        all_token_list = sum(sentence_list, [])
+        all_token_list = [token for token_list in sentence_list for token in token_list]
         bigram_tuple_list = []
         for i in range(1, len(all_token_list)):
             bigram_tuple_list.append(
@@ -70,7 +70,7 @@ class Word2VecIterator(IteratableData):
         self.parts_of_speech_list = parts_of_speech_list
         self.test_parts_of_speech_list = test_parts_of_speech_list
 
-        pos_master_list = list(set(sum(parts_of_speech_list, [])))
+        pos_master_list = list(set([pos for pos_list in parts_of_speech_list for pos in pos_list]))
         self.pos_master_list = sorted(pos_master_list)
 
         token_pos_dict = {}
@@ -93,7 +93,25 @@ class Word2VecIterator(IteratableData):
 
         self.token_pos_dict = token_pos_dict
 
-        dataset_size = len(sum(sentence_list, []))
+        # All tokens are vectorized once into one contiguous array, and
+        # the windows of mini-batches are gathered by their first indices.
+        self.vector_arr, self.sentence_start_arr, self.sentence_len_arr = self.__vectorize_sentences(
+            sentence_list
+        )
+        if test_sentence_list is None:
+            self.test_vector_arr = self.vector_arr
+            self.test_sentence_start_arr = self.sentence_start_arr
+            self.test_sentence_len_arr = self.sentence_len_arr
+        else:
+            self.test_vector_arr, self.test_sentence_start_arr, self.test_sentence_len_arr = self.__vectorize_sentences(
+                test_sentence_list
+            )
+
+        pos_key_dict = {pos: pos_key for pos_key, pos in enumerate(self.pos_master_list)}
+        self.pos_key_arr = self.__convert_pos_key(parts_of_speech_list, pos_key_dict)
+        self.test_pos_key_arr = self.__convert_pos_key(test_parts_of_speech_list, pos_key_dict)
+
+        dataset_size = len(all_token_list)
         iter_n = int(epochs * max(dataset_size / batch_size, 1))
 
         self.iter_n = iter_n
@@ -103,6 +121,79 @@ class Word2VecIterator(IteratableData):
         self.__noiseable_data = noiseable_data
         self.generation_flag = generation_flag
 
+    def __vectorize_sentences(self, sentence_list):
+        '''
+        Vectorize all tokens of sentences.
+
+        Args:
+            sentence_list:  `list` of `list`s of tokens.
+
+        Returns:
+            Tuple(
+                `np.ndarray` of token vectors. The shape is (the number of tokens, dimension).
+                `np.ndarray` of the first indices of sentences.
+                `np.ndarray` of the lengths of sentences.
+            )
+        '''
+        len_arr = np.array([len(token_list) for token_list in sentence_list], dtype=np.int64)
+        start_arr = np.r_[0, np.cumsum(len_arr)[:-1]].astype(np.int64)
+        vector_arr = np.ascontiguousarray(
+            self.vectorizable_token.vectorize([token for token_list in sentence_list for token in token_list]),
+            dtype=np.float32
+        )
+        return vector_arr, start_arr, len_arr
+
+    def __convert_pos_key(self, parts_of_speech_list, pos_key_dict):
+        '''
+        Convert parts of speech into the indices of `pos_master_list`.
+
+        Args:
+            parts_of_speech_list:   `list` of `list`s of parts of speech.
+            pos_key_dict:           `dict` of parts of speech and their indices.
+
+        Returns:
+            `np.ndarray` of the indices, which is aligned with the vectors of tokens.
+        '''
+        pos_key_list = []
+        for pos_list in parts_of_speech_list:
+            for pos in pos_list:
+                if pos not in pos_key_dict:
+                    raise ValueError("The part of speech `" + str(pos) + "` is not in `parts_of_speech_list`.")
+                pos_key_list.append(pos_key_dict[pos])
+        return np.array(pos_key_list, dtype=np.int64)
+
+    def __draw_key(self, sentence_start_arr, sentence_len_arr):
+        '''
+        Draw the first indices of windows at random.
+
+        Args:
+            sentence_start_arr:     `np.ndarray` of the first indices of sentences.
+            sentence_len_arr:       `np.ndarray` of the lengths of sentences.
+
+        Returns:
+            `np.ndarray` of the first indices of windows in the vectors of tokens.
+        '''
+        key_arr = np.random.randint(low=0, high=sentence_len_arr.shape[0], size=self.batch_size)
+        high_arr = sentence_len_arr[key_arr] - self.seq_len - 1
+        if high_arr.min() <= 0:
+            raise ValueError("The length of sentence must be more than `seq_len`.")
+        start_key_arr = (np.random.random(self.batch_size) * high_arr).astype(np.int64)
+        return sentence_start_arr[key_arr] + start_key_arr
+
+    def gather(self, vector_arr, key_arr, seq_len):
+        '''
+        Gather windows into a mini-batch.
+
+        Args:
+            vector_arr:     `np.ndarray` of token vectors.
+            key_arr:        `np.ndarray` of the first indices of windows.
+            seq_len:        `int` of length of windows.
+
+        Returns:
+            `np.ndarray` of windows. The shape is (the number of keys, `seq_len`, dimension).
+        '''
+        return vector_arr[key_arr[:, None] + np.arange(seq_len)]
+
     def generate_learned_samples(self):
         '''
         Draw and generate data.
@@ -114,73 +205,26 @@ class Word2VecIterator(IteratableData):
             - `mxnet.ndarray` of observed data points in test.
             - `mxnet.ndarray` of supervised data in test.
         '''
+        pos_eye_arr = np.eye(len(self.pos_master_list))
         for _ in range(self.iter_n):
-            training_observed_list = []
-            training_objected_list = []
-            test_observed_list = []
-            test_objected_list = []
+            training_key_arr = self.__draw_key(self.sentence_start_arr, self.sentence_len_arr)
+            test_key_arr = self.__draw_key(self.test_sentence_start_arr, self.test_sentence_len_arr)
+
+            training_observed_arr = self.gather(self.vector_arr, training_key_arr, self.seq_len)
+            test_observed_arr = self.gather(self.test_vector_arr, test_key_arr, self.seq_len)
+            if self.generation_flag is True:
+                training_objected_arr = self.gather(self.vector_arr, training_key_arr + self.seq_len + 1, 1)
+                test_objected_arr = self.gather(self.test_vector_arr, test_key_arr + self.seq_len + 1, 1)
+            else:
+                training_objected_arr = training_observed_arr
+                test_objected_arr = test_observed_arr
+
             if len(self.parts_of_speech_list) > 0:
-                training_pos_list = []
-                test_pos_list = []
-
-            for batch in range(self.batch_size):
-                key = np.random.randint(low=0, high=len(self.sentence_list))
-                token_list = self.sentence_list[key]
-                if len(token_list) < self.seq_len:
-                    raise ValueError("The length of sentence must be more than `seq_len`.")
-                start_key = np.random.randint(low=0, high=len(token_list)-self.seq_len-1)
-                vector_list = self.vectorizable_token.vectorize(
-                    token_list[start_key:start_key+self.seq_len]
-                )
-                training_observed_list.append(vector_list)
-                if self.generation_flag is True:
-                    vector_list = self.vectorizable_token.vectorize(
-                        [token_list[start_key+self.seq_len+1]]
-                    )
-                training_objected_list.append(vector_list)
-                if len(self.parts_of_speech_list) > 0:
-                    observed_pos_list = []
-                    for pos in self.parts_of_speech_list[key][start_key:start_key+self.seq_len]:
-                        pos_key = self.pos_master_list.index(pos)
-                        arr = np.zeros(len(self.pos_master_list))
-                        arr[pos_key] = 1
-                        observed_pos_list.append(arr.tolist())
-
-                    pos = self.parts_of_speech_list[key][start_key+self.seq_len+1]
-                    pos_key = self.pos_master_list.index(pos)
-                    arr = np.zeros(len(self.pos_master_list))
-                    arr[pos_key] = 1
-                    training_pos_list.append(arr.tolist())
-
-                key = np.random.randint(low=0, high=len(self.test_sentence_list))
-                token_list = self.test_sentence_list[key]
-
-                if len(token_list) < self.seq_len:
-                    raise ValueError("The length of sentence must be more than `seq_len`.")
-                start_key = np.random.randint(low=0, high=len(token_list)-self.seq_len-1)
-                vector_list = self.vectorizable_token.vectorize(
-                    token_list[start_key:start_key+self.seq_len]
-                )
-                test_observed_list.append(vector_list)
-                if self.generation_flag is True:
-                    vector_list = self.vectorizable_token.vectorize(
-                        [token_list[start_key+self.seq_len+1]]
-                    )
-                test_objected_list.append(vector_list)
+                training_pos_arr = pos_eye_arr[self.pos_key_arr[training_key_arr + self.seq_len + 1]]
                 if len(self.test_parts_of_speech_list) > 0:
-                    pos = self.test_parts_of_speech_list[key][start_key+self.seq_len+1]
-                    pos_key = self.pos_master_list.index(pos)
-                    arr = np.zeros(len(self.pos_master_list))
-                    arr[pos_key] = 1
-                    test_pos_list.append(arr.tolist())
-
-            training_observed_arr = np.array(training_observed_list)
-            training_objected_arr = np.array(training_objected_list)
-            test_observed_arr = np.array(test_observed_list)
-            test_objected_arr = np.array(test_objected_list)
-            if len(self.parts_of_speech_list) > 0:
-                training_pos_arr = np.array(training_pos_list)
-                test_pos_arr = np.array(test_pos_list)
+                    test_pos_arr = pos_eye_arr[self.test_pos_key_arr[test_key_arr + self.seq_len + 1]]
+                else:
+                    test_pos_arr = np.array([])
 
             if self.__noiseable_data is not None:
                 training_observed_arr = self.__noiseable_data.noise(training_observed_arr)
@@ -203,22 +247,18 @@ class Word2VecIterator(IteratableData):
             - `mxnet.ndarray` of observed data points in test.
             - file path.
         '''
-        test_observed_list = []
-        for key in range(self.test_sentence_list):
-            token_list = self.test_sentence_list[key]
-
-            if len(token_list) < self.seq_len:
-                raise ValueError("The length of sentence must be more than `seq_len`.")
-
-            for start_key in range(len(token_list)-self.seq_len):
-                vector_list = self.vectorizable_token.vectorize(
-                    token_list[start_key:start_key+self.seq_len]
-                )
-                test_observed_list.append(vector_list)
-                if len(test_observed_list) == self.batch_size:
-                    test_observed_arr = np.array(test_observed_list)
-                    yield None, None, test_observed_arr, None
+        if (self.test_sentence_len_arr < self.seq_len).any():
+            raise ValueError("The length of sentence must be more than `seq_len`.")
 
+        key_arr = np.concatenate([
+            start + np.arange(length - self.seq_len) for start, length in zip(
+                self.test_sentence_start_arr,
+                self.test_sentence_len_arr
+            )
+        ] + [np.zeros(0, dtype=np.int64)])
+        for i in range(0, key_arr.shape[0] - self.batch_size + 1, self.batch_size):
+            test_observed_arr = self.gather(self.test_vector_arr, key_arr[i:i+self.batch_size], self.seq_len)
+            yield None, None, test_observed_arr, None
 
     def set_readonly(self, value):
         ''' setter '''
@@ -69,6 +69,18 @@ class NlpBase(object):
         '''
         self.token = self.tokenizable_doc.tokenize(data)
 
+    def tokenize_batch(self, data_list):
+        '''
+        Tokenize sentences at once.
+
+        Args:
+            data_list:  The list of strings.
+
+        Returns:
+            The list of the lists of tokens.
+        '''
+        return self.tokenizable_doc.tokenize_batch(data_list)
+
     def listup_sentence(self, data, counter=0):
         '''
         Divide string into sentence list.
@@ -90,3 +102,61 @@ class NlpBase(object):
             sentence_list = sentence_list_r
 
         return sentence_list
+
+    def listup_sentence_stream(self, data_iter):
+        '''
+        Divide the stream of strings into sentences.
+
+        The strings are buffered only until the delimiter, so that
+        a large document such as pages of PDF can be consumed sentence by sentence.
+        The sentences are the same as `listup_sentence` of the concatenated strings.
+
+        Args:
+            data_iter:          The iterable of strings.
+
+        Returns:
+            The generator of sentences.
+
+        '''
+        delimiter = self.delimiter_list[0]
+        if delimiter == "":
+            raise ValueError("The delimiter must not be empty.")
+
+        buffer = ""
+        for data in data_iter:
+            if isinstance(data, str) is False:
+                raise TypeError("The type of data must be str.")
+            # The buffer has no delimiter, so that only the appended string
+            # and the characters of the delimiter spanning it are searched.
+            start = max(len(buffer) - len(delimiter) + 1, 0)
+            buffer += data
+            end = 0
+            index = buffer.find(delimiter, start)
+            while index != -1:
+                for sentence in self.__listup_sentence_r(buffer[end:index]):
+                    yield sentence
+                end = index + len(delimiter)
+                index = buffer.find(delimiter, end)
+            # The last piece may be continued in the next string.
+            buffer = buffer[end:]
+
+        for sentence in self.__listup_sentence_r(buffer):
+            yield sentence
+
+    def __listup_sentence_r(self, sentence):
+        '''
+        Divide the sentence delimited by the first delimiter by the other delimiters.
+
+        Args:
+            sentence:           string without the first delimiter.
+
+        Returns:
+            List of sentences.
+
+        '''
+        if sentence == "":
+            return []
+        sentence = sentence + self.delimiter_list[0]
+        if len(self.delimiter_list) > 1:
+            return self.listup_sentence(sentence, 1)
+        return [sentence]
@@ -65,6 +65,8 @@ class AutoAbstractor(NlpBase):
 
         Args:
             document:           The target document.
+                                The iterable of strings such as pages of PDF is also acceptable,
+                                and it is divided into sentences as a stream.
             Abstractor:         The object of AbstractableDoc.
             similarity_filter   The object of SimilarityFilter.
 
@@ -73,8 +75,8 @@ class AutoAbstractor(NlpBase):
             - "summarize_result": The list of summarized sentences., 
             - "scoring_data":     The list of scores.
         '''
-        if isinstance(document, str) is False:
-            raise TypeError("The type of document must be str.")
+        if isinstance(document, str) is False and hasattr(document, "__iter__") is False:
+            raise TypeError("The type of document must be str or the iterable of str.")
 
         if isinstance(Abstractor, AbstractableDoc) is False:
             raise TypeError("The type of Abstractor must be AbstractableDoc.")
@@ -82,18 +84,32 @@ class AutoAbstractor(NlpBase):
         if isinstance(similarity_filter, SimilarityFilter) is False and similarity_filter is not None:
             raise TypeError("The type of similarity_filter must be SimilarityFilter.")
 
-        normalized_sentences = self.listup_sentence(document)
+        if isinstance(document, str) is True:
+            normalized_sentences = self.listup_sentence(document)
+        else:
+            normalized_sentences = list(self.listup_sentence_stream(document))
+
+        # Each distinct sentence is tokenized only once.
+        unique_sentence_list = list(dict.fromkeys(normalized_sentences))
+        token_dict = dict(zip(unique_sentence_list, self.tokenize_batch(unique_sentence_list)))
+        token_list = []
+        for sentence in normalized_sentences:
+            token_list.extend(token_dict[sentence])
 
         # for filtering similar sentences.
         if similarity_filter is not None:
             normalized_sentences = similarity_filter.similar_filter_r(normalized_sentences)
 
-        self.tokenize(document)
-        words = self.token
-
-        fdist = nltk.FreqDist(words)
+        fdist = nltk.FreqDist(token_list)
         top_n_words = [w[0] for w in fdist.items()][:self.target_n]
-        scored_list = self.__closely_associated_score(normalized_sentences, top_n_words)
+        inverted_index_dict = self.__build_inverted_index(
+            [token_dict[sentence] for sentence in normalized_sentences]
+        )
+        scored_list = self.__closely_associated_score(
+            len(normalized_sentences),
+            inverted_index_dict,
+            top_n_words
+        )
         filtered_list = Abstractor.filter(scored_list)
         result_list = [normalized_sentences[idx] for (idx, score) in filtered_list]
         result_dict = {
@@ -102,33 +118,46 @@ class AutoAbstractor(NlpBase):
         }
         return result_dict
 
-    def __closely_associated_score(self, normalized_sentences, top_n_words):
+    def __build_inverted_index(self, token_list_list):
+        '''
+        Build the inverted index of tokens.
+
+        Args:
+            token_list_list:    The list of tokenized sentences.
+
+        Returns:
+            dict data. {token: [(the index of sentence, the first position of token in the sentence), ...]}
+        '''
+        inverted_index_dict = {}
+        for sentence_idx, token_list in enumerate(token_list_list):
+            first_pos_dict = {}
+            for pos, token in enumerate(token_list):
+                if token not in first_pos_dict:
+                    first_pos_dict[token] = pos
+            for token, pos in first_pos_dict.items():
+                inverted_index_dict.setdefault(token, []).append((sentence_idx, pos))
+        return inverted_index_dict
+
+    def __closely_associated_score(self, sentence_n, inverted_index_dict, top_n_words):
         '''
         Scoring the sentence with closely associations.
 
         Args:
-            normalized_sentences:   The list of sentences.
+            sentence_n:             The number of sentences.
+            inverted_index_dict:    The inverted index from `__build_inverted_index`.
             top_n_words:            Important sentences.
 
         Returns:
             The list of scores.
         '''
-        scores_list = []
-        sentence_idx = -1
-
-        for sentence in normalized_sentences:
-            self.tokenize(sentence)
-            sentence = self.token
-
-            sentence_idx += 1
-            word_idx = []
-
-            for w in top_n_words:
-                try:
-                    word_idx.append(sentence.index(w))
-                except ValueError:
-                    pass
+        word_idx_list = [[] for _ in range(sentence_n)]
+        for w in top_n_words:
+            for sentence_idx, pos in inverted_index_dict.get(w, []):
+                word_idx_list[sentence_idx].append(pos)
 
+        scores_list = []
+        for sentence_idx in range(sentence_n):
+            word_idx = word_idx_list[sentence_idx]
             word_idx.sort()
 
             if len(word_idx) == 0:
@@ -59,3 +59,18 @@ class NgramAutoAbstractor(AutoAbstractor):
         token_tuple_zip = self.n_gram.generate_tuple_zip(self.token, self.n)
         token_list = []
         self.token = ["".join(list(token_tuple)) for token_tuple in token_tuple_zip]
+
+    def tokenize_batch(self, data_list):
+        '''
+        Tokenize sentences at once.
+
+        Args:
+            data_list:  The list of strings.
+
+        Returns:
+            [[n-gram, n-gram, n-gram, ...], ...]
+        '''
+        return [
+            ["".join(list(token_tuple)) for token_tuple in self.n_gram.generate_tuple_zip(token_list, self.n)]
+            for token_list in super().tokenize_batch(data_list)
+        ]
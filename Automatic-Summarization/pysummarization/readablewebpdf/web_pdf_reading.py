@@ -1,11 +1,31 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
+import os
+from pdfminer.pdfdocument import PDFDocument
 from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.pdftypes import resolve1
 from pdfminer.pdfinterp import PDFResourceManager
 from pdfminer.pdfinterp import PDFPageInterpreter
 from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
-import urllib.request
 from pysummarization.readable_web_pdf import ReadableWebPDF
+from pysummarization.web_fetching import WebFetching
+
+
+def _extract_page_text(path, pageno_list):
+    '''
+    Transform pages of local PDF file to strings in the worker process.
+
+    Args:
+        path:           path to PDF file.
+        pageno_list:    `list` of page numbers. The first page is `0`.
+
+    Returns:
+        `list` of strings of pages.
+    '''
+    return list(WebPDFReading().generate_page_text(path, pageno_list))
 
 
 class WebPDFReading(ReadableWebPDF):
@@ -13,10 +33,68 @@ class WebPDFReading(ReadableWebPDF):
     Read the PDF.
     '''
 
+    # The number of worker processes in `generate_page_text`. If `1`, no pool is used.
+    __max_workers = 1
+
+    def get_max_workers(self):
+        ''' getter '''
+        if isinstance(self.__max_workers, int) is False:
+            raise TypeError("The type of __max_workers must be int.")
+        return self.__max_workers
+
+    def set_max_workers(self, value):
+        ''' setter '''
+        if isinstance(value, int) is False:
+            raise TypeError("The type of __max_workers must be int.")
+        if value <= 0:
+            raise ValueError("The value of __max_workers must be greater than 0.")
+        self.__max_workers = value
+
+    max_workers = property(get_max_workers, set_max_workers)
+
+    # The number of pages per task of worker processes.
+    __page_chunk_size = 8
+
+    def get_page_chunk_size(self):
+        ''' getter '''
+        if isinstance(self.__page_chunk_size, int) is False:
+            raise TypeError("The type of __page_chunk_size must be int.")
+        return self.__page_chunk_size
+
+    def set_page_chunk_size(self, value):
+        ''' setter '''
+        if isinstance(value, int) is False:
+            raise TypeError("The type of __page_chunk_size must be int.")
+        if value <= 0:
+            raise ValueError("The value of __page_chunk_size must be greater than 0.")
+        self.__page_chunk_size = value
+
+    page_chunk_size = property(get_page_chunk_size, set_page_chunk_size)
+
+    # Object of WebFetching.
+    __web_fetching = None
+
+    def get_web_fetching(self):
+        ''' getter '''
+        if self.__web_fetching is None:
+            self.__web_fetching = WebFetching()
+        return self.__web_fetching
+
+    def set_web_fetching(self, value):
+        ''' setter '''
+        if isinstance(value, WebFetching) is False:
+            raise TypeError("The type of __web_fetching must be WebFetching.")
+        self.__web_fetching = value
+
+    web_fetching = property(get_web_fetching, set_web_fetching)
+
     def url_to_text(self, url):
         '''
         Download PDF file and transform its document to string.
 
+        The PDF file is streamed to a local file by `web_fetching`,
+        and cached if `web_fetching.cache_dir` is not `None`.
+
         Args:
             url:   PDF url.
 
@@ -24,8 +102,30 @@ class WebPDFReading(ReadableWebPDF):
             string.
 
         '''
-        path, headers = urllib.request.urlretrieve(url)
-        return self.path_to_text(path)
+        path, _ = self.web_fetching.fetch_file(url)
+        try:
+            return self.path_to_text(path)
+        finally:
+            if self.web_fetching.cache_dir is None:
+                os.remove(path)
+
+    def url_to_text_stream(self, url):
+        '''
+        Download PDF file and generate strings page by page.
+
+        Args:
+            url:   PDF url.
+
+        Returns:
+            The generator of strings of pages.
+        '''
+        path, _ = self.web_fetching.fetch_file(url)
+        try:
+            for text in self.generate_page_text(path):
+                yield text
+        finally:
+            if self.web_fetching.cache_dir is None:
+                os.remove(path)
 
     def path_to_text(self, path):
         '''
@@ -38,6 +138,51 @@ class WebPDFReading(ReadableWebPDF):
             string.
 
         '''
+        return "".join(self.generate_page_text(path))
+
+    def generate_page_text(self, path, pageno_list=None):
+        '''
+        Transform local PDF file to strings page by page.
+
+        If `max_workers` is greater than `1`, the pages are split into chunks
+        of `page_chunk_size` pages and transformed in the pool of processes.
+        At most `max_workers * 2` chunks are in flight, so that the memory is bounded
+        even if the consumer is slow, and the pending chunks are cancelled if the generator is closed.
+        The strings are generated in order of pages in any case.
+
+        Args:
+            path:           path to PDF file.
+            pageno_list:    `list` of page numbers to be transformed. The first page is `0`.
+                            If `None`, all pages are transformed.
+
+        Returns:
+            The generator of strings of pages.
+        '''
+        if self.max_workers > 1:
+            if pageno_list is None:
+                pageno_list = list(range(self.__count_pages(path)))
+            chunk_list = [
+                pageno_list[i:i+self.page_chunk_size] for i in range(0, len(pageno_list), self.page_chunk_size)
+            ]
+            executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future_deque = deque()
+            try:
+                for chunk_i in range(len(chunk_list)):
+                    future_deque.append(executor.submit(_extract_page_text, path, chunk_list[chunk_i]))
+                    if len(future_deque) < self.max_workers * 2 and chunk_i < len(chunk_list) - 1:
+                        continue
+                    for text in future_deque.popleft().result():
+                        yield text
+                while len(future_deque) > 0:
+                    for text in future_deque.popleft().result():
+                        yield text
+            finally:
+                for future in future_deque:
+                    future.cancel()
+                # The running chunks are not waited for, so that the generator is closed at once.
+                executor.shutdown(wait=False)
+            return
+
         rsrcmgr = PDFResourceManager()
         retstr = StringIO()
         codec = 'utf-8'
@@ -47,28 +192,55 @@ class WebPDFReading(ReadableWebPDF):
         interpreter = PDFPageInterpreter(rsrcmgr, device)
         password = ""
         maxpages = 0
-        caching = True
-        pagenos = set()
-
-        pages_data = PDFPage.get_pages(
-            fp,
-            pagenos,
-            maxpages=maxpages,
-            password=password,
-            caching=caching,
-            check_extractable=True
-        )
-
-        for page in pages_data:
-            interpreter.process_page(page)
-
-        text = retstr.getvalue()
-        text = text.replace("\n", "")
-
-        fp.close()
-        device.close()
-        retstr.close()
-        return text
+        # The pages are not kept after they are transformed.
+        caching = False
+        if pageno_list is None:
+            pagenos = set()
+        else:
+            pagenos = set(pageno_list)
+
+        try:
+            pages_data = PDFPage.get_pages(
+                fp,
+                pagenos,
+                maxpages=maxpages,
+                password=password,
+                caching=caching,
+                check_extractable=True
+            )
+
+            for page in pages_data:
+                interpreter.process_page(page)
+                text = retstr.getvalue()
+                # The buffer is cleared per page, so that the memory is bounded by one page.
+                retstr.seek(0)
+                retstr.truncate(0)
+                yield text.replace("\n", "")
+        finally:
+            fp.close()
+            device.close()
+            retstr.close()
+
+    def __count_pages(self, path):
+        '''
+        Count the pages of local PDF file.
+
+        The count is read from the page tree of the catalog, without parsing the pages.
+
+        Args:
+            path:   path to PDF file.
+
+        Returns:
+            The number of pages.
+        '''
+        with open(path, 'rb') as fp:
+            document = PDFDocument(PDFParser(fp))
+            pages_dict = resolve1(document.catalog.get("Pages"))
+            if isinstance(pages_dict, dict) is True:
+                page_n = resolve1(pages_dict.get("Count"))
+                if isinstance(page_n, int) is True:
+                    return page_n
+            return sum(1 for _ in PDFPage.create_pages(document))
 
     def is_pdf_url(self, url):
         '''
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+import numpy as np
+import scipy.sparse as sp
 from pysummarization.nlp_base import NlpBase
 
 
@@ -44,6 +46,25 @@ class SimilarityFilter(metaclass=ABCMeta):
 
     similarity_limit = property(get_similarity_limit, set_similarity_limit)
 
+    # The number of subject sentences per sparse matrix product.
+    __batch_size = 256
+
+    def get_batch_size(self):
+        ''' getter '''
+        if isinstance(self.__batch_size, int) is False:
+            raise TypeError("__batch_size must be int.")
+        return self.__batch_size
+
+    def set_batch_size(self, value):
+        ''' setter '''
+        if isinstance(value, int) is False:
+            raise TypeError("__batch_size must be int.")
+        if value <= 0:
+            raise ValueError("__batch_size must be greater than 0.")
+        self.__batch_size = value
+
+    batch_size = property(get_batch_size, set_batch_size)
+
     @abstractmethod
     def calculate(self, token_list_x, token_list_y):
         '''
@@ -60,6 +81,28 @@ class SimilarityFilter(metaclass=ABCMeta):
         '''
         raise NotImplementedError("This method must be implemented.")
 
+    def calculate_sparse(self, subject_count_arr, object_count_arr):
+        '''
+        Calculate similarities of all pairs of subjects and objects
+        with sparse matrix products.
+
+        If this method is not overridden, `similar_filter_r` calls `calculate` per pair.
+
+        Args:
+            subject_count_arr:  `scipy.sparse.csr_matrix` of the vectors of subject sentences from `vectorize_sparse`.
+                                The shape is (the number of subjects, the number of tokens).
+            object_count_arr:   `scipy.sparse.csr_matrix` of the vectors of object sentences from `vectorize_sparse`.
+                                The shape is (the number of objects, the number of tokens).
+
+        Returns:
+            `scipy.sparse.csr_matrix` of similarities.
+            The shape is (the number of subjects, the number of objects).
+            The pairs which have no token in common are omitted, and their similarities are `0.0`.
+
+            If this filter does not support sparse matrices, `None`.
+        '''
+        return None
+
     def unique(self, token_list_x, token_list_y):
         '''
         Remove duplicated elements.
@@ -75,6 +118,19 @@ class SimilarityFilter(metaclass=ABCMeta):
         y = set(list(token_list_y))
         return (x, y)
 
+    def unique_sparse(self, subject_count_arr, object_count_arr):
+        '''
+        Remove duplicated elements in sparse matrices.
+
+        Args:
+            subject_count_arr:  `scipy.sparse.csr_matrix` of the counts of tokens in subject sentences.
+            object_count_arr:   `scipy.sparse.csr_matrix` of the counts of tokens in object sentences.
+
+        Returns:
+            Tuple(subject_arr, object_arr) of `scipy.sparse.csr_matrix` whose values are `1.0` or `0.0`.
+        '''
+        return (subject_count_arr.sign(), object_count_arr.sign())
+
     def count(self, token_list):
         '''
         Count the number of tokens in `token_list`.
@@ -96,32 +152,137 @@ class SimilarityFilter(metaclass=ABCMeta):
     def similar_filter_r(self, sentence_list):
         '''
         Filter mutually similar sentences.
-        
+
+        In order of `sentence_list`, each remaining sentence is kept
+        and the following sentences which are more similar to it than
+        `similarity_limit` are removed.
+
         Args:
             sentence_list:    The list of sentences.
 
         Returns:
             The list of filtered sentences.
         '''
-        result_list = []
-        recursive_list = []
-
-        try:
-            self.nlp_base.tokenize(sentence_list[0])
-            subject_token = self.nlp_base.token
-            result_list.append(sentence_list[0])
-            if len(sentence_list) > 1:
-                for i in range(len(sentence_list)):
-                    if i > 0:
-                        self.nlp_base.tokenize(sentence_list[i])
-                        object_token = self.nlp_base.token
-                        similarity = self.calculate(subject_token, object_token)
-                        if similarity <= self.similarity_limit:
-                            recursive_list.append(sentence_list[i])
-
-            if len(recursive_list) > 0:
-                result_list.extend(self.similar_filter_r(recursive_list))
-        except IndexError:
-            result_list = sentence_list
-
-        return result_list
+        if len(sentence_list) == 0:
+            return sentence_list
+
+        unique_sentence_list = list(dict.fromkeys(sentence_list))
+        token_dict = dict(zip(unique_sentence_list, self.nlp_base.tokenize_batch(unique_sentence_list)))
+        token_list_list = [token_dict[sentence] for sentence in sentence_list]
+
+        keep_arr = self.__filter_sparse(self.vectorize_sparse(token_list_list))
+        if keep_arr is None:
+            keep_arr = self.__filter(token_list_list)
+
+        return [sentence_list[i] for i in np.flatnonzero(keep_arr)]
+
+    def vectorize_sparse(self, token_list_list):
+        '''
+        Vectorize sentences for `calculate_sparse`.
+
+        By default, the vectors are the counts of tokens from `count_sparse`.
+
+        Args:
+            token_list_list:    The list of the lists of tokens.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of vectors.
+            The shape is (the number of sentences, the number of kinds of tokens).
+        '''
+        return self.count_sparse(token_list_list)
+
+    def count_sparse(self, token_list_list):
+        '''
+        Count tokens in each sentence.
+
+        Args:
+            token_list_list:    The list of the lists of tokens.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of the counts of tokens.
+            The shape is (the number of sentences, the number of kinds of tokens).
+        '''
+        token_index_dict = {}
+        col_list = []
+        indptr_list = [0]
+        for token_list in token_list_list:
+            col_list.extend([token_index_dict.setdefault(token, len(token_index_dict)) for token in token_list])
+            indptr_list.append(len(col_list))
+
+        count_arr = sp.csr_matrix(
+            (
+                np.ones(len(col_list), dtype=np.float64),
+                np.array(col_list, dtype=np.int64),
+                np.array(indptr_list, dtype=np.int64)
+            ),
+            shape=(len(token_list_list), max(len(token_index_dict), 1))
+        )
+        # Duplicated tokens in each row are summed up.
+        count_arr.sum_duplicates()
+        return count_arr
+
+    def __filter_sparse(self, count_arr):
+        '''
+        Filter sentences with `calculate_sparse`.
+
+        Args:
+            count_arr:  `scipy.sparse.csr_matrix` from `vectorize_sparse`.
+
+        Returns:
+            `np.ndarray` of flags. `True` means the sentence is kept.
+            If `calculate_sparse` is not overridden, `None`.
+        '''
+        sentence_n = count_arr.shape[0]
+        alive_arr = np.ones(sentence_n, dtype=bool)
+        keep_arr = np.zeros(sentence_n, dtype=bool)
+        similarity_limit = self.similarity_limit
+        for start in range(0, sentence_n, self.batch_size):
+            end = min(start + self.batch_size, sentence_n)
+            subject_arr = start + np.flatnonzero(alive_arr[start:end])
+            if subject_arr.shape[0] == 0:
+                continue
+            object_arr = start + np.flatnonzero(alive_arr[start:])
+            similarity_arr = self.calculate_sparse(count_arr[subject_arr], count_arr[object_arr])
+            if similarity_arr is None:
+                return None
+            similarity_arr = sp.csr_matrix(similarity_arr)
+
+            for k, i in enumerate(subject_arr):
+                if not alive_arr[i]:
+                    continue
+                keep_arr[i] = True
+                if similarity_limit < 0.0:
+                    # The pairs without any token in common are also more similar than the limit.
+                    alive_arr[i+1:] = False
+                    break
+                row_start, row_end = similarity_arr.indptr[k], similarity_arr.indptr[k+1]
+                col_arr = object_arr[similarity_arr.indices[row_start:row_end]]
+                value_arr = similarity_arr.data[row_start:row_end]
+                alive_arr[col_arr[(col_arr > i) & ~(value_arr <= similarity_limit)]] = False
+
+        return keep_arr
+
+    def __filter(self, token_list_list):
+        '''
+        Filter sentences with `calculate` per pair.
+
+        Args:
+            token_list_list:    The list of the lists of tokens.
+
+        Returns:
+            `np.ndarray` of flags. `True` means the sentence is kept.
+        '''
+        sentence_n = len(token_list_list)
+        alive_arr = np.ones(sentence_n, dtype=bool)
+        keep_arr = np.zeros(sentence_n, dtype=bool)
+        for i in range(sentence_n):
+            if not alive_arr[i]:
+                continue
+            keep_arr[i] = True
+            for j in range(i + 1, sentence_n):
+                if alive_arr[j]:
+                    similarity = self.calculate(token_list_list[i], token_list_list[j])
+                    if not similarity <= self.similarity_limit:
+                        alive_arr[j] = False
+
+        return keep_arr
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import numpy as np
 from pysummarization.similarity_filter import SimilarityFilter
 
 
@@ -27,3 +28,23 @@ class Jaccard(SimilarityFilter):
         except ZeroDivisionError:
             result = 0.0
         return result
+
+    def calculate_sparse(self, subject_count_arr, object_count_arr):
+        '''
+        Calculate similarities of all pairs with the Jaccard coefficient.
+
+        Concrete method.
+
+        Args:
+            subject_count_arr:  `scipy.sparse.csr_matrix` of the counts of tokens in subject sentences.
+            object_count_arr:   `scipy.sparse.csr_matrix` of the counts of tokens in object sentences.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of similarities.
+        '''
+        x, y = self.unique_sparse(subject_count_arr, object_count_arr)
+        intersection_arr = (x @ y.T).tocoo()
+        x_n_arr = np.asarray(x.sum(axis=1)).ravel()[intersection_arr.row]
+        y_n_arr = np.asarray(y.sum(axis=1)).ravel()[intersection_arr.col]
+        intersection_arr.data = intersection_arr.data / (x_n_arr + y_n_arr - intersection_arr.data)
+        return intersection_arr.tocsr()
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import numpy as np
 from pysummarization.similarity_filter import SimilarityFilter
 
 
@@ -22,3 +23,24 @@ class Tanimoto(SimilarityFilter):
         '''
         match_list = [tanimoto_value for tanimoto_value in token_list_x if tanimoto_value in token_list_y]
         return float(len(match_list) / (len(token_list_x) + len(token_list_y) - len(match_list)))
+
+    def calculate_sparse(self, subject_count_arr, object_count_arr):
+        '''
+        Calculate similarities of all pairs with the Tanimoto coefficient.
+
+        Concrete method.
+
+        Args:
+            subject_count_arr:  `scipy.sparse.csr_matrix` of the counts of tokens in subject sentences.
+            object_count_arr:   `scipy.sparse.csr_matrix` of the counts of tokens in object sentences.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of similarities.
+        '''
+        _, y = self.unique_sparse(subject_count_arr, object_count_arr)
+        # The number of tokens in the subject which are also in the object.
+        match_arr = (subject_count_arr @ y.T).tocoo()
+        x_n_arr = np.asarray(subject_count_arr.sum(axis=1)).ravel()[match_arr.row]
+        y_n_arr = np.asarray(object_count_arr.sum(axis=1)).ravel()[match_arr.col]
+        match_arr.data = match_arr.data / (x_n_arr + y_n_arr - match_arr.data)
+        return match_arr.tocsr()
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
+import scipy.sparse as sp
 from pysummarization.similarity_filter import SimilarityFilter
 from pysummarization.vectorizabletoken.tfidf_vectorizer import TfidfVectorizer
 
@@ -7,46 +8,106 @@ from pysummarization.vectorizabletoken.tfidf_vectorizer import TfidfVectorizer
 class TfIdfCosine(SimilarityFilter):
     '''
     Concrete class for filtering mutually similar sentences.
+
+    The sentences are vectorized by `TfidfVectorizer`. If `tfidf_vectorizer` is not set,
+    `similar_filter_r` fits it to all sentences of the document, so that the similarities
+    of all pairs are computed by one fitted model. `calculate` reuses the model fitted to
+    the last document.
     '''
 
+    # The fitted `TfidfVectorizer`.
+    __tfidf_vectorizer = None
+
+    # The `TfidfVectorizer` fitted to the last document in `vectorize_sparse`.
+    __document_vectorizer = None
+
+    def get_tfidf_vectorizer(self):
+        ''' getter '''
+        return self.__tfidf_vectorizer
+
+    def set_tfidf_vectorizer(self, value):
+        ''' setter '''
+        if isinstance(value, TfidfVectorizer) is False and value is not None:
+            raise TypeError("The type of __tfidf_vectorizer must be TfidfVectorizer.")
+        self.__tfidf_vectorizer = value
+
+    tfidf_vectorizer = property(get_tfidf_vectorizer, set_tfidf_vectorizer)
+
     def calculate(self, token_list_x, token_list_y):
         '''
         Calculate similarity with the so-called Cosine similarity of Tf-Idf vectors.
-        
+
         Concrete method.
-        
+
         Args:
             token_list_x:    [token, token, token, ...]
             token_list_y:    [token, token, token, ...]
-        
+
         Returns:
             Similarity.
+
+        Raises:
+            ValueError: If neither `tfidf_vectorizer` is set nor a document has been vectorized
+                        by `vectorize_sparse`.
         '''
         if len(token_list_x) == 0 or len(token_list_y) == 0:
             return 0.0
 
-        document_list = token_list_x.copy()
-        [document_list.append(v) for v in token_list_y]
-        document_list = list(set(document_list))
-
-        tfidf_vectorizer = TfidfVectorizer(document_list)
-
-        vector_list_x = tfidf_vectorizer.vectorize(token_list_x)
-        vector_list_y = tfidf_vectorizer.vectorize(token_list_y)
-        
-        if len(vector_list_x) > len(vector_list_y):
-            [vector_list_y.append(0.0) for _ in range(len(vector_list_x) - len(vector_list_y))]
-        elif len(vector_list_y) > len(vector_list_x):
-            [vector_list_x.append(0.0) for _ in range(len(vector_list_y) - len(vector_list_x))]
-
-        dot_prod = np.dot(vector_list_x, vector_list_y)
-        norm_x = np.linalg.norm(vector_list_x)
-        norm_y = np.linalg.norm(vector_list_y)
-        try:
-            result = dot_prod / (norm_x * norm_y)
-            if np.isnan(result) is True:
-                return 0.0
-            else:
-                return result
-        except ZeroDivisionError:
-            return 0.0
+        tfidf_vectorizer = self.tfidf_vectorizer
+        if tfidf_vectorizer is None:
+            tfidf_vectorizer = self.__document_vectorizer
+        if tfidf_vectorizer is None:
+            raise ValueError(
+                "The fitted TfidfVectorizer is not found. Set `tfidf_vectorizer` or call `similar_filter_r` first."
+            )
+
+        vector_arr = tfidf_vectorizer.vectorize_batch([token_list_x, token_list_y])
+        similarity_arr = self.calculate_sparse(vector_arr[:1], vector_arr[1:])
+        return float(similarity_arr[0, 0])
+
+    def vectorize_sparse(self, token_list_list):
+        '''
+        Vectorize sentences by Tf-Idf.
+
+        Override.
+
+        Args:
+            token_list_list:    The list of the lists of tokens.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of Tf-Idf vectors.
+        '''
+        tfidf_vectorizer = self.tfidf_vectorizer
+        if tfidf_vectorizer is None:
+            tfidf_vectorizer = TfidfVectorizer(token_list_list)
+            self.__document_vectorizer = tfidf_vectorizer
+        return tfidf_vectorizer.vectorize_batch(token_list_list)
+
+    def calculate_sparse(self, subject_count_arr, object_count_arr):
+        '''
+        Calculate similarities of all pairs with the Cosine similarity.
+
+        Concrete method.
+
+        Args:
+            subject_count_arr:  `scipy.sparse.csr_matrix` of Tf-Idf vectors of subject sentences.
+            object_count_arr:   `scipy.sparse.csr_matrix` of Tf-Idf vectors of object sentences.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of similarities.
+        '''
+        return self.__normalize(subject_count_arr) @ self.__normalize(object_count_arr).T
+
+    def __normalize(self, vector_arr):
+        '''
+        Normalize vectors by L2 norm. Zero vectors are left as they are.
+
+        Args:
+            vector_arr:     `scipy.sparse.csr_matrix` of vectors.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of normalized vectors.
+        '''
+        norm_arr = np.sqrt(np.asarray(vector_arr.multiply(vector_arr).sum(axis=1)).ravel())
+        norm_arr[norm_arr == 0.0] = 1.0
+        return sp.csr_matrix(sp.diags(1.0 / norm_arr) @ vector_arr)
@@ -20,3 +20,15 @@ class TokenizableDoc(metaclass=ABCMeta):
             [token, token, token, ...]
         '''
         raise NotImplementedError("This method must be implemented.")
+
+    def tokenize_batch(self, sentence_list):
+        '''
+        Tokenize the list of str.
+
+        Args:
+            sentence_list:  The list of tokenized strings.
+
+        Returns:
+            [[token, token, token, ...], [token, token, token, ...], ...]
+        '''
+        return [self.tokenize(sentence_str) for sentence_str in sentence_list]
@@ -1,15 +1,88 @@
 # -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
 from pysummarization.tokenizable_doc import TokenizableDoc
 import MeCab
 
+# The cache of `MeCab.Tagger` per thread. {(dictionary, output mode): `MeCab.Tagger`}
+_tagger_local = threading.local()
+
+
+def _get_tagger(mecab_system_dic, output_mode):
+    '''
+    Get the cached `MeCab.Tagger`.
+
+    The taggers are cached per thread, because `MeCab.Tagger` is not thread-safe.
+
+    Args:
+        mecab_system_dic:   Path ot mecab dictionary.
+        output_mode:        The output mode of MeCab. For instance, "-Owakati".
+
+    Returns:
+        `MeCab.Tagger`.
+    '''
+    tagger_dict = getattr(_tagger_local, "tagger_dict", None)
+    if tagger_dict is None:
+        tagger_dict = {}
+        _tagger_local.tagger_dict = tagger_dict
+
+    key = (mecab_system_dic, output_mode)
+    tagger = tagger_dict.get(key)
+    if tagger is None:
+        tagger = MeCab.Tagger(mecab_system_dic + " " + output_mode)
+        tagger_dict[key] = tagger
+    return tagger
+
+
+def _init_worker(mecab_system_dic, part_of_speech):
+    '''
+    Initialize the worker of the pool, loading the dictionary only once.
+
+    Args:
+        mecab_system_dic:   Path ot mecab dictionary.
+        part_of_speech:     The list of part of speech.
+    '''
+    if len(part_of_speech) == 0:
+        _get_tagger(mecab_system_dic, "-Owakati")
+    else:
+        _get_tagger(mecab_system_dic, "-Ochasen")
+
+
+def _tokenize_chunk(mecab_system_dic, part_of_speech, sentence_list):
+    '''
+    Tokenize the list of str in the worker.
+
+    Args:
+        mecab_system_dic:   Path ot mecab dictionary.
+        part_of_speech:     The list of part of speech.
+        sentence_list:      The list of tokenized strings.
+
+    Returns:
+        [[token, token, token, ...], [token, token, token, ...], ...]
+    '''
+    tokenizer = MeCabTokenizer()
+    tokenizer.mecab_system_dic = mecab_system_dic
+    tokenizer.part_of_speech = part_of_speech
+    return [tokenizer.tokenize(sentence_str) for sentence_str in sentence_list]
+
 
 class MeCabTokenizer(TokenizableDoc):
     '''
     Tokenize string.
     
     Japanese morphological analysis with MeCab.
+
+    `MeCab.Tagger` is cached per dictionary and output mode,
+    so that the dictionary is loaded only once in each thread or process.
+
+    The pool of `tokenize_batch` is created lazily and kept until `close` is called,
+    so that its workers and their taggers are reused across the batches.
     '''
 
+    # The pool of `tokenize_batch` and its settings.
+    __executor = None
+    __executor_key = None
+
     # Path ot mecab dictionary.
     # For instance, "-d /usr/lib/x86_64-linux-gnu/mecab/dic/mecab-ipadic-neologd".
     # If empty(""), this class will see default settings.
@@ -37,6 +110,40 @@ class MeCabTokenizer(TokenizableDoc):
 
     part_of_speech = property(get_part_of_speech, set_part_of_speech)
 
+    # The number of workers in `tokenize_batch`. If `1`, no pool is used.
+    __max_workers = 1
+
+    def get_max_workers(self):
+        ''' getter '''
+        if isinstance(self.__max_workers, int) is False:
+            raise TypeError("The type of __max_workers must be int.")
+        return self.__max_workers
+
+    def set_max_workers(self, value):
+        ''' setter '''
+        if isinstance(value, int) is False:
+            raise TypeError("The type of __max_workers must be int.")
+        if value <= 0:
+            raise ValueError("The value of __max_workers must be greater than 0.")
+        self.__max_workers = value
+
+    max_workers = property(get_max_workers, set_max_workers)
+
+    # The type of pool in `tokenize_batch`: "thread" or "process".
+    __pool_mode = "thread"
+
+    def get_pool_mode(self):
+        ''' getter '''
+        return self.__pool_mode
+
+    def set_pool_mode(self, value):
+        ''' setter '''
+        if value not in ("thread", "process"):
+            raise ValueError("The value of __pool_mode must be `thread` or `process`.")
+        self.__pool_mode = value
+
+    pool_mode = property(get_pool_mode, set_pool_mode)
+
     def tokenize(self, sentence_str):
         '''
         Tokenize str.
@@ -48,15 +155,14 @@ class MeCabTokenizer(TokenizableDoc):
             [token, token, token, ...]
         '''
         if len(self.part_of_speech) == 0:
-            mt = MeCab.Tagger(self.mecab_system_dic + " -Owakati")
+            mt = _get_tagger(self.mecab_system_dic, "-Owakati")
             wordlist = mt.parse(sentence_str)
             token_list = wordlist.rstrip(" \n").split(" ")
             return token_list
         else:
-            tagger = MeCab.Tagger(self.mecab_system_dic + " -Ochasen")
+            tagger = _get_tagger(self.mecab_system_dic, "-Ochasen")
             node = tagger.parseToNode(sentence_str)
 
-            result_tuple_list = []
             token_list = []
             while node:
                 feature_list = node.feature.split(",")
@@ -66,3 +172,73 @@ class MeCabTokenizer(TokenizableDoc):
                         token_list.append(token)
                 node = node.next
             return token_list
+
+    def close(self):
+        '''
+        Shut down the pool of `tokenize_batch`.
+        '''
+        if self.__executor is not None:
+            self.__executor.shutdown(wait=True)
+            self.__executor = None
+            self.__executor_key = None
+
+    def __get_executor(self):
+        '''
+        Get the pool of `tokenize_batch`.
+
+        If the settings have been changed since the pool was created, it is created again.
+
+        Returns:
+            `ThreadPoolExecutor` or `ProcessPoolExecutor`.
+        '''
+        key = (self.pool_mode, self.max_workers, self.mecab_system_dic, tuple(self.part_of_speech))
+        if self.__executor is not None and self.__executor_key != key:
+            self.close()
+
+        if self.__executor is None:
+            if self.pool_mode == "process":
+                executor_class = ProcessPoolExecutor
+            else:
+                executor_class = ThreadPoolExecutor
+            self.__executor = executor_class(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.mecab_system_dic, self.part_of_speech)
+            )
+            self.__executor_key = key
+        return self.__executor
+
+    def tokenize_batch(self, sentence_list):
+        '''
+        Tokenize the list of str.
+
+        If `max_workers` is greater than `1`, the list is split into chunks
+        and tokenized in the pool of threads or processes, according to `pool_mode`.
+        The pool is kept for the next batches. Call `close` to shut it down.
+
+        Args:
+            sentence_list:  The list of tokenized strings.
+
+        Returns:
+            [[token, token, token, ...], [token, token, token, ...], ...]
+        '''
+        sentence_list = list(sentence_list)
+        if self.max_workers == 1 or len(sentence_list) <= 1:
+            return [self.tokenize(sentence_str) for sentence_str in sentence_list]
+
+        chunk_n = min(self.max_workers * 4, len(sentence_list))
+        chunk_size = -(-len(sentence_list) // chunk_n)
+        chunk_list = [
+            sentence_list[i:i+chunk_size] for i in range(0, len(sentence_list), chunk_size)
+        ]
+        result_list = self.__get_executor().map(
+            _tokenize_chunk,
+            [self.mecab_system_dic] * len(chunk_list),
+            [self.part_of_speech] * len(chunk_list),
+            chunk_list
+        )
+        token_list_list = []
+        for token_list_chunk in result_list:
+            token_list_list.extend(token_list_chunk)
+
+        return token_list_list
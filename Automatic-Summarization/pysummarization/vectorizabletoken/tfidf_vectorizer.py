@@ -1,50 +1,148 @@
 # -*- coding: utf-8 -*-
-import nltk
+import numpy as np
+import scipy.sparse as sp
 from pysummarization.vectorizable_token import VectorizableToken
 
 
 class TfidfVectorizer(VectorizableToken):
     '''
     Vectorize token.
+
+    The corpus is fitted once in `__init__`: the vocabulary is interned by `dict`,
+    the documents are stored in a CSR document-term matrix of counts,
+    and the IDF of each token is cached in `np.ndarray`.
+    The definitions of TF and IDF are the same as `nltk.TextCollection`.
     '''
-    # Document
-    __collection = []
 
     __vector_list = None
-    
+
     def __init__(self, token_list_list):
         '''
         Initialize.
-        
+
         Args:
             token_list_list:    The list of list of tokens.
         '''
-        self.__collection = nltk.TextCollection(token_list_list)
+        token_list_list = [list(token_list) for token_list in token_list_list]
+        self.__vocabulary_dict = {}
+        for token_list in token_list_list:
+            for token in token_list:
+                self.__vocabulary_dict.setdefault(token, len(self.__vocabulary_dict))
+
+        self.__document_term_arr = self.__count(token_list_list)
+
+        document_n = self.__document_term_arr.shape[0]
+        # The number of documents that each token appears in.
+        df_arr = np.bincount(
+            self.__document_term_arr.indices,
+            minlength=len(self.__vocabulary_dict)
+        ).astype(np.float64)
+        self.__idf_arr = np.zeros(len(self.__vocabulary_dict), dtype=np.float64)
+        self.__idf_arr[df_arr > 0] = np.log(document_n / df_arr[df_arr > 0])
+
+        # TF-IDF of tokens in the whole collection.
+        token_count_arr = np.asarray(self.__document_term_arr.sum(axis=0)).ravel()
+        total_n = token_count_arr.sum()
+        if total_n > 0:
+            self.__weight_arr = token_count_arr / total_n * self.__idf_arr
+        else:
+            self.__weight_arr = np.zeros(len(self.__vocabulary_dict), dtype=np.float64)
+
+    def __count(self, token_list_list):
+        '''
+        Count tokens in the vocabulary.
+
+        Args:
+            token_list_list:    The list of list of tokens.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of counts.
+            The shape is (the number of documents, the number of tokens in the vocabulary).
+        '''
+        col_list = []
+        indptr_list = [0]
+        for token_list in token_list_list:
+            col_list.extend([
+                self.__vocabulary_dict[token] for token in token_list if token in self.__vocabulary_dict
+            ])
+            indptr_list.append(len(col_list))
+
+        count_arr = sp.csr_matrix(
+            (
+                np.ones(len(col_list), dtype=np.float64),
+                np.array(col_list, dtype=np.int64),
+                np.array(indptr_list, dtype=np.int64)
+            ),
+            shape=(len(token_list_list), len(self.__vocabulary_dict))
+        )
+        count_arr.sum_duplicates()
+        return count_arr
 
     def vectorize(self, token_list):
         '''
         Tokenize token list.
-        
+
         Args:
             token_list:   The list of tokens..
-        
+
         Returns:
             [vector of token, vector of token, vector of token, ...]
         '''
-        vector_list = [self.__collection.tf_idf(token, self.__collection) for token in token_list]
+        vector_list = [
+            float(self.__weight_arr[self.__vocabulary_dict[token]]) if token in self.__vocabulary_dict else 0.0
+            for token in token_list
+        ]
         self.__vector_list = vector_list
         return vector_list
 
+    def vectorize_batch(self, token_list_list):
+        '''
+        Vectorize documents at once.
+
+        Args:
+            token_list_list:    The list of list of tokens.
+
+        Returns:
+            `scipy.sparse.csr_matrix` of TF-IDF vectors of documents.
+            The shape is (the number of documents, the number of tokens in the vocabulary).
+        '''
+        token_list_list = [list(token_list) for token_list in token_list_list]
+        tf_arr = self.__count(token_list_list)
+        length_arr = np.array([len(token_list) for token_list in token_list_list], dtype=np.float64)
+        length_arr[length_arr == 0] = 1.0
+        # TF is the count of token divided by the length of document.
+        tf_arr = sp.diags(1.0 / length_arr) @ tf_arr
+        return sp.csr_matrix(tf_arr @ sp.diags(self.__idf_arr))
+
+    def get_vocabulary_dict(self):
+        ''' getter '''
+        return self.__vocabulary_dict
+
+    def get_document_term_arr(self):
+        ''' getter '''
+        return self.__document_term_arr
+
+    def get_idf_arr(self):
+        ''' getter '''
+        return self.__idf_arr
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    vocabulary_dict = property(get_vocabulary_dict, set_readonly)
+    document_term_arr = property(get_document_term_arr, set_readonly)
+    idf_arr = property(get_idf_arr, set_readonly)
+
     def get_dim(self):
         ''' getter '''
         if self.__vector_list is None:
             _ = self.vectorize(["dummy"])
-        
+
         return len(self.__vector_list)
 
     def set_dim(self, value):
         ''' setter '''
         raise TypeError("This property must be read-only.")
-    
-    dim = property(get_dim, set_dim)
 
+    dim = property(get_dim, set_dim)
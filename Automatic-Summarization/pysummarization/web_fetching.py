@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+import base64
+import hashlib
+import http.client
+import json
+import os
+import queue
+import tempfile
+import threading
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+class WebFetching(object):
+    '''
+    Object of HTTP fetching for `WebScraping` and `WebPDFReading`.
+
+    The connections are kept alive in the pool per host. Each request checks out
+    an idle connection and returns it after the response has been read,
+    so that many URLs can be fetched by any threads without the handshake per URL,
+    and the number of open connections is bounded by `max_idle_n` per host.
+    The proxies are configured by `urllib.request.getproxies`, such as
+    `HTTP_PROXY`, `HTTPS_PROXY` and `NO_PROXY`, as well as `urllib.request.urlopen`.
+    The errors are raised as `urllib.error.HTTPError` and `urllib.error.URLError`.
+
+    If `cache_dir` is not `None`, the responses are cached on disk.
+    The bodies are stored by the SHA-256 of their contents, and each URL refers
+    to its body with `ETag` and `Last-Modified`. The cached responses are
+    revalidated by `If-None-Match` and `If-Modified-Since`, so that
+    unchanged documents are not downloaded again.
+    If the bodies exceed `max_cache_bytes`, the least recently used ones are removed.
+    '''
+
+    # The size of chunks in streaming the response bodies.
+    __chunk_size = 65536
+
+    # The status codes of redirection.
+    __redirect_status_tuple = (301, 302, 303, 307, 308)
+
+    def __init__(
+        self,
+        cache_dir=None,
+        timeout=30.0,
+        max_redirect_n=5,
+        max_idle_n=8,
+        max_cache_bytes=1024 ** 3
+    ):
+        '''
+        Init.
+
+        Args:
+            cache_dir:          The directory of the response cache.
+                                If `None`, the responses are not cached.
+            timeout:            Timeout of connections in seconds.
+            max_redirect_n:     The maximum number of redirections.
+            max_idle_n:         The maximum number of idle connections kept alive per host.
+            max_cache_bytes:    The maximum bytes of the bodies in `cache_dir`.
+                                If `None`, the cache is not bounded.
+        '''
+        if cache_dir is not None and isinstance(cache_dir, str) is False:
+            raise TypeError("The type of cache_dir must be str.")
+        if isinstance(max_redirect_n, int) is False:
+            raise TypeError("The type of max_redirect_n must be int.")
+        if isinstance(max_idle_n, int) is False:
+            raise TypeError("The type of max_idle_n must be int.")
+        if max_cache_bytes is not None and isinstance(max_cache_bytes, int) is False:
+            raise TypeError("The type of max_cache_bytes must be int.")
+
+        self.__cache_dir = cache_dir
+        self.__timeout = timeout
+        self.__max_redirect_n = max_redirect_n
+        self.__max_idle_n = max_idle_n
+        self.__max_cache_bytes = max_cache_bytes
+        # {scheme: proxy URL}
+        self.__proxy_dict = urllib.request.getproxies()
+        # {(scheme, netloc, proxy URL): `queue.LifoQueue` of idle `http.client.HTTPConnection`}
+        self.__pool_dict = {}
+        self.__lock = threading.Lock()
+        # The total bytes of the bodies in `cache_dir`. It is counted lazily.
+        self.__cache_bytes = None
+
+        if cache_dir is not None:
+            os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+            os.makedirs(os.path.join(cache_dir, "urls"), exist_ok=True)
+
+    def get_cache_dir(self):
+        ''' getter '''
+        return self.__cache_dir
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    cache_dir = property(get_cache_dir, set_readonly)
+
+    def fetch(self, url):
+        '''
+        Fetch the body of the URL.
+
+        Args:
+            url:    URL.
+
+        Returns:
+            Tuple(`bytes` of the body, `str` of Content-Type).
+        '''
+        path, content_type = self.fetch_file(url)
+        try:
+            with open(path, "rb") as f:
+                body = f.read()
+        finally:
+            if self.__cache_dir is None:
+                os.remove(path)
+        return body, content_type
+
+    def fetch_file(self, url):
+        '''
+        Fetch the body of the URL and stream it to a local file.
+
+        Args:
+            url:    URL.
+
+        Returns:
+            Tuple(the path of the file, `str` of Content-Type).
+            If `cache_dir` is `None`, the file is a temporary file and must be removed by the caller.
+        '''
+        if isinstance(url, str) is False:
+            raise TypeError("The type of url must be str.")
+
+        meta_dict = self.__load_meta(url)
+        header_dict = {}
+        if meta_dict is not None:
+            if meta_dict.get("etag") is not None:
+                header_dict["If-None-Match"] = meta_dict["etag"]
+            if meta_dict.get("last_modified") is not None:
+                header_dict["If-Modified-Since"] = meta_dict["last_modified"]
+
+        if self.__cache_dir is None:
+            fd, temp_path = tempfile.mkstemp()
+        else:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.join(self.__cache_dir, "objects"))
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                status, response_header_dict, digest = self.__request(url, header_dict, f)
+        except urllib.error.URLError:
+            os.remove(temp_path)
+            raise
+        except (http.client.HTTPException, OSError) as e:
+            os.remove(temp_path)
+            # The same type of errors as `urllib.request.urlopen`.
+            raise urllib.error.URLError(e) from e
+        except:
+            os.remove(temp_path)
+            raise
+
+        if status == 304 and meta_dict is not None:
+            os.remove(temp_path)
+            path = self.__object_path(meta_dict["digest"])
+            # The modification time is the order of eviction.
+            os.utime(path)
+            return path, meta_dict["content_type"]
+
+        content_type = response_header_dict.get("content-type", "")
+        if self.__cache_dir is None:
+            return temp_path, content_type
+
+        path = self.__object_path(digest)
+        new_flag = os.path.exists(path) is False
+        os.replace(temp_path, path)
+        if new_flag is True:
+            self.__evict(path)
+        cache_flag = "no-store" not in response_header_dict.get("cache-control", "")
+        if cache_flag is True and (
+            response_header_dict.get("etag") is not None or response_header_dict.get("last-modified") is not None
+        ):
+            self.__save_meta(
+                url,
+                {
+                    "etag": response_header_dict.get("etag"),
+                    "last_modified": response_header_dict.get("last-modified"),
+                    "digest": digest,
+                    "content_type": content_type
+                }
+            )
+        return path, content_type
+
+    def close(self):
+        '''
+        Close all idle connections.
+        '''
+        with self.__lock:
+            pool_list = list(self.__pool_dict.values())
+            self.__pool_dict = {}
+        for pool in pool_list:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def __request(self, url, header_dict, f):
+        '''
+        Send GET request, following redirections, and stream the body to the file.
+
+        Args:
+            url:            URL.
+            header_dict:    `dict` of request headers.
+            f:              The file object to write the body.
+
+        Returns:
+            Tuple(status code, `dict` of lower-cased response headers, SHA-256 of the body).
+
+        Raises:
+            urllib.error.HTTPError:     If the status code is 400 or more, or there are too many redirections.
+        '''
+        for _ in range(self.__max_redirect_n + 1):
+            parse_result = urllib.parse.urlsplit(url)
+            proxy = self.__find_proxy(parse_result)
+            if proxy is not None and parse_result.scheme == "http":
+                # The proxy receives the absolute URL.
+                path = urllib.parse.urlunsplit(parse_result._replace(fragment=""))
+            else:
+                path = parse_result.path or "/"
+                if parse_result.query:
+                    path += "?" + parse_result.query
+
+            key = (parse_result.scheme, parse_result.netloc, proxy)
+            connection, response = self.__send(key, path, header_dict)
+            try:
+                response_header_dict = {key.lower(): value for key, value in response.getheaders()}
+                if response.status in self.__redirect_status_tuple and "location" in response_header_dict:
+                    response.read()
+                    self.__release(key, connection, response)
+                    url = urllib.parse.urljoin(url, response_header_dict["location"])
+                    continue
+                if response.status >= 400:
+                    raise urllib.error.HTTPError(url, response.status, response.reason, response.msg, None)
+
+                sha256 = hashlib.sha256()
+                while True:
+                    chunk = response.read(self.__chunk_size)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+                    f.write(chunk)
+            except:
+                # The connection can not be reused after a partial response.
+                connection.close()
+                raise
+
+            self.__release(key, connection, response)
+            return response.status, response_header_dict, sha256.hexdigest()
+
+        raise urllib.error.HTTPError(url, response.status, "Too many redirections", response.msg, None)
+
+    def __find_proxy(self, parse_result):
+        '''
+        Find the proxy of the URL.
+
+        Args:
+            parse_result:   `urllib.parse.SplitResult` of URL.
+
+        Returns:
+            The proxy URL. If the URL is not proxied, `None`.
+        '''
+        proxy = self.__proxy_dict.get(parse_result.scheme)
+        if proxy is None or urllib.request.proxy_bypass(parse_result.hostname or ""):
+            return None
+        if "://" not in proxy:
+            proxy = "http://" + proxy
+        return proxy
+
+    def __send(self, key, path, header_dict):
+        '''
+        Send GET request with a connection checked out from the pool.
+
+        Args:
+            key:            Tuple(scheme, netloc, proxy URL or `None`).
+            path:           Path and query, or the absolute URL if the request is sent to the HTTP proxy.
+            header_dict:    `dict` of request headers.
+
+        Returns:
+            Tuple(`http.client.HTTPConnection`, `http.client.HTTPResponse`).
+            The connection must be returned by `__release` or closed.
+        '''
+        scheme, netloc, proxy = key
+        if scheme not in ("http", "https"):
+            raise urllib.error.URLError("unknown url type: " + scheme)
+
+        proxy_header_dict = {}
+        if proxy is not None:
+            proxy_result = urllib.parse.urlsplit(proxy)
+            proxy_host = proxy_result.hostname
+            proxy_port = proxy_result.port or 80
+            if proxy_result.username is not None:
+                credential = urllib.parse.unquote(proxy_result.username) + ":" + urllib.parse.unquote(
+                    proxy_result.password or ""
+                )
+                proxy_header_dict["Proxy-Authorization"] = "Basic " + base64.b64encode(
+                    credential.encode("utf-8")
+                ).decode("ascii")
+            if scheme == "http":
+                header_dict = dict(header_dict, **proxy_header_dict)
+
+        with self.__lock:
+            pool = self.__pool_dict.setdefault(key, queue.LifoQueue())
+
+        while True:
+            try:
+                connection = pool.get_nowait()
+                idle_flag = True
+            except queue.Empty:
+                if proxy is None and scheme == "https":
+                    connection = http.client.HTTPSConnection(netloc, timeout=self.__timeout)
+                elif proxy is None:
+                    connection = http.client.HTTPConnection(netloc, timeout=self.__timeout)
+                elif scheme == "https":
+                    # The TLS connection is tunneled through the proxy by CONNECT.
+                    connection = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=self.__timeout)
+                    connection.set_tunnel(netloc, headers=proxy_header_dict)
+                else:
+                    connection = http.client.HTTPConnection(proxy_host, proxy_port, timeout=self.__timeout)
+                idle_flag = False
+
+            try:
+                connection.request("GET", path, headers=header_dict)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The idle connection was closed by the server.
+                connection.close()
+                if idle_flag is False:
+                    raise
+            except:
+                connection.close()
+                raise
+
+    def __release(self, key, connection, response):
+        '''
+        Return the connection to the pool, or close it.
+
+        Args:
+            key:            Tuple(scheme, netloc, proxy URL or `None`).
+            connection:     `http.client.HTTPConnection`.
+            response:       `http.client.HTTPResponse`, which has been read.
+        '''
+        if response.will_close:
+            connection.close()
+            return
+
+        with self.__lock:
+            pool = self.__pool_dict.get(key)
+        if pool is None or pool.qsize() >= self.__max_idle_n:
+            connection.close()
+            return
+        pool.put(connection)
+
+    def __evict(self, path):
+        '''
+        Remove the least recently used bodies until the cache is within `max_cache_bytes`.
+
+        Args:
+            path:   The path of the body which has been stored now. It is not removed.
+        '''
+        if self.__max_cache_bytes is None:
+            return
+
+        with self.__lock:
+            if self.__cache_bytes is None:
+                self.__cache_bytes = sum(entry.stat().st_size for entry in self.__scan_objects())
+            else:
+                self.__cache_bytes += os.path.getsize(path)
+            if self.__cache_bytes <= self.__max_cache_bytes:
+                return
+
+            entry_list = sorted(
+                [entry for entry in self.__scan_objects() if entry.path != path],
+                key=lambda entry: entry.stat().st_mtime
+            )
+            cache_bytes = sum(entry.stat().st_size for entry in entry_list) + os.path.getsize(path)
+            for entry in entry_list:
+                if cache_bytes <= self.__max_cache_bytes:
+                    break
+                try:
+                    size = entry.stat().st_size
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                cache_bytes -= size
+            self.__cache_bytes = cache_bytes
+
+            # The metadata of the removed bodies are removed too.
+            url_dir = os.path.join(self.__cache_dir, "urls")
+            for entry in os.scandir(url_dir):
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        digest = json.load(f)["digest"]
+                except (OSError, ValueError, KeyError):
+                    continue
+                if os.path.exists(self.__object_path(digest)) is False:
+                    try:
+                        os.remove(entry.path)
+                    except OSError:
+                        pass
+
+    def __scan_objects(self):
+        '''
+        Scan the stored bodies, except the temporary files being written.
+
+        Returns:
+            `list` of `os.DirEntry`.
+        '''
+        entry_list = []
+        for entry in os.scandir(os.path.join(self.__cache_dir, "objects")):
+            if len(entry.name) == 64 and entry.name.startswith("tmp") is False:
+                entry_list.append(entry)
+        return entry_list
+
+    def __object_path(self, digest):
+        return os.path.join(self.__cache_dir, "objects", digest)
+
+    def __meta_path(self, url):
+        return os.path.join(self.__cache_dir, "urls", hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def __load_meta(self, url):
+        '''
+        Load the cached metadata of the URL.
+
+        Args:
+            url:    URL.
+
+        Returns:
+            `dict` of metadata. If it is not cached, `None`.
+        '''
+        if self.__cache_dir is None:
+            return None
+        try:
+            with open(self.__meta_path(url), "r", encoding="utf-8") as f:
+                meta_dict = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if os.path.exists(self.__object_path(meta_dict["digest"])) is False:
+            return None
+        return meta_dict
+
+    def __save_meta(self, url, meta_dict):
+        '''
+        Save the metadata of the URL atomically.
+
+        Args:
+            url:            URL.
+            meta_dict:      `dict` of metadata.
+        '''
+        fd, temp_path = tempfile.mkstemp(dir=os.path.join(self.__cache_dir, "urls"))
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(meta_dict, f)
+        os.replace(temp_path, self.__meta_path(url))
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
 from pysummarization.readable_web_pdf import ReadableWebPDF
+from pysummarization.web_fetching import WebFetching
 from time import sleep
-import urllib
 from pyquery import PyQuery as pq
 
 
@@ -34,6 +35,42 @@ class WebScraping(object):
 
     readable_web_pdf = property(get_readable_web_pdf, set_readable_web_pdf)
 
+    # Object of WebFetching.
+    __web_fetching = None
+
+    def get_web_fetching(self):
+        ''' getter '''
+        if self.__web_fetching is None:
+            self.__web_fetching = WebFetching()
+        return self.__web_fetching
+
+    def set_web_fetching(self, value):
+        ''' setter '''
+        if isinstance(value, WebFetching) is False:
+            raise TypeError("The type of __web_fetching must be WebFetching.")
+        self.__web_fetching = value
+
+    web_fetching = property(get_web_fetching, set_web_fetching)
+
+    # The maximum number of threads in `scrape_many`.
+    __max_workers = 8
+
+    def get_max_workers(self):
+        ''' getter '''
+        if isinstance(self.__max_workers, int) is False:
+            raise TypeError("The type of __max_workers must be int.")
+        return self.__max_workers
+
+    def set_max_workers(self, value):
+        ''' setter '''
+        if isinstance(value, int) is False:
+            raise TypeError("The type of __max_workers must be int.")
+        if value <= 0:
+            raise ValueError("The value of __max_workers must be greater than 0.")
+        self.__max_workers = value
+
+    max_workers = property(get_max_workers, set_max_workers)
+
     def scrape(self, url):
         '''
         Execute Web-Scraping.
@@ -50,18 +87,67 @@ class WebScraping(object):
         if isinstance(url, str) is False:
             raise TypeError("The type of url must be str.")
 
+        web_data = self.__scrape(url)
+        sleep(1)
+        return web_data
+
+    def scrape_many(self, url_list):
+        '''
+        Execute Web-Scraping of many URLs concurrently.
+
+        The URLs are fetched by the pool of `max_workers` threads,
+        and the connections are reused per host by `web_fetching`.
+
+        Args:
+            url_list:   `list` of Web site urls.
+
+        Returns:
+            `list` of the results, which is ordered in the same way as `url_list`.
+        '''
+        for url in url_list:
+            if isinstance(url, str) is False:
+                raise TypeError("The type of url must be str.")
+
+        # `web_fetching` is created before the threads share it.
+        self.get_web_fetching()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.__scrape, url_list))
+
+    def __scrape(self, url):
+        '''
+        Scrape one URL.
+
+        Args:
+            url:    Web site url.
+
+        Returns:
+            The result. this is a string.
+        '''
         if self.readable_web_pdf is not None and self.readable_web_pdf.is_pdf_url(url) is True:
-            web_data = self.readable_web_pdf.url_to_text(url)
-        else:
-            web_data = ""
-            req = urllib.request.Request(url=url)
-            with urllib.request.urlopen(req) as f:
-                web = f.read().decode('utf-8')
-                dom = pq(web)
-                [dom(remove_object).remove() for remove_object in self.__remove_object_list]
-
-                for dom_object in self.__dom_object_list:
-                    web_data += dom(dom_object).text()
+            return self.readable_web_pdf.url_to_text(url)
 
-        sleep(1)
+        body, content_type = self.web_fetching.fetch(url)
+        web = body.decode(self.__detect_charset(content_type))
+        dom = pq(web)
+        [dom(remove_object).remove() for remove_object in self.__remove_object_list]
+
+        web_data = ""
+        for dom_object in self.__dom_object_list:
+            web_data += dom(dom_object).text()
         return web_data
+
+    def __detect_charset(self, content_type):
+        '''
+        Detect the charset in Content-Type.
+
+        Args:
+            content_type:   `str` of Content-Type.
+
+        Returns:
+            The charset. The default is utf-8.
+        '''
+        for param in content_type.split(";")[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "charset" and value:
+                return value.strip('"')
+        return "utf-8"
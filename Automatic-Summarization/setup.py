@@ -30,5 +30,5 @@ setup(
     ],
     keywords='Automatic summarization document abstraction abstract text filtering',
     packages=find_packages(exclude=['contrib', 'docs', 'tests*']),
-    install_requires=['numpy', 'nltk']
+    install_requires=['numpy', 'scipy', 'nltk']
 )
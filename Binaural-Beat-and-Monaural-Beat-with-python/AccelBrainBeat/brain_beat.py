@@ -5,8 +5,9 @@ try:
 except:
     pass
 import numpy
+import math
 import wave
-from abc import ABCMeta, abstractmethod
+from abc import ABCMeta
 from AccelBrainBeat.waveform.interface.wave_form_interface import WaveFormInterface
 from AccelBrainBeat.waveform.sine_wave import SineWave
 
@@ -50,7 +51,8 @@ class BrainBeat(metaclass=ABCMeta):
         frequencys,
         play_time,
         sample_rate=44100,
-        volume=0.01
+        volume=0.01,
+        block_size=44100
     ):
         '''
         引数で指定した条件でビートを鳴らす
@@ -60,6 +62,7 @@ class BrainBeat(metaclass=ABCMeta):
             play_time:      再生時間（秒）
             sample_rate:    サンプルレート
             volume:         音量
+            block_size:     一度にストリームへ書き込むフレーム数
 
         Returns:
             void
@@ -74,10 +77,15 @@ class BrainBeat(metaclass=ABCMeta):
             rate=sample_rate,
             output=1
         )
-        left_frequency, right_frequency = frequencys
-        left_chunk = self.__create_chunk(left_frequency, play_time, sample_rate)
-        right_chunk = self.__create_chunk(right_frequency, play_time, sample_rate)
-        self.write_stream(stream, left_chunk, right_chunk, volume)
+        for data in self.generate_stream(
+            frequencys,
+            play_time,
+            sample_rate=sample_rate,
+            volume=volume,
+            block_size=block_size,
+            sample_format="float32"
+        ):
+            stream.write(data)
         stream.stop_stream()
         stream.close()
         audio.terminate()
@@ -88,34 +96,205 @@ class BrainBeat(metaclass=ABCMeta):
         frequencys,
         play_time,
         sample_rate=44100,
-        volume=0.01
+        volume=0.01,
+        block_size=44100
     ):
         '''
         引数で指定した条件でビートを鳴らす
 
+        一定のフレーム数のブロックごとに書き込むため、
+        再生時間に関わらずメモリ使用量は一定となる
+
+        Args:
+            output_file_name:   出力先のファイル名、またはファイルライクオブジェクト
+            frequencys:         (左の周波数(Hz), 右の周波数(Hz))のtuple
+            play_time:          再生時間（秒）
+            sample_rate:        サンプルレート
+            volume:             音量
+            block_size:         一度に書き込むフレーム数
+
+        Returns:
+            void
+        '''
+        wf = wave.open(output_file_name, 'wb')
+        wf.setparams((2, 2, sample_rate, int(play_time * sample_rate), 'NONE', 'not compressed'))
+        for data in self.generate_stream(
+            frequencys,
+            play_time,
+            sample_rate=sample_rate,
+            volume=volume,
+            block_size=block_size,
+            sample_format="int16"
+        ):
+            wf.writeframesraw(data)
+        wf.close()
+
+    def generate_stream(
+        self,
+        frequencys,
+        play_time,
+        sample_rate=44100,
+        volume=0.01,
+        block_size=44100,
+        sample_format="int16",
+        bit16=32767.0
+    ):
+        '''
+        引数で指定した条件のビートを一定のフレーム数のブロックごとに生成する
+
         Args:
             frequencys:     (左の周波数(Hz), 右の周波数(Hz))のtuple
             play_time:      再生時間（秒）
             sample_rate:    サンプルレート
             volume:         音量
+            block_size:     ブロックごとのフレーム数
+            sample_format:  `int16`または`float32`
+            bit16:          整数化の条件
 
         Returns:
-            void
+            左右のチャンネルを交互に並べたバイト列のジェネレータ
         '''
         left_frequency, right_frequency = frequencys
-        left_chunk = self.__create_chunk(left_frequency, play_time, sample_rate)
-        right_chunk = self.__create_chunk(right_frequency, play_time, sample_rate)
-        frame_list = self.read_stream(left_chunk, right_chunk, volume)
+        return self.generate_session_stream(
+            [(left_frequency, right_frequency, play_time)],
+            sample_rate=sample_rate,
+            volume=volume,
+            block_size=block_size,
+            sample_format=sample_format,
+            bit16=bit16
+        )
+
+    def generate_session_stream(
+        self,
+        segment_list,
+        sample_rate=44100,
+        volume=0.01,
+        block_size=44100,
+        sample_format="int16",
+        bit16=32767.0
+    ):
+        '''
+        周波数の異なる複数の区間から成るセッションのビートを
+        一定のフレーム数のブロックごとに生成する
+        区間の境界では左右それぞれの位相を連続させる
+
+        Args:
+            segment_list:   (左の周波数(Hz), 右の周波数(Hz), 再生時間（秒）)のtupleのlist
+            sample_rate:    サンプルレート
+            volume:         音量
+            block_size:     ブロックごとのフレーム数
+            sample_format:  `int16`または`float32`
+            bit16:          整数化の条件
+
+        Returns:
+            左右のチャンネルを交互に並べたバイト列のジェネレータ
+        '''
+        if sample_format not in ("int16", "float32"):
+            raise ValueError("The value of `sample_format` must be `int16` or `float32`.")
+        if block_size <= 0:
+            raise ValueError("The value of `block_size` must be greater than 0.")
+
+        left_phase, right_phase = 0.0, 0.0
+        for left_frequency, right_frequency, play_time in segment_list:
+            length = int(play_time * sample_rate)
+            for start in range(0, length, block_size):
+                block_length = min(block_size, length - start)
+                left_chunk = self.wave_form.create_block(
+                    left_frequency,
+                    start,
+                    block_length,
+                    sample_rate,
+                    phase=left_phase
+                )
+                right_chunk = self.wave_form.create_block(
+                    right_frequency,
+                    start,
+                    block_length,
+                    sample_rate,
+                    phase=right_phase
+                )
+                if sample_format == "int16":
+                    yield self.render_int16(left_chunk, right_chunk, volume, bit16).tobytes()
+                else:
+                    yield self.render_float32(left_chunk, right_chunk, volume).tobytes()
+
+            left_phase = math.fmod(left_phase + 2 * math.pi * left_frequency * length / sample_rate, 2 * math.pi)
+            right_phase = math.fmod(right_phase + 2 * math.pi * right_frequency * length / sample_rate, 2 * math.pi)
+
+    def play_session(
+        self,
+        segment_list,
+        sample_rate=44100,
+        volume=0.01,
+        block_size=44100
+    ):
+        '''
+        周波数の異なる複数の区間から成るセッションのビートを鳴らす
+
+        Args:
+            segment_list:   (左の周波数(Hz), 右の周波数(Hz), 再生時間（秒）)のtupleのlist
+            sample_rate:    サンプルレート
+            volume:         音量
+            block_size:     一度にストリームへ書き込むフレーム数
 
+        Returns:
+            void
+        '''
+        audio = pyaudio.PyAudio()
+        stream = audio.open(
+            format=pyaudio.paFloat32,
+            channels=2,
+            rate=sample_rate,
+            output=1
+        )
+        for data in self.generate_session_stream(
+            segment_list,
+            sample_rate=sample_rate,
+            volume=volume,
+            block_size=block_size,
+            sample_format="float32"
+        ):
+            stream.write(data)
+        stream.stop_stream()
+        stream.close()
+        audio.terminate()
+
+    def save_session(
+        self,
+        output_file_name,
+        segment_list,
+        sample_rate=44100,
+        volume=0.01,
+        block_size=44100
+    ):
+        '''
+        周波数の異なる複数の区間から成るセッションのビートをwavファイルに保存する
+
+        Args:
+            output_file_name:   出力先のファイル名、またはファイルライクオブジェクト
+            segment_list:       (左の周波数(Hz), 右の周波数(Hz), 再生時間（秒）)のtupleのlist
+            sample_rate:        サンプルレート
+            volume:             音量
+            block_size:         一度に書き込むフレーム数
+
+        Returns:
+            void
+        '''
+        frame_n = sum([int(play_time * sample_rate) for _, _, play_time in segment_list])
         wf = wave.open(output_file_name, 'wb')
-        wf.setparams((2, 2, sample_rate, 0, 'NONE', 'not compressed'))
-        wf.writeframes(b''.join(frame_list))
+        wf.setparams((2, 2, sample_rate, frame_n, 'NONE', 'not compressed'))
+        for data in self.generate_session_stream(
+            segment_list,
+            sample_rate=sample_rate,
+            volume=volume,
+            block_size=block_size,
+            sample_format="int16"
+        ):
+            wf.writeframesraw(data)
         wf.close()
 
-    @abstractmethod
     def write_stream(self, stream, left_chunk, right_chunk, volume):
         '''
-        抽象メソッド
         ビートを生成する
 
         Args:
@@ -127,12 +306,10 @@ class BrainBeat(metaclass=ABCMeta):
         Returns:
             void
         '''
-        raise NotImplementedError()
+        stream.write(self.render_float32(left_chunk, right_chunk, volume).tobytes())
 
-    @abstractmethod
     def read_stream(self, left_chunk, right_chunk, volume, bit16=32767.0):
         '''
-        抽象メソッド
         wavファイルに保存するビートを読み込む
 
         Args:
@@ -143,23 +320,55 @@ class BrainBeat(metaclass=ABCMeta):
 
         Returns:
             フレームのlist
+            全フレームを一つのバイト列にまとめて格納する
         '''
-        raise NotImplementedError()
+        return [self.render_int16(left_chunk, right_chunk, volume, bit16).tobytes()]
 
-    def __create_chunk(self, frequency, play_time, sample_rate):
+    def render_float32(self, left_chunk, right_chunk, volume):
         '''
-        チャンクを生成する
+        ビートを32bit浮動小数点数のバッファに一括で変換する
 
         Args:
-            frequency:      周波数
-            play_time:      再生時間（秒）
-            sample_rate:    サンプルレート
+            left_chunk:     左音源に対応するチャンク
+            right_chunk:    右音源に対応するチャンク
+            volume:         音量
 
         Returns:
-            チャンクのnumpy配列
+            (フレーム数, 2)のnumpy配列
+        '''
+        return (self.mix_channels(left_chunk, right_chunk) * volume).astype(numpy.float32)
+
+    def render_int16(self, left_chunk, right_chunk, volume, bit16=32767.0):
         '''
-        chunks = []
-        wave_form = self.wave_form.create(frequency, play_time, sample_rate)
-        chunks.append(wave_form)
-        chunk = numpy.concatenate(chunks)
-        return chunk
+        ビートを16bit整数のバッファに一括で変換する
+        16bit整数の範囲を超える値は範囲内に丸める
+
+        Args:
+            left_chunk:     左音源に対応するチャンク
+            right_chunk:    右音源に対応するチャンク
+            volume:         音量
+            bit16:          整数化の条件
+
+        Returns:
+            (フレーム数, 2)のnumpy配列
+        '''
+        frame_arr = numpy.trunc(self.mix_channels(left_chunk, right_chunk) * bit16 * volume)
+        return numpy.clip(frame_arr, -32768, 32767).astype("<i2")
+
+    def mix_channels(self, left_chunk, right_chunk):
+        '''
+        フックメソッド
+        左右のチャンネルに出力する波形を計算する
+        デフォルトでは左右の音源をそれぞれ左右のチャンネルに出力する
+
+        Args:
+            left_chunk:     左音源に対応するチャンク
+            right_chunk:    右音源に対応するチャンク
+
+        Returns:
+            (フレーム数, 2)のnumpy配列
+        '''
+        if len(left_chunk) != len(right_chunk):
+            raise ValueError()
+
+        return numpy.column_stack((left_chunk, right_chunk))
@@ -1,6 +1,8 @@
 #!/user/bin/env python
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+from fractions import Fraction
+import math
 
 
 class WaveFormInterface(metaclass=ABCMeta):
@@ -27,3 +29,29 @@ class WaveFormInterface(metaclass=ABCMeta):
             波形要素を格納した配列
         '''
         raise NotImplementedError()
+
+    def create_block(self, frequency, start, length, sample_rate, phase=0.0):
+        '''
+        音の波形のうち、指定したフレームの範囲を生成する
+
+        f / sr = p / q のとき、周期的な波形のサンプル列はqフレームで一巡するため、
+        開始フレームをqで割った余りから`create`で生成する
+        生成するフレーム数は開始フレームに依らずq + length以下となるが、
+        qが大きい周波数では非効率なので、必要に応じて下位クラスで効率的な実装に置き換える
+
+        Args:
+            frequency:      周波数
+            start:          開始フレーム
+            length:         フレーム数
+            sample_rate:    サンプルレート
+            phase:          初期位相（ラジアン）
+                            この実装では最も近いフレームだけずらして近似する
+
+        Returns:
+            波形要素を格納した配列
+        '''
+        if phase != 0.0 and frequency != 0:
+            start = start + int(round(phase / (math.pi * 2) / frequency * sample_rate))
+        start = start % (Fraction(str(frequency)) / Fraction(str(sample_rate))).denominator
+        wave_arr = self.create(frequency, (start + length + 0.5) / sample_rate, sample_rate)
+        return wave_arr[start:start+length]
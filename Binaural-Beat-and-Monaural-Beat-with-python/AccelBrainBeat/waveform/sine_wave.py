@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 import numpy
 import math
+import threading
+from collections import OrderedDict
+from fractions import Fraction
 from AccelBrainBeat.waveform.interface.wave_form_interface import WaveFormInterface
 
 
@@ -11,10 +14,41 @@ class SineWave(WaveFormInterface):
     バイノーラルビートやモノラルビートで処理する対象となる
     正弦波の波形を計算する
 
+    周波数とサンプルレートの組み合わせごとに、
+    サンプル列が一巡するまでの波形をウェーブテーブルとしてキャッシュし、
+    以降はsinを再計算せずにウェーブテーブルを敷き詰める
+    キャッシュは全てのインスタンスで共有し、
+    合計のバイト数が上限を超えた場合は最も長く参照されていないウェーブテーブルから破棄する
+
     参考：
     http://milkandtang.com/blog/2013/02/16/making-noise-in-python/
     '''
 
+    # {(周波数, サンプルレート): (sinのウェーブテーブル, cosのウェーブテーブル)}
+    # 参照された順に並べるLRU
+    __wave_table_dict = OrderedDict()
+
+    # キャッシュしているウェーブテーブルの合計のバイト数
+    __cache_bytes = 0
+
+    # キャッシュの合計のバイト数の上限
+    __max_cache_bytes = 64 * 1024 * 1024
+
+    __cache_lock = threading.Lock()
+
+    # ウェーブテーブルの最大のフレーム数
+    __max_table_size = 1048576
+
+    def __init__(self, max_table_size=1048576):
+        '''
+        初期化
+
+        Args:
+            max_table_size:     ウェーブテーブルの最大のフレーム数
+                                一巡するまでのフレーム数がこれを超える場合はキャッシュせずに計算する
+        '''
+        self.__max_table_size = max_table_size
+
     def create(self, frequency, play_time, sample_rate):
         '''
         音の波形を生成する
@@ -28,5 +62,86 @@ class SineWave(WaveFormInterface):
             波形要素を格納した配列
         '''
         length = int(play_time * sample_rate)
+        return self.create_block(frequency, 0, length, sample_rate)
+
+    def create_block(self, frequency, start, length, sample_rate, phase=0.0):
+        '''
+        音の波形のうち、指定したフレームの範囲を生成する
+
+        Args:
+            frequency:      周波数
+            start:          開始フレーム
+            length:         フレーム数
+            sample_rate:    サンプルレート
+            phase:          初期位相（ラジアン）
+
+        Returns:
+            波形要素を格納した配列
+        '''
+        wave_table = self.__extract_wave_table(frequency, sample_rate)
+        if wave_table is None:
+            factor = float(frequency) * (math.pi * 2) / sample_rate
+            return numpy.sin(numpy.arange(start, start + length) * factor + phase)
+
+        sin_arr, cos_arr = wave_table
+        index_arr = numpy.arange(start, start + length) % sin_arr.shape[0]
+        if phase == 0.0:
+            return sin_arr[index_arr]
+        # sin(a + b) = sin(a)cos(b) + cos(a)sin(b)
+        return sin_arr[index_arr] * math.cos(phase) + cos_arr[index_arr] * math.sin(phase)
+
+    def __extract_wave_table(self, frequency, sample_rate):
+        '''
+        ウェーブテーブルを参照する
+        未計算ならば計算してキャッシュする
+
+        Args:
+            frequency:      周波数
+            sample_rate:    サンプルレート
+
+        Returns:
+            (sinのウェーブテーブル, cosのウェーブテーブル)のtuple
+            一巡するまでのフレーム数が大き過ぎる場合はNone
+        '''
+        key = (frequency, sample_rate)
+        with SineWave.__cache_lock:
+            wave_table = SineWave.__wave_table_dict.get(key)
+            if wave_table is not None:
+                SineWave.__wave_table_dict.move_to_end(key)
+        if wave_table is not None:
+            if wave_table[0].shape[0] > self.__max_table_size:
+                return None
+            return wave_table
+
+        # f / sr = p / q のとき、サンプル列はqフレームで一巡する
+        table_size = (Fraction(str(frequency)) / Fraction(str(sample_rate))).denominator
+        if table_size > self.__max_table_size:
+            return None
+
         factor = float(frequency) * (math.pi * 2) / sample_rate
-        return numpy.sin(numpy.arange(length) * factor)
+        theta_arr = numpy.arange(table_size) * factor
+        wave_table = (numpy.sin(theta_arr), numpy.cos(theta_arr))
+        self.__cache_wave_table(key, wave_table)
+        return wave_table
+
+    def __cache_wave_table(self, key, wave_table):
+        '''
+        ウェーブテーブルをキャッシュする
+        上限を超えた分は最も長く参照されていないものから破棄する
+
+        Args:
+            key:            (周波数, サンプルレート)
+            wave_table:     (sinのウェーブテーブル, cosのウェーブテーブル)のtuple
+        '''
+        nbytes = wave_table[0].nbytes + wave_table[1].nbytes
+        if nbytes > SineWave.__max_cache_bytes:
+            return
+
+        with SineWave.__cache_lock:
+            if key in SineWave.__wave_table_dict:
+                return
+            SineWave.__wave_table_dict[key] = wave_table
+            SineWave.__cache_bytes += nbytes
+            while SineWave.__cache_bytes > SineWave.__max_cache_bytes:
+                _, (sin_arr, cos_arr) = SineWave.__wave_table_dict.popitem(last=False)
+                SineWave.__cache_bytes -= sin_arr.nbytes + cos_arr.nbytes
@@ -2,6 +2,7 @@
 from abc import ABCMeta, abstractmethod, abstractproperty
 import numpy as np
 import warnings
+from pyqlearning.annealingmodel.trace_recorder import TraceRecorder
 
 
 class AnnealingModel(metaclass=ABCMeta):
@@ -64,6 +65,9 @@ class AnnealingModel(metaclass=ABCMeta):
     # The `np.ndarray` of computed cost.
     __computed_cost_arr = None
 
+    # Recorder of the log of predicted score.
+    __trace_recorder = None
+
     def fit_dist_mat(self, dist_mat_arr):
         '''
         Fit ovserved data points.
@@ -146,6 +150,27 @@ class AnnealingModel(metaclass=ABCMeta):
     
     computed_cost_arr = property(get_computed_cost_arr, set_computed_cost_arr)
 
+    def get_trace_recorder(self):
+        '''
+        getter
+
+        `TraceRecorder` of the log of predicted score,
+        which is exported to `predicted_log_arr` after annealing.
+        By default, all trials are recorded in memory.
+        '''
+        if self.__trace_recorder is None:
+            self.__trace_recorder = TraceRecorder()
+        return self.__trace_recorder
+
+    def set_trace_recorder(self, value):
+        ''' setter '''
+        if isinstance(value, TraceRecorder):
+            self.__trace_recorder = value
+        else:
+            raise TypeError()
+
+    trace_recorder = property(get_trace_recorder, set_trace_recorder)
+
 
 #########################################################################################################    
 # Removed in future version.
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+import numpy as np
 
 
 class CostFunctionable(metaclass=ABCMeta):
@@ -31,3 +32,17 @@ class CostFunctionable(metaclass=ABCMeta):
             Cost.
         '''
         raise NotImplementedError()
+
+    def compute_batch(self, x_arr):
+        '''
+        Compute costs of many vars at once.
+
+        This method can be overrided to vectorize the computation.
+
+        Args:
+            x_arr:    `np.ndarray` of vars. The shape is (the number of vars, ...).
+
+        Returns:
+            `np.ndarray` of costs.
+        '''
+        return np.array([self.compute(x) for x in x_arr])
@@ -49,10 +49,10 @@ class GreedyQLearningCost(CostFunctionable):
             q_learning.learn(state_key=self.__init_state_key, limit=int(x[2]))
         else:
             q_learning.learn(limit=x[2])
-        q_sum = q_learning.q_df.q_value.sum()
+        q_sum = q_learning.q_store.q_value_arr.sum()
         if q_sum != 0:
-            cost = q_learning.q_df.shape[0] / q_sum
+            cost = len(q_learning.q_store) / q_sum
         else:
-            cost = q_learning.q_df.shape[0] / 1e-4
+            cost = len(q_learning.q_store) / 1e-4
 
         return cost
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from abc import ABCMeta, abstractmethod
+import numpy as np
 
 
 class DistanceComputable(metaclass=ABCMeta):
@@ -24,3 +25,24 @@ class DistanceComputable(metaclass=ABCMeta):
             Distance.
         '''
         raise NotImplementedError()
+
+    def compute_dist_mat(self, point_num, dist_mat_arr=None):
+        '''
+        Compute distances of all pairs of points.
+
+        This method can be overrided to vectorize the computation.
+
+        Args:
+            point_num:      The number of points.
+            dist_mat_arr:   `np.ndarray` or `np.memmap` to be filled.
+                            The shape is (`point_num`, `point_num`).
+                            If `None`, a new `np.ndarray` is allocated.
+
+        Returns:
+            `np.ndarray` of distances. The shape is (`point_num`, `point_num`).
+        '''
+        if dist_mat_arr is None:
+            dist_mat_arr = np.zeros((point_num, point_num))
+        for x in range(point_num):
+            dist_mat_arr[x] = [self.compute(x, y) for y in range(point_num)]
+        return dist_mat_arr
@@ -52,6 +52,34 @@ class CostAsDistance(DistanceComputable):
 
         return abs(x_v - y_v)
 
+    def compute_dist_mat(self, point_num, dist_mat_arr=None):
+        '''
+        Compute distances of all pairs of points.
+
+        Override.
+
+        The cost of each point is computed only once.
+
+        Args:
+            point_num:      The number of points.
+            dist_mat_arr:   `np.ndarray` or `np.memmap` to be filled.
+                            The shape is (`point_num`, `point_num`).
+                            If `None`, a new `np.ndarray` is allocated.
+
+        Returns:
+            `np.ndarray` of distances. The shape is (`point_num`, `point_num`).
+        '''
+        for x in range(point_num):
+            if x not in self.__memo_dict:
+                self.__memo_dict.setdefault(x, self.__cost_functionable.compute(self.__params_arr[x, :]))
+        v_arr = np.array([self.__memo_dict[x] for x in range(point_num)], dtype=np.float64)
+
+        if dist_mat_arr is None:
+            dist_mat_arr = np.zeros((point_num, point_num))
+        for x in range(point_num):
+            dist_mat_arr[x] = np.abs(v_arr[x] - v_arr)
+        return dist_mat_arr
+
     def get_memo_dict(self):
         """ getter """
         return self.__memo_dict
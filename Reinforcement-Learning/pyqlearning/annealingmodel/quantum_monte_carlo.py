@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
+import os
 from pyqlearning.annealing_model import AnnealingModel
 from pyqlearning.annealingmodel.distance_computable import DistanceComputable
 
@@ -47,7 +48,10 @@ class QuantumMonteCarlo(AnnealingModel):
         mc_step=None,
         point_num=None,
         spin_arr=None,
-        tolerance_diff_e=None
+        tolerance_diff_e=None,
+        dist_mat_arr=None,
+        dist_mat_path=None,
+        sweep_mode=False
     ):
         '''
         Init.
@@ -64,6 +68,16 @@ class QuantumMonteCarlo(AnnealingModel):
             tolerance_diff_e:            Tolerance for the optimization.
                                          When the ΔE is not improving by at least `tolerance_diff_e`
                                          for two consecutive iterations, annealing will stops.
+            dist_mat_arr:                `np.ndarray` of distances of all pairs of points.
+                                         The shape is (`point_num`, `point_num`).
+                                         If `None`, this is computed once by 
+                                         `DistanceComputable.compute_dist_mat` before annealing.
+            dist_mat_path:               The path of `.npy` file to memory-map the distances.
+                                         If the file exists, it is loaded read-only.
+                                         Otherwise, the distances are computed and saved to it.
+                                         If `None`, the distances are kept in memory.
+            sweep_mode:                  If `True`, each Monte Carlo step is a sweep
+                                         which proposes moves for all Trotter replicas at once.
 
         '''
         if isinstance(distance_computable, DistanceComputable):
@@ -76,6 +90,12 @@ class QuantumMonteCarlo(AnnealingModel):
         self.__gammma = gammma
         self.__fractional_reduction = fractional_reduction
         self.__tolerance_diff_e = tolerance_diff_e
+        if dist_mat_arr is not None and isinstance(dist_mat_arr, np.ndarray) is False:
+            raise TypeError("The type of `dist_mat_arr` must be `np.ndarray`.")
+        self.__dist_mat_arr = dist_mat_arr
+        self.__dist_mat_path = dist_mat_path
+        self.__sweep_mode = sweep_mode
+        self.__delta_e_arr = np.zeros(0)
         
         if spin_arr is not None:
             if isinstance(spin_arr, np.ndarray):
@@ -113,77 +133,174 @@ class QuantumMonteCarlo(AnnealingModel):
         '''
         Annealing.
         '''
-        self.__predicted_log_list = []
+        self.__setup_dist_mat()
+        self.trace_recorder.reset(column_n=8)
+        self.__delta_e_arr = np.zeros(0)
+
+        if self.__sweep_mode is True:
+            sweep_n = max(1, int(np.ceil(self.__mc_step / self.__trotter_dimention)))
         for cycle in range(self.__cycles_num):
-            for mc_step in range(self.__mc_step):
-                self.__move()
+            if self.__sweep_mode is True:
+                for _ in range(sweep_n):
+                    self.sweep()
+            else:
+                for mc_step in range(self.__mc_step):
+                    self.__move()
             self.__gammma *= self.__fractional_reduction
 
-            if isinstance(self.__tolerance_diff_e, float) and len(self.__predicted_log_list) > 1:
-                diff = abs(self.__predicted_log_list[-1][5] - self.__predicted_log_list[-2][5])
+            if isinstance(self.__tolerance_diff_e, float) and self.__delta_e_arr.shape[0] > 1:
+                diff = abs(self.__delta_e_arr[-1] - self.__delta_e_arr[-2])
                 if diff < self.__tolerance_diff_e:
                     break
 
-        self.predicted_log_arr = np.array(self.__predicted_log_list)
+        self.predicted_log_arr = self.trace_recorder.to_arr()
+
+    def __setup_dist_mat(self):
+        '''
+        Compute distances of all pairs of points once.
+        '''
+        if self.__dist_mat_arr is not None:
+            return
+
+        if self.__dist_mat_path is None:
+            self.__dist_mat_arr = self.__distance_computable.compute_dist_mat(self.__point_num)
+        elif os.path.exists(self.__dist_mat_path):
+            self.__dist_mat_arr = np.load(self.__dist_mat_path, mmap_mode="r")
+        else:
+            dist_mat_arr = np.lib.format.open_memmap(
+                self.__dist_mat_path,
+                mode="w+",
+                dtype=np.float64,
+                shape=(self.__point_num, self.__point_num)
+            )
+            self.__distance_computable.compute_dist_mat(self.__point_num, dist_mat_arr)
+            dist_mat_arr.flush()
+            self.__dist_mat_arr = dist_mat_arr
+
+        if self.__dist_mat_arr.shape != (self.__point_num, self.__point_num):
+            raise ValueError("The shape of distance matrix must be (`point_num`, `point_num`).")
+
+    def sweep(self):
+        '''
+        Propose and accept moves for all Trotter replicas at once.
 
-    def __move(self):
+        Because ΔE of a replica depends on the adjacent replicas,
+        the even and odd replicas are updated alternately.
+        '''
+        self.__setup_dist_mat()
+
+        torotter_arr = np.arange(self.__trotter_dimention)
+        group_list = [torotter_arr[0::2], torotter_arr[1::2]]
+        if self.__trotter_dimention % 2 == 1 and self.__trotter_dimention > 1:
+            group_list = [torotter_arr[0:-1:2], torotter_arr[1::2], torotter_arr[-1:]]
+
+        for torotter_arr in group_list:
+            if torotter_arr.shape[0]:
+                self.__move(torotter_arr)
+
+    def __move(self, torotter_arr=None):
+        '''
+        Propose and accept moves.
+
+        Args:
+            torotter_arr:   `np.ndarray` of Trotter replicas which are not adjacent to each other.
+                            If `None`, one replica is chosen at random.
+        '''
         # Choice torotter.
-        torotter = np.random.randint(self.__trotter_dimention)
-        
+        if torotter_arr is None:
+            torotter_arr = np.array([np.random.randint(self.__trotter_dimention)])
+        batch_size = torotter_arr.shape[0]
+
         # Choice times.
-        time_arr = np.arange(self.__mc_step)
-        np.random.shuffle(time_arr)
-        pre_time, post_time = (time_arr[0], time_arr[1])
-        
+        pre_time_arr = np.random.randint(self.__mc_step, size=batch_size)
+        post_time_arr = (pre_time_arr + np.random.randint(1, self.__mc_step, size=batch_size)) % self.__mc_step
+
         # Decide point.
-        pre_point = self.__spin_arr[torotter, pre_time].argmax()
-        post_point = self.__spin_arr[torotter, post_time].argmax()
+        pre_point_arr = self.__spin_arr[torotter_arr, pre_time_arr].argmax(axis=1)
+        post_point_arr = self.__spin_arr[torotter_arr, post_time_arr].argmax(axis=1)
 
-        # ΔE
-        delta_e_arr = np.array([0] * 5)
-        for point in range(self.__point_num):
-            dist_pre_point = self.__distance_computable.compute(pre_point, point)
-            dist_post_point = self.__distance_computable.compute(post_point, point)
-            delta_e_arr[0] += 2 * (-dist_pre_point * self.__spin_arr[torotter][pre_time][pre_point] - dist_post_point * self.__spin_arr[torotter][pre_time][post_point]) * (self.__spin_arr[torotter][pre_time - 1][point] + self.__spin_arr[torotter][(pre_time + 1) % self.__mc_step][point])
-            delta_e_arr[0] += 2 + (-dist_pre_point * self.__spin_arr[torotter][pre_time][post_point] - dist_post_point * self.__spin_arr[torotter][post_time][post_point]) * (self.__spin_arr[torotter][post_time - 1][point] + self.__spin_arr[torotter][(post_time + 1) % self.__mc_step][point])
+        delta_e_arr = self.__compute_delta_e(
+            torotter_arr,
+            pre_time_arr,
+            post_time_arr,
+            pre_point_arr,
+            post_point_arr
+        )
 
-        annealing_e = (1 / self.__inverse_temperature_beta) * np.log(np.cosh(self.__inverse_temperature_beta * self.__gammma / self.__trotter_dimention) / np.sinh(self.__inverse_temperature_beta * self.__gammma / self.__trotter_dimention))
+        # Flip or not.
+        prob = np.exp(-self.__inverse_temperature_beta * self.__gammma)
+        flip_arr = (delta_e_arr <= 0) | (np.random.binomial(1, prob, size=batch_size) == 1)
+        prob_arr = np.where(delta_e_arr <= 0, 0.0, prob)
 
-        delta_e_arr[1] = self.__spin_arr[torotter][pre_time][pre_point] * (self.__spin_arr[(torotter - 1) % self.__trotter_dimention][pre_time][pre_point] + self.__spin_arr[(torotter + 1) % self.__trotter_dimention][pre_time][pre_point])
-        delta_e_arr[2] = self.__spin_arr[torotter][pre_time][post_time] * (self.__spin_arr[(torotter - 1) % self.__trotter_dimention][pre_time][post_point] + self.__spin_arr[(torotter + 1) % self.__trotter_dimention][pre_time][post_point])
-        delta_e_arr[3] = self.__spin_arr[torotter][post_time][pre_point] * (self.__spin_arr[(torotter - 1) % self.__trotter_dimention][post_time][pre_point] + self.__spin_arr[(torotter + 1) % self.__trotter_dimention][post_time][pre_point])
-        delta_e_arr[4] = self.__spin_arr[torotter][post_time][post_point] * (self.__spin_arr[(torotter - 1) % self.__trotter_dimention][post_time][post_point] + self.__spin_arr[(torotter + 1) % self.__trotter_dimention][post_time][post_point])
+        t_arr, pre_arr, post_arr = torotter_arr[flip_arr], pre_time_arr[flip_arr], post_time_arr[flip_arr]
+        self.__spin_arr[t_arr, pre_arr, pre_point_arr[flip_arr]] *= -1
+        self.__spin_arr[t_arr, pre_arr, post_point_arr[flip_arr]] *= -1
+        self.__spin_arr[t_arr, post_arr, pre_point_arr[flip_arr]] *= -1
+        self.__spin_arr[t_arr, post_arr, post_point_arr[flip_arr]] *= -1
 
-        delta_e = delta_e_arr[0] / self.__trotter_dimention + annealing_e * delta_e_arr[1:].sum()
+        # ΔE in the last two moves.
+        self.__delta_e_arr = np.r_[self.__delta_e_arr, delta_e_arr][-2:]
+        self.trace_recorder.record_batch(
+            np.column_stack([
+                torotter_arr,
+                pre_time_arr,
+                post_time_arr,
+                pre_point_arr,
+                post_point_arr,
+                delta_e_arr,
+                prob_arr,
+                flip_arr
+            ])
+        )
 
-        # Flip or not.
-        flip_flag = False
-        prob = 0.0
-        if delta_e <= 0:
-            flip_flag = True
-        else:
-            prob = np.exp(-self.__inverse_temperature_beta * self.__gammma)
-            if np.random.binomial(1, prob) == 1:
-                flip_flag = True
-
-        if flip_flag is True:
-            self.__spin_arr[torotter][pre_time][pre_point] *= -1
-            self.__spin_arr[torotter][pre_time][post_point] *= -1
-            self.__spin_arr[torotter][post_time][pre_point] *= -1
-            self.__spin_arr[torotter][post_time][post_point] *= -1
-
-        self.__predicted_log_list.append(
-            (
-                torotter,
-                pre_time,
-                post_time,
-                pre_point,
-                post_point,
-                delta_e,
-                prob,
-                flip_flag
+    def __compute_delta_e(self, torotter_arr, pre_time_arr, post_time_arr, pre_point_arr, post_point_arr):
+        '''
+        Compute ΔE of moves in Trotter replicas.
+
+        Args:
+            torotter_arr:       `np.ndarray` of Trotter replicas.
+            pre_time_arr:       `np.ndarray` of times.
+            post_time_arr:      `np.ndarray` of times.
+            pre_point_arr:      `np.ndarray` of points.
+            post_point_arr:     `np.ndarray` of points.
+
+        Returns:
+            `np.ndarray` of ΔE.
+        '''
+        spin_arr = self.__spin_arr
+        dist_pre_point_arr = self.__dist_mat_arr[pre_point_arr]
+        dist_post_point_arr = self.__dist_mat_arr[post_point_arr]
+
+        pre_pre_arr = spin_arr[torotter_arr, pre_time_arr, pre_point_arr][:, None]
+        pre_post_arr = spin_arr[torotter_arr, pre_time_arr, post_point_arr][:, None]
+        post_post_arr = spin_arr[torotter_arr, post_time_arr, post_point_arr][:, None]
+
+        pre_neighbor_arr = spin_arr[torotter_arr, pre_time_arr - 1] + spin_arr[torotter_arr, (pre_time_arr + 1) % self.__mc_step]
+        post_neighbor_arr = spin_arr[torotter_arr, post_time_arr - 1] + spin_arr[torotter_arr, (post_time_arr + 1) % self.__mc_step]
+
+        delta_e_arr = (
+            2 * (-dist_pre_point_arr * pre_pre_arr - dist_post_point_arr * pre_post_arr) * pre_neighbor_arr
+        ).sum(axis=1)
+        delta_e_arr += 2 * self.__point_num + (
+            (-dist_pre_point_arr * pre_post_arr - dist_post_point_arr * post_post_arr) * post_neighbor_arr
+        ).sum(axis=1)
+
+        annealing_e = (1 / self.__inverse_temperature_beta) * np.log(np.cosh(self.__inverse_temperature_beta * self.__gammma / self.__trotter_dimention) / np.sinh(self.__inverse_temperature_beta * self.__gammma / self.__trotter_dimention))
+
+        pre_torotter_arr = (torotter_arr - 1) % self.__trotter_dimention
+        post_torotter_arr = (torotter_arr + 1) % self.__trotter_dimention
+        trotter_e_arr = np.zeros(torotter_arr.shape[0])
+        for time_arr, point_arr in (
+            (pre_time_arr, pre_point_arr),
+            (pre_time_arr, post_point_arr),
+            (post_time_arr, pre_point_arr),
+            (post_time_arr, post_point_arr)
+        ):
+            trotter_e_arr += spin_arr[torotter_arr, time_arr, point_arr] * (
+                spin_arr[pre_torotter_arr, time_arr, point_arr] + spin_arr[post_torotter_arr, time_arr, point_arr]
             )
-        )
+
+        return delta_e_arr / self.__trotter_dimention + annealing_e * trotter_e_arr
 
     def get_spin_arr(self):
         ''' getter '''
@@ -141,10 +141,13 @@ class SimulatedAnnealing(AnnealingModel):
         t = self.__init_temp
         delta_e_avg = 0.0
         pos_log_list = [current_pos]
-        predicted_log_list = []
+        trace_recorder = self.trace_recorder
+        trace_recorder.reset(column_n=5)
+        # The averages of ΔE in the last two trials.
+        delta_e_avg_list = []
         for i in range(self.__cycles_num):
-            if isinstance(self.__tolerance_diff_e, float) and len(predicted_log_list) > 1:
-                diff = abs(predicted_log_list[-1][2] - predicted_log_list[-2][2])
+            if isinstance(self.__tolerance_diff_e, float) and len(delta_e_avg_list) > 1:
+                diff = abs(delta_e_avg_list[-1] - delta_e_avg_list[-2])
                 if diff < self.__tolerance_diff_e:
                     break
 
@@ -176,10 +179,11 @@ class SimulatedAnnealing(AnnealingModel):
                     current_cost_arr = cost_arr
                     self.__accepted_sol_num = self.__accepted_sol_num + 1.0
                     delta_e_avg = (delta_e_avg * (self.__accepted_sol_num - 1.0) +  delta_e) / self.__accepted_sol_num
-                predicted_log_list.append((cost_arr , delta_e, delta_e_avg, p, int(accept)))
+                trace_recorder.record(cost_arr, delta_e, delta_e_avg, p, int(accept))
+                delta_e_avg_list = delta_e_avg_list[-1:] + [delta_e_avg]
 
             self.var_log_arr[i + 1] = current_var_arr
             self.computed_cost_arr[i + 1] = current_cost_arr
             t = t * self.__fractional_reduction
 
-        self.predicted_log_arr = np.array(predicted_log_list)
+        self.predicted_log_arr = trace_recorder.to_arr()
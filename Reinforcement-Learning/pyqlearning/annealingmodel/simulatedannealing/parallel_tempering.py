@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from pyqlearning.annealingmodel.simulated_annealing import SimulatedAnnealing
+
+# is-a `CostFunctionable` in the worker process.
+_worker_cost_functionable = None
+
+
+def _init_worker(cost_functionable):
+    '''
+    Initialize the worker process.
+
+    Args:
+        cost_functionable:    is-a `CostFunctionable`.
+    '''
+    global _worker_cost_functionable
+    _worker_cost_functionable = cost_functionable
+
+
+def _compute_batch(x_arr):
+    '''
+    Compute costs in the worker process.
+
+    Args:
+        x_arr:    `np.ndarray` of vars.
+
+    Returns:
+        `np.ndarray` of costs.
+    '''
+    return _worker_cost_functionable.compute_batch(x_arr)
+
+
+class ParallelTempering(SimulatedAnnealing):
+    '''
+    Parallel Tempering, also known as replica exchange Monte Carlo.
+
+    This model runs the chains of Simulated Annealing at different
+    temperatures in lockstep. The temperatures are geometrically spaced
+    from the initial temperature to the final temperature. In each trial,
+    the costs of candidates of all chains are computed at once by
+    `CostFunctionable.compute_batch`, optionally spread over a `ProcessPoolExecutor`.
+    At intervals, the adjacent chains exchange their positions according to
+    the Metropolis criterion, so that the colder chains can escape from local minima.
+
+    `var_log_arr` and `computed_cost_arr` record the chain with the lowest cost in each cycle.
+    Each row of `predicted_log_arr` is
+    (the index of chain, cost, ΔE, average of ΔE, probability, accepted or not).
+
+    References:
+        - Du, K. L., & Swamy, M. N. S. (2016). Search and optimization by metaheuristics. New York City: Springer.
+        - Earl, D. J., & Deem, M. W. (2005). Parallel tempering: Theory, applications, and new perspectives. Physical Chemistry Chemical Physics, 7(23), 3910-3916.
+        - Swendsen, R. H., & Wang, J. S. (1986). Replica Monte Carlo simulation of spin-glasses. Physical review letters, 57(21), 2607.
+    '''
+
+    def __init__(
+        self,
+        cost_functionable,
+        cycles_num=200,
+        trials_per_cycle=50,
+        accepted_sol_num=0.0,
+        init_prob=0.7,
+        final_prob=0.001,
+        start_pos=0,
+        move_range=3,
+        tolerance_diff_e=None,
+        chain_n=8,
+        exchange_interval=None,
+        max_workers=1
+    ):
+        '''
+        Initialize.
+
+        Args:
+            cost_functionalbe:    The object of `CostFunctionable`.
+            cycles_num:           The number of annealing cycles.
+            trials_per_cycles:    The number of traials per the cycles.
+            accepted_sol_num:     The number of acceptance solution.
+            init_prob:            Probability of accepting worse solution in the hottest chain.
+            final_prob:           Probability of accepting worse solution in the coldest chain.
+            start_pos:            The first searched position.
+            move_range:           The range of moving in the feature map.
+            tolerance_diff_e:     Tolerance for the optimization.
+                                  When the lowest cost is not improving by at least `tolerance_diff_e`
+                                  for two consecutive cycles, annealing will stops.
+            chain_n:              The number of chains.
+            exchange_interval:    The number of trials between replica exchanges.
+                                  If `None`, this value is equivalent to `trials_per_cycle`.
+            max_workers:          The number of worker processes.
+                                  If this value is `1`, the costs are computed in this process.
+
+        '''
+        super().__init__(
+            cost_functionable=cost_functionable,
+            cycles_num=cycles_num,
+            trials_per_cycle=trials_per_cycle,
+            accepted_sol_num=accepted_sol_num,
+            init_prob=init_prob,
+            final_prob=final_prob,
+            start_pos=start_pos,
+            move_range=move_range,
+            tolerance_diff_e=tolerance_diff_e
+        )
+        if isinstance(chain_n, int) is False:
+            raise TypeError("The type of `chain_n` must be int.")
+        if chain_n < 2:
+            raise ValueError("The value of `chain_n` must be greater than 1.")
+        if exchange_interval is None:
+            exchange_interval = trials_per_cycle
+        if isinstance(exchange_interval, int) is False:
+            raise TypeError("The type of `exchange_interval` must be int.")
+        if isinstance(max_workers, int) is False:
+            raise TypeError("The type of `max_workers` must be int.")
+
+        self.__cost_functionable = cost_functionable
+        self.__cycles_num = cycles_num
+        self.__trials_per_cycle = trials_per_cycle
+        self.__accepted_sol_num = accepted_sol_num + 1.0
+        self.__start_pos = start_pos
+        self.__tolerance_diff_e = tolerance_diff_e
+        if move_range is not None and move_range <= 1:
+            move_range = 2
+        self.__move_range = move_range
+        self.__chain_n = chain_n
+        self.__exchange_interval = exchange_interval
+        self.__max_workers = max_workers
+
+        init_temp = -1.0/np.log(init_prob)
+        final_temp = -1.0/np.log(final_prob)
+        # The temperatures of chains, from the hottest to the coldest.
+        self.__temperature_arr = init_temp * (final_temp / init_temp) ** (np.arange(chain_n) / (chain_n - 1.0))
+
+    def __move(self, pos_arr):
+        '''
+        Move in the feature map.
+
+        Args:
+            pos_arr:    `np.ndarray` of the now positions of chains.
+
+        Returns:
+            `np.ndarray` of the next positions of chains.
+        '''
+        if self.__move_range is not None:
+            next_pos_arr = np.random.randint(pos_arr - self.__move_range, pos_arr + self.__move_range)
+            return np.clip(next_pos_arr, 0, self.var_arr.shape[0] - 1)
+        else:
+            return np.random.randint(self.var_arr.shape[0] - 1, size=pos_arr.shape[0])
+
+    def __compute_batch(self, x_arr, executor):
+        '''
+        Compute costs of candidates of all chains.
+
+        Args:
+            x_arr:      `np.ndarray` of vars.
+            executor:   `ProcessPoolExecutor` or `None`.
+
+        Returns:
+            `np.ndarray` of costs.
+        '''
+        if executor is None:
+            return np.asarray(self.__cost_functionable.compute_batch(x_arr), dtype=np.float64)
+
+        chunk_list = np.array_split(x_arr, min(self.__max_workers, x_arr.shape[0]))
+        return np.concatenate(
+            [np.asarray(cost_arr, dtype=np.float64) for cost_arr in executor.map(_compute_batch, chunk_list)]
+        )
+
+    def __exchange(self, pos_arr, cost_arr, delta_e_avg_arr, offset):
+        '''
+        Exchange the positions of adjacent chains.
+
+        Args:
+            pos_arr:            `np.ndarray` of the positions of chains.
+            cost_arr:           `np.ndarray` of the costs of chains.
+            delta_e_avg_arr:    `np.ndarray` of the average of ΔE of chains.
+            offset:             `0` or `1`. The first chain of pairs.
+        '''
+        scale = delta_e_avg_arr.mean()
+        if scale <= 0.0:
+            return
+
+        beta_arr = 1.0 / (scale * self.__temperature_arr)
+        i_arr = np.arange(offset, self.__chain_n - 1, 2)
+        j_arr = i_arr + 1
+        log_p_arr = (beta_arr[i_arr] - beta_arr[j_arr]) * (cost_arr[i_arr] - cost_arr[j_arr])
+        swap_arr = np.log(np.random.random(i_arr.shape[0])) < np.minimum(log_p_arr, 0.0)
+        i_arr, j_arr = i_arr[swap_arr], j_arr[swap_arr]
+        pos_arr[i_arr], pos_arr[j_arr] = pos_arr[j_arr], pos_arr[i_arr].copy()
+        cost_arr[i_arr], cost_arr[j_arr] = cost_arr[j_arr], cost_arr[i_arr].copy()
+
+    def annealing(self):
+        '''
+        Annealing.
+        '''
+        executor = None
+        if self.__max_workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self.__max_workers,
+                initializer=_init_worker,
+                initargs=(self.__cost_functionable, )
+            )
+        try:
+            self.__annealing(executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def __annealing(self, executor):
+        shape_list = list(self.var_arr.shape)
+        shape_list[0] = self.__cycles_num + 1
+        self.var_log_arr = np.zeros(tuple(shape_list))
+
+        pos_arr = np.array([self.__start_pos] * self.__chain_n)
+        current_cost_arr = np.repeat(
+            self.__compute_batch(self.var_arr[self.__start_pos:self.__start_pos+1], executor),
+            self.__chain_n
+        )
+
+        self.computed_cost_arr = np.zeros(self.__cycles_num + 1)
+        self.var_log_arr[0] = self.var_arr[self.__start_pos]
+        self.computed_cost_arr[0] = current_cost_arr[0]
+
+        delta_e_avg_arr = np.zeros(self.__chain_n)
+        accepted_sol_num_arr = np.repeat(self.__accepted_sol_num, self.__chain_n)
+        chain_arr = np.arange(self.__chain_n)
+        trace_recorder = self.trace_recorder
+        trace_recorder.reset(column_n=6)
+        trial = 0
+        for i in range(self.__cycles_num):
+            if isinstance(self.__tolerance_diff_e, float) and i > 1:
+                diff = abs(self.computed_cost_arr[i] - self.computed_cost_arr[i - 1])
+                if diff < self.__tolerance_diff_e:
+                    break
+
+            for j in range(self.__trials_per_cycle):
+                next_pos_arr = self.__move(pos_arr)
+                cost_arr = self.__compute_batch(self.var_arr[next_pos_arr], executor)
+                delta_e_arr = np.abs(cost_arr - current_cost_arr)
+
+                if i == 0 and j == 0:
+                    delta_e_avg_arr = delta_e_arr.copy()
+
+                worse_arr = cost_arr > current_cost_arr
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    p_arr = np.exp(-delta_e_arr / (delta_e_avg_arr * self.__temperature_arr))
+                p_arr = np.where(worse_arr, np.nan_to_num(p_arr), 0.0)
+                accept_arr = ~worse_arr | (np.random.random(self.__chain_n) < p_arr)
+
+                pos_arr = np.where(accept_arr, next_pos_arr, pos_arr)
+                current_cost_arr = np.where(accept_arr, cost_arr, current_cost_arr)
+                accepted_sol_num_arr = accepted_sol_num_arr + accept_arr
+                delta_e_avg_arr = np.where(
+                    accept_arr,
+                    (delta_e_avg_arr * (accepted_sol_num_arr - 1.0) + delta_e_arr) / accepted_sol_num_arr,
+                    delta_e_avg_arr
+                )
+                trace_recorder.record_batch(
+                    np.column_stack([chain_arr, cost_arr, delta_e_arr, delta_e_avg_arr, p_arr, accept_arr])
+                )
+
+                trial += 1
+                if trial % self.__exchange_interval == 0:
+                    self.__exchange(
+                        pos_arr,
+                        current_cost_arr,
+                        delta_e_avg_arr,
+                        (trial // self.__exchange_interval) % 2
+                    )
+
+            best_chain = current_cost_arr.argmin()
+            self.var_log_arr[i + 1] = self.var_arr[pos_arr[best_chain]]
+            self.computed_cost_arr[i + 1] = current_cost_arr[best_chain]
+
+        self.predicted_log_arr = trace_recorder.to_arr()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+
+
+class TraceRecorder(object):
+    '''
+    Recorder of the logs of trials in annealing.
+
+    The rows are written to preallocated chunks of `np.ndarray` of float64,
+    instead of appending a tuple per trial to a `list`, and the memory can be
+    bounded by sampling rows at a stride and by the maximum number of rows.
+    '''
+
+    def __init__(
+        self,
+        stride=1,
+        max_row_n=None,
+        memmap_path=None,
+        chunk_size=65536,
+        trace_flag=True
+    ):
+        '''
+        Init.
+
+        Args:
+            stride:         Every `stride`-th row is recorded.
+            max_row_n:      The maximum number of recorded rows.
+                            When the buffer is full, the oldest rows are overwritten.
+                            If `None`, the number of rows is not limited.
+            memmap_path:    The path of `.npy` file to memory-map the buffer.
+                            This option requires `max_row_n`.
+                            If `None`, the buffer is kept in memory.
+            chunk_size:     The number of rows in each chunk, if `max_row_n` is `None`.
+            trace_flag:     If `False`, no rows are recorded.
+
+        '''
+        if isinstance(stride, int) is False:
+            raise TypeError("The type of `stride` must be int.")
+        if stride <= 0:
+            raise ValueError("The value of `stride` must be greater than 0.")
+        if max_row_n is not None:
+            if isinstance(max_row_n, int) is False:
+                raise TypeError("The type of `max_row_n` must be int.")
+            if max_row_n <= 0:
+                raise ValueError("The value of `max_row_n` must be greater than 0.")
+        if memmap_path is not None and max_row_n is None:
+            raise ValueError("`memmap_path` requires `max_row_n`.")
+        if isinstance(chunk_size, int) is False:
+            raise TypeError("The type of `chunk_size` must be int.")
+        if chunk_size <= 0:
+            raise ValueError("The value of `chunk_size` must be greater than 0.")
+
+        self.__stride = stride
+        self.__max_row_n = max_row_n
+        self.__memmap_path = memmap_path
+        self.__chunk_size = chunk_size
+        self.__trace_flag = trace_flag
+        self.reset(column_n=0)
+
+    def reset(self, column_n):
+        '''
+        Remove all recorded rows and set the number of columns.
+
+        Args:
+            column_n:   The number of columns.
+        '''
+        self.__column_n = column_n
+        # The number of rows passed to this recorder.
+        self.__trial_n = 0
+        # The number of recorded rows.
+        self.__row_n = 0
+        self.__chunk_list = []
+        self.__buffer_arr = None
+        if self.__trace_flag is True and self.__max_row_n is not None and column_n > 0:
+            if self.__memmap_path is not None:
+                self.__buffer_arr = np.lib.format.open_memmap(
+                    self.__memmap_path,
+                    mode="w+",
+                    dtype=np.float64,
+                    shape=(self.__max_row_n, column_n)
+                )
+            else:
+                self.__buffer_arr = np.zeros((self.__max_row_n, column_n), dtype=np.float64)
+
+    def record(self, *values):
+        '''
+        Record one row.
+
+        Args:
+            values:     The values of columns.
+        '''
+        self.__trial_n += 1
+        if self.__trace_flag is False or (self.__trial_n - 1) % self.__stride != 0:
+            return
+        self.__write(np.array(values, dtype=np.float64)[None, :])
+
+    def record_batch(self, row_arr):
+        '''
+        Record many rows at once.
+
+        Args:
+            row_arr:    `np.ndarray` of rows. The shape is (the number of rows, the number of columns).
+        '''
+        offset = (-self.__trial_n) % self.__stride
+        self.__trial_n += row_arr.shape[0]
+        if self.__trace_flag is False:
+            return
+        row_arr = row_arr[offset::self.__stride]
+        if row_arr.shape[0]:
+            self.__write(np.asarray(row_arr, dtype=np.float64))
+
+    def __write(self, row_arr):
+        if self.__buffer_arr is not None:
+            if row_arr.shape[0] > self.__max_row_n:
+                skip_n = row_arr.shape[0] - self.__max_row_n
+                row_arr = row_arr[skip_n:]
+                self.__row_n += skip_n
+            index_arr = (self.__row_n + np.arange(row_arr.shape[0])) % self.__max_row_n
+            self.__buffer_arr[index_arr] = row_arr
+            self.__row_n += row_arr.shape[0]
+            return
+
+        while row_arr.shape[0]:
+            pos = self.__row_n % self.__chunk_size
+            if pos == 0:
+                self.__chunk_list.append(np.zeros((self.__chunk_size, self.__column_n), dtype=np.float64))
+            n = min(self.__chunk_size - pos, row_arr.shape[0])
+            self.__chunk_list[-1][pos:pos+n] = row_arr[:n]
+            self.__row_n += n
+            row_arr = row_arr[n:]
+
+    def to_arr(self):
+        '''
+        Export the recorded rows in chronological order.
+
+        Returns:
+            `np.ndarray` of rows. The shape is (the number of rows, the number of columns).
+            If the buffer is memory-mapped and has not been overwritten, this is a view of it.
+        '''
+        if self.__buffer_arr is not None:
+            if self.__row_n <= self.__max_row_n:
+                return self.__buffer_arr[:self.__row_n]
+            return np.roll(self.__buffer_arr, -(self.__row_n % self.__max_row_n), axis=0)
+
+        if len(self.__chunk_list) == 0:
+            return np.zeros((0, self.__column_n), dtype=np.float64)
+        return np.concatenate(self.__chunk_list)[:self.__row_n]
+
+    def get_row_n(self):
+        ''' getter '''
+        return min(self.__row_n, self.__max_row_n) if self.__max_row_n is not None else self.__row_n
+
+    def set_readonly(self, value):
+        ''' setter '''
+        raise TypeError("This property must be read-only.")
+
+    row_n = property(get_row_n, set_readonly)
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+from pyqlearning.misc.multi_agent_q_learning import MultiAgentQLearning
+from pyqlearning.qlearning.greedy_q_learning import GreedyQLearning
+from pyqlearning.qlearning.boltzmann_q_learning import BoltzmannQLearning
+from pyqlearning.qlearning.qstorable.array_q_store import ArrayQStore
+import numpy as np
+import pandas as pd
+import copy
+
+
+class BatchedMultiAgent(MultiAgentQLearning):
+    '''
+    Multi-Agent which learn simultaneously in each tick.
+
+    All agents share one `ArrayQStore` whose keys of states are tuples of
+    the index of agent and the key of state, and the action selection and
+    TD updates are computed as vectorized operations across agents.
+    Only the callbacks of the environment, such as `extract_possible_actions`,
+    `observe_reward_value`, `update_state` and `check_the_end_flag`,
+    are called per agent.
+
+    The agents must be `GreedyQLearning` or `BoltzmannQLearning`.
+    Their hyperparameters, such as `alpha_value`, `gamma_value`, `epsilon_greedy_rate`
+    and `time_rate`, are referred per agent. After learning, the Q-Values of each agent
+    are exported to the `q_store` of the agent.
+    '''
+
+    def __init__(self, q_learning_list):
+        '''
+        Init.
+
+        Args:
+            q_learning_list:    `list` of `GreedyQLearning` or `BoltzmannQLearning`.
+        '''
+        for q_learning in q_learning_list:
+            if isinstance(q_learning, GreedyQLearning) is False and isinstance(q_learning, BoltzmannQLearning) is False:
+                raise TypeError("The type of agents must be `GreedyQLearning` or `BoltzmannQLearning`.")
+
+        super().__init__(q_learning_list)
+
+        self.__q_store = ArrayQStore()
+        for i in range(len(self.q_learning_list)):
+            q_df = self.q_learning_list[i].q_df
+            if q_df is None:
+                continue
+            for state_key, action_key, q_value in zip(
+                q_df["state_key"].values,
+                q_df["action_key"].values,
+                q_df["q_value"].values
+            ):
+                self.__q_store.save((i, state_key), action_key, float(q_value))
+
+    def get_q_store(self):
+        ''' getter '''
+        return self.__q_store
+
+    def set_q_store(self, value):
+        ''' setter '''
+        if isinstance(value, ArrayQStore) is False:
+            raise TypeError("The type of `q_store` must be `ArrayQStore`.")
+        self.__q_store = value
+
+    q_store = property(get_q_store, set_q_store)
+
+    def learn(self, initial_state_key, limit=1000, game_n=1):
+        '''
+        Multi-Agent Learning.
+
+        Override.
+
+        Args:
+            initial_state_key:  Initial state of all agents.
+            limit:              Limit of the number of learning.
+            game_n:             The number of games.
+
+        '''
+        agent_n = len(self.q_learning_list)
+        alpha_arr = np.array([q_learning.alpha_value for q_learning in self.q_learning_list])
+        gamma_arr = np.array([q_learning.gamma_value for q_learning in self.q_learning_list])
+
+        for game in range(game_n):
+            state_key_list = [copy.copy(initial_state_key) for _ in range(agent_n)]
+            end_flag_arr = np.zeros(agent_n, dtype=bool)
+            self.t = 1
+            while self.t <= limit:
+                agent_list = np.flatnonzero(~end_flag_arr).tolist()
+                if game + 1 == game_n:
+                    self.state_key_list.extend([(i, copy.copy(state_key_list[i])) for i in agent_list])
+
+                next_action_list_list = []
+                acting_list = []
+                for i in agent_list:
+                    self.q_learning_list[i].t = self.t
+                    next_action_list = self.q_learning_list[i].extract_possible_actions(state_key_list[i])
+                    if len(next_action_list):
+                        acting_list.append(i)
+                        next_action_list_list.append(next_action_list)
+
+                if len(acting_list) == 0:
+                    break
+
+                action_key_list = self.__select_actions(acting_list, state_key_list, next_action_list_list)
+
+                reward_arr = np.zeros(len(acting_list))
+                next_state_key_list = [None] * len(acting_list)
+                next_next_action_list_list = [None] * len(acting_list)
+                for k in range(len(acting_list)):
+                    i = acting_list[k]
+                    reward_arr[k] = self.q_learning_list[i].observe_reward_value(
+                        state_key_list[i],
+                        action_key_list[k]
+                    )
+                    if self.q_learning_list[i].check_the_end_flag(state_key_list[i]) is True:
+                        end_flag_arr[i] = True
+
+                    next_state_key_list[k] = self.q_learning_list[i].update_state(
+                        state_key=state_key_list[i],
+                        action_key=action_key_list[k]
+                    )
+                    next_next_action_list_list[k] = self.q_learning_list[i].extract_possible_actions(
+                        next_state_key_list[k]
+                    )
+
+                # Agents which can act in next time.
+                update_list = [k for k in range(len(acting_list)) if len(next_next_action_list_list[k])]
+                if len(update_list):
+                    update_arr = np.array(update_list)
+                    agent_arr = np.array(acting_list)[update_arr]
+                    for k in update_list:
+                        self.__setup_q(
+                            (acting_list[k], next_state_key_list[k]),
+                            next_next_action_list_list[k]
+                        )
+
+                    # Max-Q-Value in next action time.
+                    _, row_arr, start_arr, size_arr = self.__extract_segment(
+                        [(acting_list[k], next_state_key_list[k]) for k in update_list],
+                        [next_next_action_list_list[k] for k in update_list]
+                    )
+                    next_max_q_arr = np.maximum.reduceat(self.__q_store.extract_q_by_rows(row_arr), start_arr)
+
+                    # Update Q-Value.
+                    q_row_arr = np.array([
+                        self.__q_store.extract_rows(
+                            (acting_list[k], state_key_list[acting_list[k]]),
+                            [action_key_list[k]]
+                        )[1][0] for k in update_list
+                    ])
+                    q_arr = self.__q_store.extract_q_by_rows(q_row_arr)
+                    q_arr = q_arr + alpha_arr[agent_arr] * (
+                        reward_arr[update_arr] + (gamma_arr[agent_arr] * next_max_q_arr) - q_arr
+                    )
+                    self.__q_store.save_q_by_rows(q_row_arr, q_arr)
+
+                # Update State.
+                for k in range(len(acting_list)):
+                    state_key_list[acting_list[k]] = next_state_key_list[k]
+
+                # Epsode.
+                self.t += 1
+                if end_flag_arr.all():
+                    break
+
+        self.__export_q_store()
+
+    def __select_actions(self, agent_list, state_key_list, next_action_list_list):
+        '''
+        Select actions of agents at once.
+
+        Args:
+            agent_list:             `list` of the indices of agents.
+            state_key_list:         `list` of the keys of states of all agents.
+            next_action_list_list:  `list` of the possible actions for each agent in `agent_list`.
+
+        Returns:
+            `list` of the keys of actions for each agent in `agent_list`.
+        '''
+        key_list = [(i, state_key_list[i]) for i in agent_list]
+        for k in range(len(agent_list)):
+            self.__setup_q(key_list[k], next_action_list_list[k])
+
+        action_key_list_list, row_arr, start_arr, size_arr = self.__extract_segment(
+            key_list,
+            next_action_list_list
+        )
+        q_arr = self.__q_store.extract_q_by_rows(row_arr)
+        boltzmann_arr = np.array([
+            isinstance(self.q_learning_list[i], BoltzmannQLearning) for i in agent_list
+        ])
+        key_arr = np.zeros(len(agent_list), dtype=np.int64)
+
+        greedy_arr = np.flatnonzero(~boltzmann_arr)
+        if greedy_arr.shape[0]:
+            epsilon_arr = np.array([self.q_learning_list[agent_list[k]].epsilon_greedy_rate for k in greedy_arr])
+            greedy_flag_arr = np.random.random(greedy_arr.shape[0]) < epsilon_arr
+            max_arr = np.repeat(np.maximum.reduceat(q_arr, start_arr), size_arr)
+            # Ties of the maximum Q-Values, such as in the states not visited yet, are broken at random.
+            tie_arr = np.where(q_arr == max_arr, np.random.random(q_arr.shape[0]), -1.0)
+            tie_max_arr = np.repeat(np.maximum.reduceat(tie_arr, start_arr), size_arr)
+            index_arr = np.where(tie_arr == tie_max_arr, np.arange(q_arr.shape[0]), q_arr.shape[0])
+            argmax_arr = np.minimum.reduceat(index_arr, start_arr) - start_arr
+            random_arr = (np.random.random(size_arr.shape[0]) * size_arr).astype(np.int64)
+            key_arr[greedy_arr] = np.where(greedy_flag_arr, argmax_arr[greedy_arr], random_arr[greedy_arr])
+
+        boltzmann_arr = np.flatnonzero(boltzmann_arr)
+        if boltzmann_arr.shape[0]:
+            sigmoid_arr = np.array([
+                1 / np.log(self.t * self.q_learning_list[agent_list[k]].time_rate + 1.1) for k in boltzmann_arr
+            ])
+            b_q_arr = np.concatenate([
+                q_arr[start_arr[k]:start_arr[k]+size_arr[k]] for k in boltzmann_arr
+            ])
+            b_size_arr = size_arr[boltzmann_arr]
+            b_start_arr = np.r_[0, np.cumsum(b_size_arr)[:-1]]
+            x_arr = b_q_arr / np.repeat(sigmoid_arr, b_size_arr)
+            exp_arr = np.exp(x_arr - np.repeat(np.maximum.reduceat(x_arr, b_start_arr), b_size_arr))
+            cum_arr = np.cumsum(exp_arr)
+            base_arr = np.r_[0.0, cum_arr][b_start_arr]
+            target_arr = base_arr + np.random.random(b_size_arr.shape[0]) * (cum_arr[b_start_arr + b_size_arr - 1] - base_arr)
+            b_key_arr = np.searchsorted(cum_arr, target_arr, side="right")
+            key_arr[boltzmann_arr] = np.clip(b_key_arr, b_start_arr, b_start_arr + b_size_arr - 1) - b_start_arr
+
+        return [action_key_list_list[k][key_arr[k]] for k in range(len(agent_list))]
+
+    def __setup_q(self, key, action_key_list):
+        '''
+        Save the initial Q-Values of actions which have not been saved yet.
+
+        Args:
+            key:                Tuple(the index of agent, the key of state).
+            action_key_list:    `list` of the keys of actions.
+        '''
+        for action_key in action_key_list:
+            if self.__q_store.extract(key, action_key) is None:
+                self.__q_store.save(key, action_key, 0.0)
+
+    def __extract_segment(self, key_list, action_key_list_list):
+        '''
+        Extract the rows of Q-Values as one flat `np.ndarray` which is segmented by agents.
+
+        Args:
+            key_list:               `list` of tuples of the index of agent and the key of state.
+            action_key_list_list:   `list` of the keys of actions for each key.
+
+        Returns:
+            Tuple(
+                `list` of the keys of extracted actions for each key,
+                `np.ndarray` of rows,
+                `np.ndarray` of the first index of each segment,
+                `np.ndarray` of the length of each segment
+            )
+        '''
+        extracted_list = [
+            self.__q_store.extract_rows(key_list[k], action_key_list_list[k]) for k in range(len(key_list))
+        ]
+        size_arr = np.array([row_arr.shape[0] for _, row_arr in extracted_list], dtype=np.int64)
+        start_arr = np.r_[0, np.cumsum(size_arr)[:-1]].astype(np.int64)
+        row_arr = np.concatenate([row_arr for _, row_arr in extracted_list])
+        return [action_key_list for action_key_list, _ in extracted_list], row_arr, start_arr, size_arr
+
+    def __export_q_store(self):
+        '''
+        Export the Q-Values of each agent to the `q_store` of the agent.
+        '''
+        q_df = self.__q_store.to_df()
+        agent_arr = np.array([key[0] for key in q_df["state_key"].values], dtype=np.int64)
+        for i in range(len(self.q_learning_list)):
+            agent_q_df = q_df[agent_arr == i]
+            state_key_arr = np.empty(agent_q_df.shape[0], dtype=object)
+            for k, key in enumerate(agent_q_df["state_key"].values):
+                state_key_arr[k] = key[1]
+            self.q_learning_list[i].q_df = pd.DataFrame(
+                {
+                    "state_key": state_key_arr,
+                    "action_key": agent_q_df["action_key"].values,
+                    "q_value": agent_q_df["q_value"].values
+                },
+                columns=["state_key", "action_key", "q_value"]
+            )
@@ -3,6 +3,9 @@ from abc import ABCMeta, abstractmethod
 import pandas as pd
 import numpy as np
 import random
+from copy import copy
+from pyqlearning.qlearning.q_storable import QStorable
+from pyqlearning.qlearning.qstorable.array_q_store import ArrayQStore
 
 
 class QLearning(metaclass=ABCMeta):
@@ -87,15 +90,58 @@ class QLearning(metaclass=ABCMeta):
 
     gamma_value = property(get_gamma_value, set_gamma_value)
 
-    # Q(state, action)
+    # The storage of Q(state, action).
+    __q_store = None
+
+    def get_q_store(self):
+        '''
+        getter
+
+        is-a `QStorable`. By default, `ArrayQStore`.
+        '''
+        if self.__q_store is None:
+            self.__q_store = ArrayQStore()
+
+        if self.__q_df is not None:
+            # Write back `q_df` which may be updated in place,
+            # such as `self.q_df.q_value = self.q_df.q_value / self.q_df.q_value.sum()`.
+            q_df = self.__q_df
+            self.__q_df = None
+            if q_df.shape[0] == len(self.__q_store) and q_df.index.equals(pd.RangeIndex(q_df.shape[0])):
+                self.__q_store.q_value_arr = q_df["q_value"].values.astype(np.float64)
+            else:
+                self.__q_store.from_df(q_df)
+
+        return self.__q_store
+
+    def set_q_store(self, value):
+        '''
+        setter
+
+        is-a `QStorable`.
+        '''
+        if isinstance(value, QStorable) is False:
+            raise TypeError("The type of `__q_store` must be `QStorable`.")
+        self.__q_store = value
+        self.__q_df = None
+
+    q_store = property(get_q_store, set_q_store)
+
+    # Q(state, action) exported from `q_store`.
     __q_df = None
 
     def get_q_df(self):
         '''
         getter
+
+        `pd.DataFrame` exported from `q_store`.
+        It is materialised lazily and updates in place are written back to `q_store`.
         '''
-        if isinstance(self.__q_df, pd.DataFrame) is False and self.__q_df is not None:
-            raise TypeError("The type of `__q_df` must be `pd.DataFrame`.")
+        if self.__q_df is None:
+            q_store = self.q_store
+            if len(q_store) == 0:
+                return None
+            self.__q_df = q_store.to_df()
         return self.__q_df
 
     def set_q_df(self, value):
@@ -104,13 +150,18 @@ class QLearning(metaclass=ABCMeta):
         '''
         if isinstance(value, pd.DataFrame) is False and value is not None:
             raise TypeError("The type of `__q_df` must be `pd.DataFrame`.")
-        self.__q_df = value
+
+        q_store = self.q_store
+        if value is None:
+            q_store.from_df(pd.DataFrame([], columns=["state_key", "action_key", "q_value"]))
+        else:
+            q_store.from_df(value)
 
     q_df = property(get_q_df, set_q_df)
 
     def extract_q_df(self, state_key, action_key):
         '''
-        Extract Q-Value from `self.q_df`.
+        Extract Q-Value from `self.q_store`.
 
         Args:
             state_key:      The key of state.
@@ -120,23 +171,15 @@ class QLearning(metaclass=ABCMeta):
             Q-Value.
 
         '''
-        q = 0.0
-        if self.q_df is None:
-            self.save_q_df(state_key, action_key, q)
-            return q
-
-        q_df = self.q_df[self.q_df.state_key == state_key]
-        q_df = q_df[q_df.action_key == action_key]
-
-        if q_df.shape[0]:
-            q = float(q_df["q_value"])
-        else:
+        q = self.q_store.extract(state_key, action_key)
+        if q is None:
+            q = 0.0
             self.save_q_df(state_key, action_key, q)
         return q
 
     def save_q_df(self, state_key, action_key, q_value):
         '''
-        Insert or update Q-Value in `self.q_df`.
+        Insert or update Q-Value in `self.q_store`.
 
         Args:
             state_key:      State.
@@ -150,13 +193,16 @@ class QLearning(metaclass=ABCMeta):
         if isinstance(q_value, float) is False:
             raise TypeError("The type of q_value must be float.")
 
-        new_q_df = pd.DataFrame([(state_key, action_key, q_value)], columns=["state_key", "action_key", "q_value"])
-        if self.q_df is not None:
-            self.q_df = pd.concat([new_q_df, self.q_df])
-            self.q_df = self.q_df.drop_duplicates(["state_key", "action_key"])
-        else:
-            self.q_df = new_q_df
-        
+        self.q_store.save(state_key, action_key, q_value)
+
+    def __copy__(self):
+        q_learning = self.__class__.__new__(self.__class__)
+        q_learning.__dict__.update(self.__dict__)
+        if self.__q_store is not None:
+            # The shallow copy must not update Q-Values of the original.
+            q_learning.q_store = copy(self.q_store)
+        return q_learning
+
     # R(state)
     __r_df = None
 
@@ -319,6 +365,32 @@ class QLearning(metaclass=ABCMeta):
         '''
         raise NotImplementedError("This method must be implemented.")
 
+    def select_actions(self, state_key_list, next_action_list_list=None):
+        '''
+        Select actions by Q(state, action) in many states, such as the states of agents.
+
+        This method can be overrided to select actions at once.
+
+        Args:
+            state_key_list:         `list` of the keys of states.
+            next_action_list_list:  `list` of the possible actions in `self.t+1` for each state.
+                                    If `None`, `extract_possible_actions` is called for each state.
+
+        Returns:
+            `list` of the keys of actions.
+
+        '''
+        if next_action_list_list is None:
+            next_action_list_list = [
+                self.extract_possible_actions(state_key) for state_key in state_key_list
+            ]
+        return [
+            self.select_action(
+                state_key=state_key_list[i],
+                next_action_list=next_action_list_list[i]
+            ) for i in range(len(state_key_list))
+        ]
+
     @abstractmethod
     def extract_possible_actions(self, state_key):
         '''
@@ -379,20 +451,10 @@ class QLearning(metaclass=ABCMeta):
             The key of action.
 
         '''
-        if self.q_df is not None:
-            next_action_q_df = self.q_df[self.q_df.state_key == state_key]
-            next_action_q_df = next_action_q_df[next_action_q_df.action_key.isin(next_action_list)]
-            if next_action_q_df.shape[0] == 0:
-                return random.choice(next_action_list)
-            else:
-                if next_action_q_df.shape[0] == 1:
-                    max_q_action = next_action_q_df["action_key"].values[0]
-                else:
-                    next_action_q_df = next_action_q_df.sort_values(by=["q_value"], ascending=False)
-                    max_q_action = next_action_q_df.iloc[0, :]["action_key"]
-                return max_q_action
-        else:
+        action_key_list, q_arr = self.q_store.extract_action_q(state_key, next_action_list)
+        if len(action_key_list) == 0:
             return random.choice(next_action_list)
+        return action_key_list[q_arr.argmax()]
 
     def update_state(self, state_key, action_key):
         '''
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 import random
 import numpy as np
-import pandas as pd
 from pyqlearning.q_learning import QLearning
 
 
@@ -70,25 +69,79 @@ class BoltzmannQLearning(QLearning):
             The key of action.
 
         '''
-        if self.q_df is None or self.q_df.shape[0] == 0:
+        if len(self.q_store) == 0:
             return random.choice(next_action_list)
 
-        next_action_b_df = self.__calculate_boltzmann_factor(state_key, next_action_list)
+        action_key_list, q_arr = self.q_store.extract_action_q(state_key, next_action_list)
 
-        if next_action_b_df.shape[0] == 1:
-            return next_action_b_df["action_key"].values[0]
+        if len(action_key_list) == 0:
+            return random.choice(next_action_list)
+
+        if len(action_key_list) == 1:
+            return action_key_list[0]
 
-        prob = np.random.random()
-        next_action_b_df = next_action_b_df.sort_values(by=["boltzmann_factor"])
+        prob_arr = self.__calculate_boltzmann_factor(q_arr, np.array([0]))
+        cum_arr = np.cumsum(prob_arr)
+        key = min(int(np.searchsorted(cum_arr, np.random.random() * cum_arr[-1], side="right")), cum_arr.shape[0] - 1)
+        return action_key_list[key]
+
+    def select_actions(self, state_key_list, next_action_list_list=None):
+        '''
+        Select actions by Q(state, action) in many states at once.
 
-        i = 0
-        while prob > next_action_b_df.iloc[i, :]["boltzmann_factor"] + next_action_b_df.iloc[i + 1, :]["boltzmann_factor"]:
-            i += 1
-            if i + 1 >= next_action_b_df.shape[0]:
-                break
+        Override.
 
-        max_b_action_key = next_action_b_df.iloc[i, :]["action_key"]
-        return max_b_action_key
+        The Boltzmann factors of all states are computed and sampled
+        as one flat `np.ndarray` which is segmented by states.
+
+        Args:
+            state_key_list:         `list` of the keys of states.
+            next_action_list_list:  `list` of the possible actions in `self.t+1` for each state.
+                                    If `None`, `extract_possible_actions` is called for each state.
+
+        Returns:
+            `list` of the keys of actions.
+        '''
+        if next_action_list_list is None:
+            next_action_list_list = [
+                self.extract_possible_actions(state_key) for state_key in state_key_list
+            ]
+
+        selected_action_key_list = [None] * len(state_key_list)
+        segment_list = []
+        action_key_list_list = []
+        q_arr_list = []
+        for i in range(len(state_key_list)):
+            action_key_list, q_arr = self.q_store.extract_action_q(
+                state_key_list[i],
+                next_action_list_list[i]
+            )
+            if len(action_key_list) == 0:
+                selected_action_key_list[i] = random.choice(next_action_list_list[i])
+            elif len(action_key_list) == 1:
+                selected_action_key_list[i] = action_key_list[0]
+            else:
+                segment_list.append(i)
+                action_key_list_list.append(action_key_list)
+                q_arr_list.append(q_arr)
+
+        if len(segment_list) == 0:
+            return selected_action_key_list
+
+        size_arr = np.array([q_arr.shape[0] for q_arr in q_arr_list])
+        start_arr = np.r_[0, np.cumsum(size_arr)[:-1]]
+        prob_arr = self.__calculate_boltzmann_factor(np.concatenate(q_arr_list), start_arr)
+
+        cum_arr = np.cumsum(prob_arr)
+        base_arr = np.r_[0.0, cum_arr][start_arr]
+        target_arr = base_arr + np.random.random(size_arr.shape[0]) * (cum_arr[start_arr + size_arr - 1] - base_arr)
+        key_arr = np.searchsorted(cum_arr, target_arr, side="right")
+        key_arr = np.clip(key_arr, start_arr, start_arr + size_arr - 1) - start_arr
+
+        for i in range(len(segment_list)):
+            selected_action_key_list[segment_list[i]] = action_key_list_list[i][key_arr[i]]
+
+        return selected_action_key_list
 
     def __calculate_sigmoid(self):
         '''
@@ -101,23 +154,21 @@ class BoltzmannQLearning(QLearning):
         sigmoid = 1 / np.log(self.t * self.time_rate + 1.1)
         return sigmoid
 
-    def __calculate_boltzmann_factor(self, state_key, next_action_list):
+    def __calculate_boltzmann_factor(self, q_arr, start_arr):
         '''
-        Calculate boltzmann factor.
+        Calculate boltzmann factor by log-sum-exp.
 
         Args:
-            state_key:              The key of state.
-            next_action_list:       The possible action in `self.t+1`.
-                                    If the length of this list is 0, all action should be possible.
+            q_arr:          `np.ndarray` of Q-Values, which is segmented by states.
+            start_arr:      `np.ndarray` of the first index of each segment.
 
         Returns:
-            [(`The key of action`, `boltzmann probability`)]
+            `np.ndarray` of boltzmann probability, which is normalized in each segment.
         '''
         sigmoid = self.__calculate_sigmoid()
-        q_df = self.q_df[self.q_df.state_key == state_key]
-        q_df = q_df[q_df.isin(next_action_list)]
-        q_df["boltzmann_factor"] = q_df["q_value"] / sigmoid
-        q_df["boltzmann_factor"] = q_df["boltzmann_factor"].apply(np.exp)
-        q_df["boltzmann_factor"] = q_df["boltzmann_factor"] / q_df["boltzmann_factor"].sum()
-        
-        return q_df
+        x_arr = q_arr / sigmoid
+        size_arr = np.diff(np.r_[start_arr, x_arr.shape[0]])
+        max_arr = np.repeat(np.maximum.reduceat(x_arr, start_arr), size_arr)
+        exp_arr = np.exp(x_arr - max_arr)
+        log_sum_exp_arr = max_arr + np.repeat(np.log(np.add.reduceat(exp_arr, start_arr)), size_arr)
+        return np.exp(x_arr - log_sum_exp_arr)
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+from abc import ABCMeta, abstractmethod
+
+
+class QStorable(metaclass=ABCMeta):
+    '''
+    The interface of the storage of Q(state, action).
+
+    `QLearning` delegates the lookups and updates of Q-Values to
+    this interface, so that the data structure of Q-table can be
+    re-designed in relation to your problem settings without changing
+    the skeleton of Q-Learning algorithm.
+    '''
+
+    @abstractmethod
+    def extract(self, state_key, action_key):
+        '''
+        Extract Q-Value.
+
+        Args:
+            state_key:      The key of state.
+            action_key:     The key of action.
+
+        Returns:
+            Q-Value. If the pair of keys has not been saved yet, `None`.
+        '''
+        raise NotImplementedError()
+
+    @abstractmethod
+    def save(self, state_key, action_key, q_value):
+        '''
+        Insert or update Q-Value.
+
+        Args:
+            state_key:      The key of state.
+            action_key:     The key of action.
+            q_value:        Q-Value.
+        '''
+        raise NotImplementedError()
+
+    @abstractmethod
+    def extract_action_q(self, state_key, action_key_list=None):
+        '''
+        Extract the saved Q-Values of actions in a state.
+
+        Args:
+            state_key:          The key of state.
+            action_key_list:    `list` of the keys of actions to be extracted.
+                                If `None`, all saved actions will be extracted.
+
+        Returns:
+            Tuple(`list` of the keys of actions, `np.ndarray` of Q-Values).
+        '''
+        raise NotImplementedError()
+
+    @abstractmethod
+    def to_df(self):
+        '''
+        Export Q-Values.
+
+        Returns:
+            `pd.DataFrame` which has columns: `state_key`, `action_key` and `q_value`.
+        '''
+        raise NotImplementedError()
+
+    @abstractmethod
+    def from_df(self, q_df):
+        '''
+        Import Q-Values. All saved Q-Values will be replaced.
+
+        Args:
+            q_df:   `pd.DataFrame` which has columns: `state_key`, `action_key` and `q_value`.
+        '''
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_q_value_arr(self):
+        '''
+        getter
+
+        `np.ndarray` of all saved Q-Values,
+        which is ordered in the same way as `to_df`.
+        '''
+        raise NotImplementedError()
+
+    @abstractmethod
+    def set_q_value_arr(self, value):
+        '''
+        setter
+
+        `np.ndarray` of all saved Q-Values,
+        which is ordered in the same way as `to_df`.
+        '''
+        raise NotImplementedError()
+
+    q_value_arr = property(get_q_value_arr, set_q_value_arr)
+
+    @abstractmethod
+    def __len__(self):
+        '''
+        The number of saved Q-Values.
+        '''
+        raise NotImplementedError()
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pandas as pd
+from pyqlearning.qlearning.q_storable import QStorable
+
+
+class ArrayQStore(QStorable):
+    '''
+    Q-table which is-a `QStorable`.
+
+    The keys of states and actions are interned to the indices of rows
+    by `dict`, and Q-Values are stored in a growable `np.ndarray` of float64.
+    Lookups and updates of Q-Values are O(1) amortised, and the memory
+    is proportional to the number of saved pairs of states and actions.
+
+    The Q-Values of each state are stored in a contiguous slice of the array.
+    When a slice is full, it is relocated to the end of the array with
+    doubled capacity, so that `extract_action_q` costs O(|actions of state|).
+    '''
+
+    # The indices of the list of each state:
+    # [start row, the number of actions, capacity, {action_key: offset}, [action_key]]
+    __START = 0
+    __SIZE = 1
+    __CAPACITY = 2
+    __OFFSET_DICT = 3
+    __ACTION_KEY_LIST = 4
+
+    def __init__(self, capacity=1024, state_capacity=4):
+        '''
+        Init.
+
+        Args:
+            capacity:           The initial number of rows to be allocated.
+                                The array doubles its capacity when it is full.
+            state_capacity:     The initial number of rows to be allocated per state.
+        '''
+        if isinstance(capacity, int) is False:
+            raise TypeError("The type of `capacity` must be int.")
+        if capacity <= 0:
+            raise ValueError("The value of `capacity` must be greater than 0.")
+        if isinstance(state_capacity, int) is False:
+            raise TypeError("The type of `state_capacity` must be int.")
+        if state_capacity <= 0:
+            raise ValueError("The value of `state_capacity` must be greater than 0.")
+
+        self.__state_capacity = state_capacity
+        self.__q_arr = np.zeros(capacity, dtype=np.float64)
+        # The number of saved Q-Values.
+        self.__row_n = 0
+        # The number of allocated rows.
+        self.__tail = 0
+        # {state_key: [start, size, capacity, {action_key: offset}, [action_key]]}
+        self.__state_dict = {}
+
+    def __len__(self):
+        return self.__row_n
+
+    def __copy__(self):
+        q_store = ArrayQStore(
+            capacity=self.__q_arr.shape[0],
+            state_capacity=self.__state_capacity
+        )
+        q_store.__q_arr = self.__q_arr.copy()
+        q_store.__row_n = self.__row_n
+        q_store.__tail = self.__tail
+        q_store.__state_dict = {
+            state_key: [
+                state_list[self.__START],
+                state_list[self.__SIZE],
+                state_list[self.__CAPACITY],
+                state_list[self.__OFFSET_DICT].copy(),
+                state_list[self.__ACTION_KEY_LIST][:]
+            ] for state_key, state_list in self.__state_dict.items()
+        }
+        return q_store
+
+    def extract(self, state_key, action_key):
+        '''
+        Extract Q-Value.
+
+        Args:
+            state_key:      The key of state.
+            action_key:     The key of action.
+
+        Returns:
+            Q-Value. If the pair of keys has not been saved yet, `None`.
+        '''
+        state_list = self.__state_dict.get(state_key)
+        if state_list is None:
+            return None
+        offset = state_list[self.__OFFSET_DICT].get(action_key)
+        if offset is None:
+            return None
+        return float(self.__q_arr[state_list[self.__START] + offset])
+
+    def save(self, state_key, action_key, q_value):
+        '''
+        Insert or update Q-Value.
+
+        Args:
+            state_key:      The key of state.
+            action_key:     The key of action.
+            q_value:        Q-Value.
+        '''
+        state_list = self.__state_dict.get(state_key)
+        if state_list is None:
+            state_list = [self.__allocate(self.__state_capacity), 0, self.__state_capacity, {}, []]
+            self.__state_dict[state_key] = state_list
+
+        offset = state_list[self.__OFFSET_DICT].get(action_key)
+        if offset is None:
+            if state_list[self.__SIZE] >= state_list[self.__CAPACITY]:
+                self.__relocate(state_list, state_list[self.__CAPACITY] * 2)
+            offset = state_list[self.__SIZE]
+            state_list[self.__OFFSET_DICT][action_key] = offset
+            state_list[self.__ACTION_KEY_LIST].append(action_key)
+            state_list[self.__SIZE] += 1
+            self.__row_n += 1
+
+        self.__q_arr[state_list[self.__START] + offset] = q_value
+
+    def __allocate(self, row_n):
+        '''
+        Allocate rows at the end of the array.
+
+        Args:
+            row_n:      The number of rows.
+
+        Returns:
+            The first row.
+        '''
+        if self.__tail + row_n > self.__q_arr.shape[0]:
+            q_arr = np.zeros(max(self.__q_arr.shape[0] * 2, self.__tail + row_n), dtype=np.float64)
+            q_arr[:self.__tail] = self.__q_arr[:self.__tail]
+            self.__q_arr = q_arr
+
+        start = self.__tail
+        self.__tail += row_n
+        return start
+
+    def __relocate(self, state_list, capacity):
+        '''
+        Move the slice of a state to the end of the array.
+
+        Args:
+            state_list:     The list of the state.
+            capacity:       The new capacity of the slice.
+        '''
+        start = self.__allocate(capacity)
+        size = state_list[self.__SIZE]
+        old_start = state_list[self.__START]
+        self.__q_arr[start:start+size] = self.__q_arr[old_start:old_start+size]
+        state_list[self.__START] = start
+        state_list[self.__CAPACITY] = capacity
+
+    def __compact(self):
+        '''
+        Pack the slices of all states in order of insertion,
+        removing the rows left by relocation and the unused capacity.
+        '''
+        if self.__tail == self.__row_n:
+            return
+
+        q_arr = np.zeros(max(self.__row_n, 1), dtype=np.float64)
+        start = 0
+        for state_list in self.__state_dict.values():
+            size = state_list[self.__SIZE]
+            old_start = state_list[self.__START]
+            q_arr[start:start+size] = self.__q_arr[old_start:old_start+size]
+            state_list[self.__START] = start
+            state_list[self.__CAPACITY] = size
+            start += size
+
+        self.__q_arr = q_arr
+        self.__tail = self.__row_n
+
+    def extract_action_q(self, state_key, action_key_list=None):
+        '''
+        Extract the saved Q-Values of actions in a state.
+
+        Args:
+            state_key:          The key of state.
+            action_key_list:    `list` of the keys of actions to be extracted.
+                                If `None`, all saved actions will be extracted
+                                and the Q-Values are a view of the slice of the state.
+
+        Returns:
+            Tuple(`list` of the keys of actions, `np.ndarray` of Q-Values).
+        '''
+        state_list = self.__state_dict.get(state_key)
+        if state_list is None:
+            return [], np.zeros(0, dtype=np.float64)
+
+        if action_key_list is None:
+            start = state_list[self.__START]
+            return state_list[self.__ACTION_KEY_LIST][:], self.__q_arr[start:start+state_list[self.__SIZE]]
+
+        key_list, row_arr = self.extract_rows(state_key, action_key_list)
+        return key_list, self.__q_arr[row_arr]
+
+    def extract_rows(self, state_key, action_key_list=None):
+        '''
+        Extract the rows of the saved Q-Values of actions in a state.
+
+        The rows are valid until a new pair of keys is saved,
+        because the slice of the state may be relocated.
+
+        Args:
+            state_key:          The key of state.
+            action_key_list:    `list` of the keys of actions to be extracted.
+                                If `None`, all saved actions will be extracted.
+
+        Returns:
+            Tuple(`list` of the keys of actions, `np.ndarray` of rows).
+        '''
+        state_list = self.__state_dict.get(state_key)
+        if state_list is None:
+            return [], np.zeros(0, dtype=np.int64)
+
+        start = state_list[self.__START]
+        if action_key_list is None:
+            return state_list[self.__ACTION_KEY_LIST][:], np.arange(start, start+state_list[self.__SIZE])
+
+        offset_dict = state_list[self.__OFFSET_DICT]
+        key_list = [
+            action_key for action_key in dict.fromkeys(action_key_list) if action_key in offset_dict
+        ]
+        offset_arr = np.array([offset_dict[action_key] for action_key in key_list], dtype=np.int64)
+        return key_list, start + offset_arr
+
+    def extract_q_by_rows(self, row_arr):
+        '''
+        Extract Q-Values by the rows from `extract_rows`.
+
+        Args:
+            row_arr:    `np.ndarray` of rows.
+
+        Returns:
+            `np.ndarray` of Q-Values.
+        '''
+        return self.__q_arr[row_arr]
+
+    def save_q_by_rows(self, row_arr, q_value_arr):
+        '''
+        Update Q-Values by the rows from `extract_rows`.
+
+        Args:
+            row_arr:        `np.ndarray` of rows.
+            q_value_arr:    `np.ndarray` of Q-Values.
+        '''
+        self.__q_arr[row_arr] = q_value_arr
+
+    def to_df(self):
+        '''
+        Export Q-Values.
+
+        Returns:
+            `pd.DataFrame` which has columns: `state_key`, `action_key` and `q_value`.
+        '''
+        self.__compact()
+        state_key_arr = np.empty(self.__row_n, dtype=object)
+        action_key_arr = np.empty(self.__row_n, dtype=object)
+        for state_key, state_list in self.__state_dict.items():
+            start = state_list[self.__START]
+            size = state_list[self.__SIZE]
+            for i in range(size):
+                state_key_arr[start + i] = state_key
+                action_key_arr[start + i] = state_list[self.__ACTION_KEY_LIST][i]
+
+        return pd.DataFrame(
+            {
+                "state_key": state_key_arr,
+                "action_key": action_key_arr,
+                "q_value": self.__q_arr[:self.__row_n].copy()
+            },
+            columns=["state_key", "action_key", "q_value"]
+        )
+
+    def from_df(self, q_df):
+        '''
+        Import Q-Values. All saved Q-Values will be replaced.
+
+        If the pairs of keys are duplicated, the first row is saved.
+
+        Args:
+            q_df:   `pd.DataFrame` which has columns: `state_key`, `action_key` and `q_value`.
+        '''
+        if isinstance(q_df, pd.DataFrame) is False:
+            raise TypeError("The type of `q_df` must be `pd.DataFrame`.")
+
+        self.__q_arr = np.zeros(max(q_df.shape[0], 1), dtype=np.float64)
+        self.__row_n = 0
+        self.__tail = 0
+        self.__state_dict = {}
+
+        for state_key, action_key, q_value in zip(
+            q_df["state_key"].values,
+            q_df["action_key"].values,
+            q_df["q_value"].values.astype(np.float64)
+        ):
+            if self.extract(state_key, action_key) is None:
+                self.save(state_key, action_key, q_value)
+
+    def get_q_value_arr(self):
+        '''
+        getter
+
+        `np.ndarray` of all saved Q-Values,
+        which is ordered in the same way as `to_df`.
+
+        This is a view, so Q-Values can be normalized in place.
+        '''
+        self.__compact()
+        return self.__q_arr[:self.__row_n]
+
+    def set_q_value_arr(self, value):
+        '''
+        setter
+
+        `np.ndarray` of all saved Q-Values,
+        which is ordered in the same way as `to_df`.
+        '''
+        if isinstance(value, np.ndarray) is False:
+            raise TypeError("The type of `q_value_arr` must be `np.ndarray`.")
+        if value.shape != (self.__row_n, ):
+            raise ValueError("The shape of `q_value_arr` must be (" + str(self.__row_n) + ", ).")
+        self.__compact()
+        self.__q_arr[:self.__row_n] = value
+
+    q_value_arr = property(get_q_value_arr, set_q_value_arr)